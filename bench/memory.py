@@ -0,0 +1,78 @@
+"""
+Memory footprint of the hive members
+
+Reports the bytes allocated per live bee (of every type), egg and dead bee, including everything
+a member drags along (behavior state machine, states, timers); the hive's own bookkeeping is left out
+
+    $ python -m bench.memory --count 100000
+"""
+
+import argparse
+import gc
+import sys
+import tracemalloc
+from typing import Callable, Dict, Sequence, Union
+
+from src.bee import DeathReason
+from src.bee.member import DeadBee, DroneBee, Larva, WorkerBee
+from src.common import HiveElement
+from src.egg.member import GenericBeeEgg
+from src.hive.hive import Hive
+
+
+def _spawn_dead_bee(hive: Hive) -> DeadBee:
+    dead_bee = DeadBee.spawn(hive)
+    dead_bee.was = WorkerBee
+    dead_bee.reason = DeathReason.NATURAL
+    dead_bee.weight = 20.0
+
+    return dead_bee
+
+
+MEMBERS: Dict[str, Callable[[Hive], HiveElement]] = {
+    "drone": DroneBee.spawn,
+    "worker": WorkerBee.spawn,
+    "larva": Larva.spawn,
+    "egg": GenericBeeEgg.spawn,
+    "dead bee": _spawn_dead_bee,
+}
+
+
+def bytes_per_member(spawn: Callable[[Hive], HiveElement], count: int) -> float:
+    """
+    Returns:
+        - average amount of bytes allocated by `spawn`, over `count` members of one hive
+    """
+
+    if count < 1:
+        raise ValueError(f"Required: count >= 1; Got: {count = }")
+
+    hive = Hive(0, 0, 0, 0.0)
+    gc.collect()
+
+    tracemalloc.start()
+    try:
+        allocated = tracemalloc.get_traced_memory()[0]
+        members = [spawn(hive) for _ in range(count)]
+        allocated = tracemalloc.get_traced_memory()[0] - allocated - sys.getsizeof(members)
+    finally:
+        tracemalloc.stop()
+
+    return allocated / count
+
+
+def main(argv: Union[Sequence[str], None] = None):
+    parser = argparse.ArgumentParser(prog="python -m bench.memory",
+                                     description="Report the bytes allocated per hive member")
+    parser.add_argument("--count", type=int, default=100_000, help="members created per kind")
+    args = parser.parse_args(argv)
+
+    if args.count < 1:
+        parser.error(f"Required: --count >= 1; Got: {args.count}")
+
+    for name, spawn in MEMBERS.items():
+        print(f"{name + ':':<10} {bytes_per_member(spawn, args.count):8.1f} bytes")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,199 @@
+"""
+Tick throughput of fixed-seed hive scenarios, with regression checks against a stored baseline
+
+Every scenario runs in a fresh process, five times by default, and reports ticks per CPU second
+(best of the repeats: noise only ever slows a run down), how far the peak resident memory of its process
+grows past what it holds once everything is imported, and how much the count of allocated memory blocks
+grows per measured tick (CPython exposes no gross allocation count, so this tracks growth rather than churn)
+
+    $ python -m bench.suite --output baseline.json
+    $ python -m bench.suite --baseline baseline.json    # exits with 1 on a regression
+"""
+
+import argparse
+import json
+import multiprocessing
+import resource
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, replace
+from typing import Dict, List, Sequence, Union
+
+from src.hive.hive import Hive
+from src.sim.config import ENGINES, HiveConfig
+
+
+@dataclass(frozen=True)
+class Scenario:
+    config: HiveConfig
+    ticks: int
+    # ticks run before the measured ones
+    warmup: int = 0
+
+
+# every scenario measures ticks with a live population
+SCENARIOS: Dict[str, Scenario] = {
+    # the hive the app starts with
+    "app_default": Scenario(HiveConfig(seed=1), 10_000),
+    # the workers rest 320-480 ticks after birth, so the measure ends with them going out to harvest
+    "workers_10k": Scenario(HiveConfig(3, 10_000, 10, Hive._honey_amount_cap, seed=1), 400),
+    "eggs_saturated": Scenario(HiveConfig(30, 50, Hive._eggs_cap, Hive._honey_amount_cap, seed=1), 3_000),
+    # no honey and no workers: the drones starve together on tick 501, which the measure ends just after
+    "starvation_collapse": Scenario(HiveConfig(1_000, 0, Hive._eggs_cap, 0.0, seed=1), 510),
+    # past the first generation, with plenty of dead bees in the hive and in the graveyard
+    "graveyard_late_stage": Scenario(HiveConfig(20, 60, Hive._eggs_cap, Hive._honey_amount_cap, seed=1),
+                                     2_000, warmup=5_000),
+}
+
+# metric: True if higher is better
+_DIRECTIONS = {"ticks_per_second": True, "rss_growth_kib": False, "block_growth_per_tick": False}
+# the block growth per tick hovers around 0, so it also gets some absolute slack
+_BLOCKS_SLACK = 1.0
+# on a shared single CPU, the best of five runs of a second or so still varies by up to a third between invocations
+_SPEED_TOLERANCE = 0.35
+
+
+def measure(scenario: Scenario) -> Dict[str, float]:
+    """
+    Meant to run in a process of its own, for the peak resident memory to be the scenario's
+
+    Returns:
+        - ticks, CPU seconds, ticks per CPU second, growth of the peak resident memory in KiB,
+          growth of the allocated memory blocks per measured tick
+    """
+
+    # the interpreter and NumPy alone take tens of MiB, which would hide any change in the scenario's own memory
+    imported_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    hive = scenario.config.build()
+    hive.advance(scenario.warmup)
+
+    # CPU time, so that other processes sharing the CPU do not count
+    blocks = sys.getallocatedblocks()
+    started = time.process_time()
+    hive.advance(scenario.ticks)
+    seconds = time.process_time() - started
+    blocks = sys.getallocatedblocks() - blocks
+
+    return {
+        "ticks": scenario.ticks,
+        "seconds": seconds,
+        "ticks_per_second": scenario.ticks / seconds if seconds > 0 else 0.0,
+        "rss_growth_kib": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - imported_rss,
+        "block_growth_per_tick": blocks / scenario.ticks,
+    }
+
+
+def run(scenarios: Dict[str, Scenario], repeat: int = 5) -> Dict[str, Dict[str, float]]:
+    """
+    Returns:
+        - results of every scenario, keeping its fastest repeat
+    """
+
+    if repeat < 1:
+        raise ValueError(f"Required: repeat >= 1; Got: {repeat = }")
+
+    context = multiprocessing.get_context("spawn")
+    results = {}
+
+    # round after round, so that a slow spell of the machine does not hit every repeat of a scenario
+    for _ in range(repeat):
+        for name, scenario in scenarios.items():
+            with ProcessPoolExecutor(1, mp_context=context) as executor:
+                result = executor.submit(measure, scenario).result()
+
+            if name not in results or result["ticks_per_second"] > results[name]["ticks_per_second"]:
+                results[name] = result
+
+    return results
+
+
+def compare(results: Dict[str, Dict[str, float]], baseline: Dict[str, Dict[str, float]],
+            tolerance: float, speed_tolerance: float = _SPEED_TOLERANCE) -> List[str]:
+    """
+    Returns:
+        - a line per metric of a scenario found in both that is worse than its baseline by more than `tolerance`
+          (`speed_tolerance` for ticks per second); metrics the baseline lacks are skipped
+    """
+
+    regressions = []
+
+    for name in results.keys() & baseline.keys():
+        for metric, higher_is_better in _DIRECTIONS.items():
+            if metric not in baseline[name]:
+                continue
+
+            got, expected = results[name][metric], baseline[name][metric]
+
+            if higher_is_better:
+                worse = got < expected * (1 - speed_tolerance)
+            else:
+                slack = _BLOCKS_SLACK if metric == "block_growth_per_tick" else 0.0
+                worse = got > expected + abs(expected) * tolerance + slack
+
+            if worse:
+                regressions.append(f"{name}: {metric} {got:.1f} vs baseline {expected:.1f}")
+
+    return sorted(regressions)
+
+
+def main(argv: Union[Sequence[str], None] = None):
+    parser = argparse.ArgumentParser(prog="python -m bench.suite",
+                                     description="Benchmark fixed-seed hive scenarios")
+    parser.add_argument("--scenario", action="append", choices=SCENARIOS,
+                        help="scenario to run, may be repeated (all by default)")
+    parser.add_argument("--engine", choices=ENGINES, default="object", help="population engine")
+    parser.add_argument("--repeat", type=int, default=5, help="runs per scenario, the fastest is kept")
+    parser.add_argument("--output", metavar="FILE", help="write the results to FILE as JSON")
+    parser.add_argument("--baseline", metavar="FILE", help="compare against the results stored in FILE")
+    parser.add_argument("--tolerance", type=float, default=0.15,
+                        help="relative slack before a memory metric counts as a regression")
+    parser.add_argument("--speed-tolerance", type=float, default=_SPEED_TOLERANCE,
+                        help="relative slack before ticks per second count as a regression")
+    args = parser.parse_args(argv)
+
+    if args.repeat < 1:
+        parser.error(f"Required: --repeat >= 1; Got: {args.repeat}")
+
+    if args.tolerance < 0:
+        parser.error(f"Required: --tolerance >= 0; Got: {args.tolerance}")
+
+    if not 0 <= args.speed_tolerance < 1:
+        parser.error(f"Required: 0 <= --speed-tolerance < 1; Got: {args.speed_tolerance}")
+
+    scenarios = {name: replace(scenario, config=replace(scenario.config, engine=args.engine))
+                 for name, scenario in SCENARIOS.items() if not args.scenario or name in args.scenario}
+
+    results = run(scenarios, args.repeat)
+
+    print(f"{'scenario':<22}{'ticks/s':>12}{'RSS +KiB':>14}{'blocks +/tick':>15}")
+    for name, result in results.items():
+        print(f"{name:<22}{result['ticks_per_second']:>12.1f}{result['rss_growth_kib']:>14}"
+              f"{result['block_growth_per_tick']:>15.2f}")
+
+    report = {"engine": args.engine, "python": sys.version.split()[0], "scenarios": results}
+
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump(report, file, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as file:
+            baseline = json.load(file)
+
+        if baseline.get("engine") != args.engine:
+            parser.error(f"Required: a baseline of the {args.engine} engine; Got: {baseline.get('engine')}")
+
+        regressions = compare(results, baseline["scenarios"], args.tolerance, args.speed_tolerance)
+        for line in regressions:
+            print(f"REGRESSION {line}")
+
+        if regressions:
+            sys.exit(1)
+
+        print("No regression")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,18 @@
+"""
+Library wide switches
+
+`trusted` turns off the runtime type validation done on every transition
+(state / context assignments, `FiniteStateMachine.set_state`, `TempState` construction);
+tables are still validated when they are built. It defaults to on under `python -O`
+"""
+
+trusted: bool = not __debug__
+
+
+def set_trusted(value: bool):
+    global trusted
+    trusted = bool(value)
+
+
+def is_trusted() -> bool:
+    return trusted
@@ -2,13 +2,17 @@ from __future__ import annotations
 from abc import ABC, abstractmethod
 from typing import Union, Any
 
+from . import config as _cfg_
 from . import state as _st_
 from .helper import AbstractSingleton
 
 
 class Context(ABC):
+    __slots__ = ("__state",)
+
     @abstractmethod
     def __init__(self, state: _st_.State = None):
+        super().__init__()
         self.__state = None
         self.state = state
 
@@ -18,7 +22,7 @@ class Context(ABC):
     
     @state.setter
     def state(self, value: Union[_st_.State, None]):
-        if value is not None and not isinstance(value, _st_.State):
+        if not _cfg_.trusted and value is not None and not isinstance(value, _st_.State):
             raise TypeError(f"State must be an instance of `State` or None: {type(value) = }")
 
         self.__state = value
@@ -28,6 +32,8 @@ class Context(ABC):
 
 
 class NullContext(Context, metaclass=AbstractSingleton):
+    __slots__ = ()
+
     def __init__(self, *args, **kwargs):
         Context.__init__(self, None)
         
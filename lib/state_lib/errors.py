@@ -12,3 +12,7 @@ class EventNotFound(STLError):
     
 class IncorrectState(STLError):
     ...
+
+
+class TableIsFrozen(STLError):
+    ...
@@ -1,23 +1,51 @@
-from typing import Type
+from __future__ import annotations
+import time
+from typing import Callable, Type, Union
 
 from .state import State, NullState
 from .context import Context, NullContext
 from .transition_table import StateTransitionTable
 from . import EventEnum
+from . import config as _cfg_
+
+
+# see `set_transition_hook`
+_transition_hook: Union[Callable[[FiniteStateMachine, State, State, float], None], None] = None
+
+
+def set_transition_hook(hook: Union[Callable[[FiniteStateMachine, State, State, float], None], None]):
+    """
+    `hook(machine, old_state, new_state, seconds)` is called after every transition of every machine,
+    `seconds` being the wall time it took, nested transitions included; None removes it.
+    Costs a single check per transition while unset
+    """
+
+    global _transition_hook
+    _transition_hook = hook
 
 
 class FiniteStateMachine:
+    __slots__ = ("__trusted", "__context", "__state", "__transition_table")
+
     def __init__(self, transition_table: StateTransitionTable, initial_state: State = NullState(),
-                 context: Context = NullContext()):
-        if not isinstance(initial_state, State):
-            raise TypeError(f"Initial state must be an instance of `State`: {type(initial_state) = }")
+                 context: Context = NullContext(), trusted: Union[bool, None] = None):
+        """
+        `trusted` skips the type validation of the machine, including every `set_state` call;
+        when None, the library wide `config.trusted` at construction time is used
+        """
 
-        if not isinstance(context, Context):
-            raise TypeError(f"Context must be an instance of `Context`: {type(context) = }")
-        
-        if not isinstance(transition_table, StateTransitionTable):
-            raise TypeError(f"Transition table must be an instance of "
-                            f"`StateTransitionTable`: {type(transition_table) = }")
+        self.__trusted = _cfg_.trusted if trusted is None else trusted
+
+        if not self.__trusted:
+            if not isinstance(initial_state, State):
+                raise TypeError(f"Initial state must be an instance of `State`: {type(initial_state) = }")
+
+            if not isinstance(context, Context):
+                raise TypeError(f"Context must be an instance of `Context`: {type(context) = }")
+
+            if not isinstance(transition_table, StateTransitionTable):
+                raise TypeError(f"Transition table must be an instance of "
+                                f"`StateTransitionTable`: {type(transition_table) = }")
 
         self.__context = context
         self.__state: State = initial_state
@@ -31,10 +59,25 @@ class FiniteStateMachine:
     def context(self) -> Context:
         return self.__context
 
+    @property
+    def trusted(self) -> bool:
+        return self.__trusted
+
     def set_state(self, new_state: State):
-        if not isinstance(new_state, State):
+        if not self.__trusted and not isinstance(new_state, State):
             raise TypeError(f"New state must be an instance of `State`: {type(new_state) = }")
-        
+
+        hook = _transition_hook
+        if hook is None:
+            self.__transition(new_state)
+            return
+
+        old_state = self.state
+        started = time.perf_counter()
+        self.__transition(new_state)
+        hook(self, old_state, new_state, time.perf_counter() - started)
+
+    def __transition(self, new_state: State):
         old_state = self.state
         
         old_state.before_exit()
@@ -1,11 +1,16 @@
 from __future__ import annotations
 from abc import ABC, abstractmethod
+from typing import Union
 
+from . import config as _cfg_
 from . import context as _ctx_
 from .helper import AbstractSingleton
+from .timer import Timer, TimerQueue, TimerWheel
 
 
 class State(ABC):
+    __slots__ = ("__context",)
+
     @abstractmethod
     def __init__(self, context: _ctx_.Context = _ctx_.NullContext()):
         self.__context = ...
@@ -29,7 +34,7 @@ class State(ABC):
 
     @context.setter
     def context(self, value):
-        if not isinstance(value, _ctx_.Context):
+        if not _cfg_.trusted and not isinstance(value, _ctx_.Context):
             raise TypeError(f"Context must be an instance of `Context`: {type(value) = }")
 
         self.__context = value
@@ -39,32 +44,97 @@ class State(ABC):
 
 
 class NullState(State, metaclass=AbstractSingleton):
+    __slots__ = ()
+
     def __init__(self, *args, **kwargs):
         State.__init__(self, _ctx_.NullContext())
     
 
 class InitialState(State, ABC):
-    ...
+    __slots__ = ()
 
 
 class FinalState(State, ABC):
-    ...
+    __slots__ = ()
     
 
 class TempState(State, ABC):
+    """
+    State that lasts `time_left` ticks
+
+    The countdown is driven either by calling `tick_down` every tick, or, once `schedule`d,
+    by a `TimerWheel` or a `TimerQueue` that calls `once_zero_reached` when the time is up
+
+    The two do not run out at the same point of a tick: `tick_down` reaches zero within the update
+    of the context that calls it, a scheduled countdown when the timers advance. A hive advances them
+    once every member has been updated, so the transitions its countdowns trigger (drones going out
+    to fertilize, larvae transforming, eggs hatching) all happen after the updates of the tick,
+    in the order the countdowns were scheduled, instead of interleaved with the updates
+    """
+
+    __slots__ = ("__time_left", "__timers", "__timer")
+
     @abstractmethod
     def __init__(self, context: _ctx_.Context, time_left: int = 1):
         State.__init__(self, context)
         
-        if type(time_left) is not int:
-            raise TypeError(f"Time left must be an integer: {type(time_left) = }")
-        
-        if time_left <= 0:
-            raise ValueError(f"Initial time must different from 0: {time_left = }")
+        if not _cfg_.trusted:
+            if type(time_left) is not int:
+                raise TypeError(f"Time left must be an integer: {type(time_left) = }")
+
+            if time_left <= 0:
+                raise ValueError(f"Initial time must different from 0: {time_left = }")
         
         self.__time_left: int = 1
+        self.__timers: Union[TimerWheel, TimerQueue, None] = None
+        self.__timer: Union[Timer, None] = None
         self.time_left = time_left
 
+    @classmethod
+    def resume(cls, context: _ctx_.Context, time_left: int, timers: Union[TimerWheel, TimerQueue]) -> TempState:
+        """
+        Returns:
+            - state of `cls` with `time_left` ticks to go, counted down by `timers`, the constructor of `cls` aside
+        """
+
+        state = cls.__new__(cls)
+        TempState.__init__(state, context, time_left)
+        state.schedule(timers)
+
+        return state
+
+    def schedule(self, timers: Union[TimerWheel, TimerQueue]):
+        """
+        Hands the countdown over to `timers`; `tick_down` is not needed afterwards
+        """
+
+        self.cancel()
+        self.__timers = timers
+
+        if not self.time_is_up:
+            self.__timer = timers.schedule(self.__time_left, self.__expire)
+
+    def cancel(self):
+        """
+        Stops a scheduled countdown without reaching zero; `tick_down` drives it again afterwards
+        """
+
+        if self.__timer is not None:
+            self.__time_left = self.time_left
+            self.__timer.cancel()
+            self.__timer = None
+
+        self.__timers = None
+
+    @property
+    def is_scheduled(self) -> bool:
+        return self.__timer is not None
+
+    def __expire(self):
+        self.__timer = None
+        self.__time_left = 0
+        self.once_zero_reached()
+
     def tick_down(self):
         self.time_left -= 1
         
@@ -86,12 +156,19 @@ class TempState(State, ABC):
     
     @property
     def time_left(self) -> int:
+        if self.__timer is not None:
+            return self.__timer.expires - self.__timers.now
+
         return self.__time_left
     
     @time_left.setter
     def time_left(self, value: int):
         if self.time_is_up:
             return
+
+        if self.__timer is not None:
+            self.__timer.cancel()
+            self.__timer = None
         
         if value <= 0:
             self.__time_left = 0
@@ -99,3 +176,6 @@ class TempState(State, ABC):
         
         else:
             self.__time_left = value
+
+            if self.__timers is not None:
+                self.__timer = self.__timers.schedule(value, self.__expire)
@@ -0,0 +1,239 @@
+import heapq
+import itertools
+from typing import Callable, List, Tuple, Union
+
+
+class Timer:
+    __slots__ = ("expires", "callback", "active")
+
+    def __init__(self, expires: int, callback: Callable[[], None]):
+        self.expires = expires
+        self.callback = callback
+        self.active = True
+
+    def cancel(self):
+        self.active = False
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__qualname__}(expires={self.expires}, active={self.active})"
+
+
+class TimerWheel:
+    """
+    Hierarchical timer wheel
+
+    Every level has `2 ** slot_bits` buckets; a bucket of level `n` spans `2 ** (slot_bits * n)` ticks.
+    A timer is kept at the lowest level able to hold its delay and cascades down one level
+    whenever the bucket it sits in comes up.
+    Every `advance` costs O(1) plus the timers that expire or cascade, regardless of how many are waiting.
+    Cancelled timers are dropped lazily, when their bucket comes up
+    """
+
+    def __init__(self, slot_bits: int = 6, levels: int = 4, now: int = 0):
+        if slot_bits < 1:
+            raise ValueError(f"Required: slot_bits >= 1; Got: {slot_bits = }")
+
+        if levels < 1:
+            raise ValueError(f"Required: levels >= 1; Got: {levels = }")
+
+        self.__bits = slot_bits
+        self.__mask = (1 << slot_bits) - 1
+        self.__levels = levels
+        self.__horizon = 1 << (slot_bits * levels)
+
+        self.__now = now
+        self.__wheels: List[List[List[Timer]]] = [[[] for _ in range(1 << slot_bits)] for _ in range(levels)]
+        self.__overflow: List[Timer] = []
+
+    @property
+    def now(self) -> int:
+        """
+        Returns:
+            - amount of ticks advanced so far
+        """
+
+        return self.__now
+
+    def schedule(self, delay: int, callback: Callable[[], None]) -> Timer:
+        """
+        Returns:
+            - timer that calls `callback` during the `delay`-th `advance` from now
+        """
+
+        if delay < 1:
+            raise ValueError(f"Required: delay >= 1; Got: {delay = }")
+
+        timer = Timer(self.__now + delay, callback)
+        self.__place(timer)
+
+        return timer
+
+    def __place(self, timer: Timer):
+        delay = timer.expires - self.__now
+
+        if delay >= self.__horizon:
+            self.__overflow.append(timer)
+            return
+
+        level = 0
+        while delay >> (self.__bits * (level + 1)):
+            level += 1
+
+        self.__wheels[level][(timer.expires >> (self.__bits * level)) & self.__mask].append(timer)
+
+    def advance(self):
+        """
+        Moves the clock one tick forward and fires every timer that expires on it
+        """
+
+        for timer in self.__collect():
+            if timer.active:
+                timer.active = False
+                timer.callback()
+
+    def pending(self) -> List[Timer]:
+        """
+        Returns:
+            - active timers, in the order they would fire; costs a dry run of the wheel up to the latest expiry
+        """
+
+        shadow = TimerWheel(self.__bits, self.__levels, self.__now)
+        shadow.__wheels = [[list(bucket) for bucket in wheel] for wheel in self.__wheels]
+        shadow.__overflow = list(self.__overflow)
+
+        left = sum(timer.active for wheel in self.__wheels for bucket in wheel for timer in bucket)
+        left += sum(timer.active for timer in self.__overflow)
+
+        fired = []
+        while len(fired) < left:
+            fired.extend(timer for timer in shadow.__collect() if timer.active)
+
+        return fired
+
+    def __collect(self) -> List[Timer]:
+        """
+        Moves the clock one tick forward
+
+        Returns:
+            - timers that expire on the new tick, cancelled ones included
+        """
+
+        self.__now += 1
+        now = self.__now
+
+        for level in range(1, self.__levels):
+            if now & ((1 << (self.__bits * level)) - 1):
+                break
+
+            self.__cascade(self.__wheels[level], (now >> (self.__bits * level)) & self.__mask)
+
+        else:
+            if now % self.__horizon == 0 and self.__overflow:
+                overflow, self.__overflow = self.__overflow, []
+                for timer in overflow:
+                    if timer.active:
+                        self.__place(timer)
+
+        bucket = self.__wheels[0][now & self.__mask]
+        if bucket:
+            self.__wheels[0][now & self.__mask] = []
+
+        return bucket
+
+    def __cascade(self, wheel: List[List[Timer]], slot: int):
+        bucket = wheel[slot]
+        if not bucket:
+            return
+
+        wheel[slot] = []
+        for timer in bucket:
+            if timer.active:
+                self.__place(timer)
+
+
+class TimerQueue:
+    """
+    Binary heap of timers, a drop-in for `TimerWheel`
+
+    Every `advance` and `schedule` costs O(log n), but the next expiry can be peeked,
+    so a clock driven by it may `skip` the ticks on which nothing expires.
+    Cancelled timers are dropped lazily, when they reach the top of the heap
+    """
+
+    def __init__(self, now: int = 0):
+        self.__now = now
+        self.__heap: List[Tuple[int, int, Timer]] = []
+        self.__order = itertools.count()
+
+    @property
+    def now(self) -> int:
+        """
+        Returns:
+            - amount of ticks advanced so far
+        """
+
+        return self.__now
+
+    @property
+    def next_expiry(self) -> Union[int, None]:
+        """
+        Returns:
+            - tick on which the earliest active timer expires, None if there is none
+        """
+
+        heap = self.__heap
+        while heap and not heap[0][2].active:
+            heapq.heappop(heap)
+
+        return heap[0][0] if heap else None
+
+    def schedule(self, delay: int, callback: Callable[[], None]) -> Timer:
+        """
+        Returns:
+            - timer that calls `callback` during the `delay`-th `advance` from now
+        """
+
+        if delay < 1:
+            raise ValueError(f"Required: delay >= 1; Got: {delay = }")
+
+        timer = Timer(self.__now + delay, callback)
+        heapq.heappush(self.__heap, (timer.expires, next(self.__order), timer))
+
+        return timer
+
+    def advance(self):
+        """
+        Moves the clock one tick forward and fires every timer that expires on it, in scheduling order
+        """
+
+        self.__now += 1
+        now = self.__now
+        heap = self.__heap
+
+        while heap and heap[0][0] <= now:
+            timer = heapq.heappop(heap)[2]
+            if timer.active:
+                timer.active = False
+                timer.callback()
+
+    def pending(self) -> List[Timer]:
+        """
+        Returns:
+            - active timers, in the order they would fire
+        """
+
+        return [timer for _, _, timer in sorted(self.__heap) if timer.active]
+
+    def skip(self, ticks: int):
+        """
+        Moves the clock `ticks` ticks forward at once; no timer may expire on a skipped tick
+        """
+
+        if ticks < 0:
+            raise ValueError(f"Required: ticks >= 0; Got: {ticks = }")
+
+        expiry = self.next_expiry
+        if expiry is not None and expiry <= self.__now + ticks:
+            raise ValueError(f"Required: no timer expiring within the skipped ticks; Got: {expiry = }, {ticks = }")
+
+        self.__now += ticks
@@ -1,12 +1,14 @@
-from typing import Type, Tuple, Iterable, Dict, List, Union
+from typing import Type, Tuple, Iterable, Dict, FrozenSet, List, Union
 
 from .state import State, FinalState, InitialState
 from .helper import is_of_class_type
-from .errors import EventAlreadyExists, IncorrectState, EventNotFound
+from .errors import EventAlreadyExists, IncorrectState, EventNotFound, TableIsFrozen
 from . import EventEnum
 
 
 class Transition:
+    __slots__ = ("__origin", "__target")
+
     def __init__(self, origin: Type[State], target: Type[State]):
         if is_of_class_type(origin, FinalState):
             raise IncorrectState(f"Origin cannot be `{origin.__name__}` because it is a final state")
@@ -33,6 +35,10 @@ class StateTransitionTable:
     def __init__(self, table: Union[Dict[EventEnum, Tuple], None] = None):
         self.__transition_table: dict = {}
 
+        self.__frozen = False
+        self.__compiled: Dict[Tuple[EventEnum, Type[State]], Type[State]] = {}
+        self.__cached_sets: Dict[str, FrozenSet] = {}
+
         if table is None:
             return
 
@@ -88,7 +94,44 @@ class StateTransitionTable:
         for state in filter(lambda s: not is_of_class_type(s, State), states):
             raise TypeError(f"Not a `State` subtype: {type(state) = }")
 
+    def __ensure_not_frozen(self):
+        if self.__frozen:
+            raise TableIsFrozen(f"`{self.__class__.__qualname__}` cannot be changed once frozen")
+
+    @property
+    def is_frozen(self) -> bool:
+        return self.__frozen
+
+    def freeze(self) -> 'StateTransitionTable':
+        """
+        Compiles the table into an `(event, origin) -> target` lookup and caches the derived state sets;
+        the table cannot be changed afterwards
+
+        Returns:
+            - the table itself
+        """
+
+        if self.__frozen:
+            return self
+
+        for event, transitions in self.__transition_table.items():
+            for transition in transitions:
+                self.__compiled.setdefault((event, transition.origin), transition.target)
+
+        self.__cached_sets = {
+            "events": frozenset(self.events),
+            "origin_states": frozenset(self.origin_states),
+            "target_states": frozenset(self.target_states),
+            "known_states": frozenset(self.known_states),
+            "final_states": frozenset(self.final_states),
+            "unreachable_states": frozenset(self.unreachable_states),
+        }
+        self.__frozen = True
+
+        return self
+
     def add_transition(self, event: EventEnum, origin: Type[State], target: Type[State]):
+        self.__ensure_not_frozen()
         self.__validate(event, (origin, target))
 
         if event not in self.events:
@@ -97,6 +140,7 @@ class StateTransitionTable:
         self.__transition_table[event] = self.__transition_table[event] + (Transition(origin, target),)
 
     def remove_by_origin(self, event: EventEnum, origin: Type[State]):
+        self.__ensure_not_frozen()
         self.__validate(event, (origin,))
 
         if event not in self.events:
@@ -105,6 +149,7 @@ class StateTransitionTable:
         self.__transition_table[event] = tuple(filter(lambda t: t.origin != origin, self.__transition_table[event]))
 
     def remove_by_target(self, event: EventEnum, target: Type[State]):
+        self.__ensure_not_frozen()
         self.__validate(event, (target,))
 
         if event not in self.events:
@@ -113,6 +158,7 @@ class StateTransitionTable:
         self.__transition_table[event] = tuple(filter(lambda t: t.target != target, self.__transition_table[event]))
 
     def remove_event(self, event: EventEnum):
+        self.__ensure_not_frozen()
         self.__validate(event, tuple())
 
         if event not in self.events:
@@ -121,6 +167,7 @@ class StateTransitionTable:
         del self.__transition_table[event]
 
     def add_event(self, event: EventEnum):
+        self.__ensure_not_frozen()
         self.__validate(event, tuple())
 
         if event in self.events:
@@ -130,10 +177,16 @@ class StateTransitionTable:
 
     @property
     def events(self) -> set:
+        if self.__frozen:
+            return self.__cached_sets["events"]
+
         return set(self.__transition_table.keys())
 
     @property
     def origin_states(self) -> set:
+        if self.__frozen:
+            return self.__cached_sets["origin_states"]
+
         states = [transition.origin
                   for record in self.__transition_table.values()
                   for transition in record
@@ -143,6 +196,9 @@ class StateTransitionTable:
 
     @property
     def target_states(self) -> set:
+        if self.__frozen:
+            return self.__cached_sets["target_states"]
+
         states = [transition.target
                   for record in self.__transition_table.values()
                   for transition in record
@@ -152,17 +208,34 @@ class StateTransitionTable:
 
     @property
     def known_states(self) -> set:
+        if self.__frozen:
+            return self.__cached_sets["known_states"]
+
         return self.origin_states.union(self.target_states)
 
     @property
     def final_states(self) -> set:
+        if self.__frozen:
+            return self.__cached_sets["final_states"]
+
         return self.known_states.difference(self.origin_states)
 
     @property
     def unreachable_states(self) -> set:
+        if self.__frozen:
+            return self.__cached_sets["unreachable_states"]
+
         return self.known_states.difference(self.target_states)
 
     def handle(self, event: EventEnum, current_state: Type[State]) -> Union[Type[State], None]:
+        if self.__frozen:
+            target = self.__compiled.get((event, current_state))
+
+            if target is None and event not in self.__cached_sets["events"]:
+                raise EventNotFound(event)
+
+            return target
+
         self.__validate(event, (current_state,))
 
         if event not in self.events:
@@ -1,10 +1,16 @@
+import atexit
+import multiprocessing
 from collections import Counter, deque
 from dataclasses import dataclass
+from typing import Union
+
 import pyxel
 
 import src.bee.member as bees
 from src.bee import DeathReason
 from src.hive.hive import Hive
+from src.sim.config import HiveConfig
+from src.sim.worker import Snapshot, SimulationWorker
 from src.utils.num import avg
 from src.widgets.icon import Icon
 from src.widgets.graph import Graph
@@ -35,7 +41,7 @@ class Icons:
 @dataclass
 class Data:
     live_bees_type_count = Counter()
-    dead_bees_in_hive_count = Counter()
+    dead_bees_in_hive_amount = 0
     all_dead_bees_was_count = Counter()
     all_dead_bees_reason_count = Counter()
     eggs_status_count = Counter()
@@ -50,9 +56,14 @@ class App:
     _WIDTH = 320
     _HEIGHT = 320
     _GRAPH_STEEPNESS = 1
-    _HIVE_DATA_TRANSFER_EVERY_NTH_FRAME = 5
+    _HIVE_DATA_TRANSFER_EVERY_NTH_TICK = 5
     _FPS = 120
 
+    # simulation rate at 1x: a tick per frame
+    _TICKS_PER_SECOND = 120
+    # None runs the simulation as fast as it goes
+    _SPEEDS = {pyxel.KEY_1: 1, pyxel.KEY_2: 10, pyxel.KEY_3: 100, pyxel.KEY_4: None}
+
     _INITIAL_DRONES = 3
     _INITIAL_WORKERS = 10
     _INITIAL_EGGS = 10
@@ -66,40 +77,119 @@ class App:
         pyxel.load("./res.pyxres")
 
         self.active = True
+        self.speed: Union[int, None] = 1
+        # what stopped the worker, None while it runs
+        self.failure: Union[RuntimeError, None] = None
 
-        self.hive = Hive(self._INITIAL_DRONES, self._INITIAL_WORKERS, self._INITIAL_EGGS, self._INITIAL_HONEY)
+        self.worker: Union[SimulationWorker, None] = None
+        self.start_worker()
 
         self.honey_graph = Graph(2, 2,
                                  self._WIDTH - 4, 100,
-                                 0, self.hive._honey_amount_cap,
+                                 0, Hive._honey_amount_cap,
                                  self._GRAPH_STEEPNESS, graph_color=10)
 
         pyxel.run(self.update, self.draw)
 
     ...
 
-    def update(self):
-        if pyxel.btnp(pyxel.KEY_SPACE):
-            self.active = not self.active
+    def start_worker(self):
+        """
+        Starts the hive over in a new worker process; the app only shows the snapshots it publishes
+        """
 
-        if self.active:
-            self.hive.update()
+        if self.worker is not None:
+            atexit.unregister(self.worker.close)
+            self.worker.close()
 
-        if pyxel.frame_count % self._HIVE_DATA_TRANSFER_EVERY_NTH_FRAME == 0 and self.active:
-            self.data.live_bees_type_count = self.hive.live_bees_type_count
-            self.data.dead_bees_in_hive_count = self.hive.dead_bees_in_hive_was_count
-            self.data.all_dead_bees_reason_count = self.hive.all_dead_bees_reason_count
-            self.data.all_dead_bees_was_count = self.hive.all_dead_bees_was_count
-            self.data.eggs_status_count = self.hive.eggs_status_count
+        config = HiveConfig(self._INITIAL_DRONES, self._INITIAL_WORKERS, self._INITIAL_EGGS, self._INITIAL_HONEY)
+        self.worker = SimulationWorker(config, self._WIDTH - 4, self._HIVE_DATA_TRANSFER_EVERY_NTH_TICK,
+                                       self._TICKS_PER_SECOND)
+        atexit.register(self.worker.close)
 
-            self.data.honey_amount = self.hive.honey_amount
-            self.data.honey_income.append(self.hive.honey_income)
-            self.data.honey_consumption.append(self.hive.honey_consumption)
-            self.data.drones_efficiency.append(self.hive.drone_efficiency_factor)
+        self.worker.set_speed(self.speed)
+        if not self.active:
+            self.worker.pause()
 
-            self.data.queen_fertility = self.hive.queen_bee.fertility
+        self.failure = None
+        # no generation of the new worker is shown yet
+        self.__shown = (-1, -1)
+        self.__samples_shown = 0
 
-            self.honey_graph.add_value(self.hive.honey_amount)
+    def update(self):
+        if pyxel.btnp(pyxel.KEY_SPACE):
+            self.active = not self.active
+
+            if self.active:
+                self.worker.resume()
+            else:
+                self.worker.pause()
+
+        for key, speed in self._SPEEDS.items():
+            if pyxel.btnp(key):
+                self.speed = speed
+                self.worker.set_speed(speed)
+
+        if pyxel.btnp(pyxel.KEY_R):
+            if self.failure is None:
+                self.worker.reset()
+            else:
+                self.start_worker()
+
+        if self.failure is not None:
+            return
+
+        try:
+            snapshot = self.worker.latest()
+        except RuntimeError as error:
+            self.failure = error
+            return
+
+        if snapshot is not None and (snapshot.generation, snapshot.tick) != self.__shown:
+            self.show(snapshot)
+
+    def show(self, snapshot: Snapshot):
+        """
+        Takes the figures of a snapshot the worker published;
+        the graph and the averages get every sample of the history they have not shown yet
+        """
+
+        if snapshot.generation != self.__shown[0]:
+            self.honey_graph.clear()
+            self.data.honey_income.clear()
+            self.data.honey_consumption.clear()
+            self.data.drones_efficiency.clear()
+            self.__samples_shown = 0
+
+        self.__shown = (snapshot.generation, snapshot.tick)
+
+        new_samples = min(snapshot.samples - self.__samples_shown, len(snapshot.history["honey"]))
+        if new_samples > 0:
+            history = {name: values[-new_samples:].tolist() for name, values in snapshot.history.items()}
+
+            self.honey_graph.add_values(history["honey"])
+            self.data.honey_income.extend(history["honey_income"])
+            self.data.honey_consumption.extend(history["honey_consumption"])
+            self.data.drones_efficiency.extend(history["drone_efficiency"])
+
+        self.__samples_shown = snapshot.samples
+
+        # counts travel as floats, as every metric does
+        metric = {name: int(value) if value.is_integer() else value for name, value in snapshot.metrics.items()}
+
+        self.data.live_bees_type_count = +Counter({bees.WorkerBee: metric["workers"],
+                                                   bees.DroneBee: metric["drones"],
+                                                   bees.Larva: metric["larvae"]})
+        self.data.dead_bees_in_hive_amount = metric["dead_bees_in_hive"]
+        self.data.all_dead_bees_reason_count = +Counter({DeathReason.NATURAL: metric["dead_natural"],
+                                                         DeathReason.STARVATION: metric["dead_starvation"]})
+        self.data.all_dead_bees_was_count = +Counter({bees.WorkerBee: metric["dead_workers"],
+                                                      bees.DroneBee: metric["dead_drones"],
+                                                      bees.Larva: metric["dead_larvae"]})
+        self.data.eggs_status_count = +Counter({False: metric["eggs_unfertilized"], True: metric["eggs_fertilized"]})
+
+        self.data.honey_amount = metric["honey"]
+        self.data.queen_fertility = metric["queen_fertility"]
 
     def draw(self):
         pyxel.cls(0)
@@ -114,6 +204,10 @@ class App:
     def draw_graph_stats(self):
         x, y = 4, 4
 
+        # nothing sampled yet since the start or a reset
+        if not self.data.honey_income:
+            return
+
         status_icon = self.icons.arrow_up \
             if avg(self.data.honey_income) > avg(self.data.honey_consumption) \
             else self.icons.arrow_down
@@ -140,12 +234,12 @@ class App:
         self.icons.honey.draw(x, y + 10)
         pyxel.text(x + 10, y + 12, f"{self.data.honey_amount:.2f}", 10)
 
-        efc = avg(self.data.drones_efficiency)
+        efc = avg(self.data.drones_efficiency) if self.data.drones_efficiency else 0.0
         efc_icon = self.icons.ok if efc >= 0.5 else self.icons.bad
         efc_color = 11 if efc >= 0.5 else 8
 
         efc_icon.draw(x, y + 20)
-        pyxel.text(x + 10, y + 22, f"Drones efficiency: {avg(self.data.drones_efficiency) * 100:.0f}%", efc_color)
+        pyxel.text(x + 10, y + 22, f"Drones efficiency: {efc * 100:.0f}%", efc_color)
 
         self.icons.crown.draw(x, y + 30)
         pyxel.text(x + 10, y + 32, f"Fertility:", 10)
@@ -212,7 +306,7 @@ class App:
 
         self.icons.trash.draw(x, y + 60)
         pyxel.text(x + 10, y + 62, f"Uncleaned:", 7)
-        pyxel.text(x + 60, y + 62, f"{self.data.dead_bees_in_hive_count.total()}", 7)
+        pyxel.text(x + 60, y + 62, f"{self.data.dead_bees_in_hive_amount}", 7)
 
         percent = natural / total_dead if total_dead != 0 else 0
         pyxel.text(x + 10, y + 82, f"Natural:", 7)
@@ -227,14 +321,18 @@ class App:
         pyxel.text(x + 60, y + 112, f"{percent * 100 :.0f}%", 13)
 
     def draw_extra(self):
-        if self.active:
+        if self.failure is not None:
+            pyxel.text(self._WIDTH - 130, self._HEIGHT - 10, "Simulation stopped! <r>", 8)
+        elif self.active:
             self.icons.play.draw(self._WIDTH - 12, self._HEIGHT - 12)
             pyxel.text(self._WIDTH - 115, self._HEIGHT - 10, "Press <space> to pause...", 13)
         else:
             self.icons.pause.draw(self._WIDTH - 12, self._HEIGHT - 12)
             pyxel.text(self._WIDTH - 40, self._HEIGHT - 10, "Paused", 13)
 
+        speed = "max" if self.speed is None else f"x{self.speed}"
         pyxel.text(2, self._HEIGHT - 10, f"(v.1.0)", 13)
+        pyxel.text(40, self._HEIGHT - 10, f"Speed: {speed} <1-4>  Reset <r>", 13)
 
 
 def main():
@@ -242,4 +340,6 @@ def main():
 
 
 if __name__ == '__main__':
+    # the simulation worker is a spawned process, also in the pyinstaller build
+    multiprocessing.freeze_support()
     main()
@@ -17,3 +17,6 @@ class DeathReason(Enum):
     NATURAL = "natural"
     STARVATION = "starvation"
     OVERCROWDED = "overcrowded"
+
+
+DEATH_REASONS = tuple(DeathReason)
@@ -1,15 +1,16 @@
 import math
-import random as rng
 from abc import ABC, abstractmethod
 
 from src.bee import state, DeathReason, BeeEvent
 from src.egg.member import GenericBeeEgg
 from src.common import SimHiveObject, HasBehavior, HasUUID, SimObjectState
 from lib.state_lib.transition_table import StateTransitionTable
-from src.utils.num import clamp, linear_remap, deviate
+from src.utils.num import clamp, linear_remap
 
 
 class AbstractBee(ABC):
+    __slots__ = ()
+
     @abstractmethod
     def __init__(self):
         super().__init__()
@@ -34,6 +35,8 @@ class AbstractBee(ABC):
 
 
 class LiveBee(AbstractBee, SimHiveObject, HasBehavior, HasUUID):
+    __slots__ = ("_AbstractBee__weight", "_AbstractBee__age", "_HiveElement__hive", "_HasUUID__id",
+                 "__lifespan", "__starvation_factor", "__honey_consumption_multiplier", "__rest_time")
     _starvation_cap = 1.0
     _starvation_inc_rate = 0.002
     _starvation_dec_rate = 0.001
@@ -85,7 +88,7 @@ class LiveBee(AbstractBee, SimHiveObject, HasBehavior, HasUUID):
             
     def consume_honey(self):
         honey_desired = self.honey_consumption
-        honey_got = self.hive.take_honey(honey_desired)
+        honey_got = self.hive.take_honey(honey_desired, type(self))
         self.weight += honey_got / 100
 
         return honey_got >= honey_desired
@@ -110,6 +113,9 @@ class LiveBee(AbstractBee, SimHiveObject, HasBehavior, HasUUID):
 
 
 class DeadBee(AbstractBee, SimHiveObject, HasUUID):
+    __slots__ = ("_AbstractBee__weight", "_AbstractBee__age", "_HiveElement__hive", "_HasUUID__id",
+                 "__reason", "__was")
+
     def __init__(self):
         super().__init__()
         self.__reason = DeathReason.UNKNOWN
@@ -139,10 +145,13 @@ class DeadBee(AbstractBee, SimHiveObject, HasUUID):
         
         
 class QueenBee(LiveBee):
+    __slots__ = ()
     _behavior = StateTransitionTable({
         BeeEvent.RESTED: (state.Resting, state.LayingEggs),
         BeeEvent.LAID_EGG: (state.LayingEggs, state.Resting)
-    })
+    }).freeze()
+    fertility_base = 5
+    fertility_max = 50
     
     def __init__(self):
         super().__init__()
@@ -150,8 +159,6 @@ class QueenBee(LiveBee):
         self.honey_consumption_multiplier = 0.0
         self.weight = 800
 
-        self.fertility_base = 5
-        self.fertility_max = 50
         self.rest_time = 1500
         
         self.bsm.set_state(state.Resting(self))
@@ -171,55 +178,60 @@ class QueenBee(LiveBee):
 
 
 class DroneBee(LiveBee):
+    __slots__ = ("fertility",)
     _behavior = StateTransitionTable({
         BeeEvent.RESTED: (state.Resting, state.FertilizingEggs),
         BeeEvent.FERTILIZED_EGG: (state.FertilizingEggs, state.Resting)
-    })
+    }).freeze()
     
     def __init__(self):
         super().__init__()
-        self.lifespan = round(deviate(1700, 0.2))
-        self.honey_consumption_multiplier = deviate(0.15, 0.33)
+        rng = self.hive.rng
+
+        self.lifespan = round(rng.deviate(1700, 0.2))
+        self.honey_consumption_multiplier = rng.deviate(0.15, 0.33)
         self.weight = 8
         
-        self.fertility = round(deviate(1, 0.55))
-        self.rest_time = round(deviate(400, 0.5))
+        self.fertility = round(rng.deviate(1, 0.55))
+        self.rest_time = round(rng.deviate(400, 0.5))
         
         self.bsm.set_state(state.Resting(self))
 
     def fertilize_eggs(self):
-        unfertilized = tuple(filter(lambda e: not e.is_fertilized, self.hive.eggs))
+        unfertilized = self.hive.unfertilized_eggs
 
         amount = min(self.fertility, len(unfertilized))
 
         if amount == 0:
             return
 
-        chosen = rng.sample(unfertilized, k=amount)
+        chosen = unfertilized.sample(amount, self.hive.rng)
 
         for egg in chosen:
             self.hive.egg_fertilized(egg)
 
 
 class WorkerBee(LiveBee):
+    __slots__ = ("honey_harvest_time",)
     _behavior = StateTransitionTable({
         BeeEvent.RESTED: (state.Resting, state.HarvestingHoney),
         BeeEvent.FINISHED_WORK: ((state.HarvestingHoney, state.CleaningHive), (state.CleaningHive, state.Resting))
-    })
+    }).freeze()
+    honey_income_multiplier = 0.2
+    honey_income_base = 20
+    clean_attempts = 3
     
     def __init__(self,):
         super().__init__()
-        self.lifespan = round(deviate(4000, 0.15))
-        self.honey_consumption_multiplier = deviate(0.1, 0.25)
+        rng = self.hive.rng
+
+        self.lifespan = round(rng.deviate(4000, 0.15))
+        self.honey_consumption_multiplier = rng.deviate(0.1, 0.25)
         self.weight = 20
         
-        self.honey_harvest_time = round(deviate(300, 0.07))
-        self.honey_income_multiplier = 0.2
-        self.honey_income_base = 20
+        self.honey_harvest_time = round(rng.deviate(300, 0.07))
 
-        self.clean_attempts = 3
-
-        self.rest_time = round(deviate(400, 0.2))
+        self.rest_time = round(rng.deviate(400, 0.2))
 
         self.bsm.set_state(state.Resting(self))
 
@@ -232,22 +244,23 @@ class WorkerBee(LiveBee):
         return self.honey_income_base + self.weight * self.honey_income_multiplier
         
     def donate_honey(self):
-        self.hive.put_honey(self.honey_income)
+        self.hive.put_honey(self.honey_income, type(self))
         
     def clean_hive(self):
         if len(self.hive.dead_bees_in_hive) == 0:
             return
         
-        dead_bee = rng.choice(tuple(self.hive.dead_bees_in_hive))
+        dead_bee = self.hive.dead_bees_in_hive.choice(self.hive.rng)
         
         if self.weight >= dead_bee.weight:
             self.hive.dead_bee_cleaned(dead_bee)
         
 
 class Larva(LiveBee):
+    __slots__ = ("growth_time",)
     _behavior = StateTransitionTable({
         BeeEvent.GREW: (state.Growing, state.Transforming),
-    })
+    }).freeze()
     
     def __init__(self):
         super().__init__()
@@ -255,9 +268,13 @@ class Larva(LiveBee):
         self.honey_consumption_multiplier = 0.3
         self.weight = 2
         
-        self.growth_time = round(deviate(800, 0.2))
+        self.growth_time = round(self.hive.rng.deviate(800, 0.2))
         
         self.bsm.set_state(state.Growing(self))
         
     def transform(self):
         self.hive.larva_transformed(self)
+
+
+# stable order of the concrete bee types, used wherever a type is stored as a small integer code
+BEE_TYPES = (QueenBee, DroneBee, WorkerBee, Larva)
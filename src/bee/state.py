@@ -10,6 +10,7 @@ if TYPE_CHECKING:
 
 
 class BeeState(SimObjectState):
+    __slots__ = ()
     context: LiveBee
 
     def __init__(self, bee: LiveBee):
@@ -21,18 +22,19 @@ class BeeState(SimObjectState):
 
 
 class Resting(BeeState, TempState):
+    __slots__ = ()
+
     def __init__(self, bee: LiveBee):
         super().__init__(bee)
         self.time_left = bee.rest_time
+        self.schedule(bee.hive.timers)
 
     def once_zero_reached(self):
         self.bee.bsm.next_state(BeeEvent.RESTED, self.bee)
 
-    def update(self):
-        self.tick_down()
-
 
 class LayingEggs(BeeState):
+    __slots__ = ()
     bee: QueenBee
 
     def after_enter(self):
@@ -41,6 +43,7 @@ class LayingEggs(BeeState):
 
 
 class FertilizingEggs(BeeState):
+    __slots__ = ()
     bee: DroneBee
 
     def after_enter(self):
@@ -49,51 +52,57 @@ class FertilizingEggs(BeeState):
 
 
 class HarvestingHoney(BeeState, TempState):
+    __slots__ = ()
     bee: WorkerBee
 
     def __init__(self, bee: WorkerBee):
         super().__init__(bee)
         self.time_left = bee.honey_harvest_time
+        self.schedule(bee.hive.timers)
 
     def once_zero_reached(self):
         self.bee.bsm.next_state(BeeEvent.FINISHED_WORK, self.bee)
 
     def update(self):
         self.bee.donate_honey()
-        self.tick_down()
 
 
 class CleaningHive(BeeState, TempState):
+    __slots__ = ()
     bee: WorkerBee
 
     def __init__(self, bee: WorkerBee):
         super().__init__(bee)
         self.time_left = bee.clean_attempts
+        self.schedule(bee.hive.timers)
         
     def once_zero_reached(self):
         self.bee.bsm.next_state(BeeEvent.FINISHED_WORK, self.bee)
 
     def update(self):
         self.bee.clean_hive()
-        self.tick_down()
 
 
 class Growing(BeeState, TempState):
+    __slots__ = ()
     bee: Larva
 
     def __init__(self, bee: Larva):
         super().__init__(bee)
         self.time_left = bee.growth_time
+        self.schedule(bee.hive.timers)
     
     def once_zero_reached(self):
         self.bee.bsm.next_state(BeeEvent.GREW, self.bee)
-    
-    def update(self):            
-        self.tick_down()
 
 
 class Transforming(BeeState, FinalState):
+    __slots__ = ()
     bee: Larva
         
     def after_enter(self):
         self.bee.transform()
+
+
+# states a bee may be in between two ticks, in a stable order, used wherever a state is stored as a small integer code
+BEE_STATES = (Resting, HarvestingHoney, CleaningHive, Growing)
@@ -1,7 +1,7 @@
 from __future__ import annotations
 import uuid
 from abc import ABC, abstractmethod
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Hashable
 
 from lib.state_lib.state import State
 from lib.state_lib.context import Context, NullContext
@@ -13,23 +13,34 @@ if TYPE_CHECKING:
 
 
 class SimObjectState(State, ABC):
+    __slots__ = ()
+
     def update(self):
         pass
 
 
 class Idle(SimObjectState):
+    __slots__ = ()
+
     def __init__(self, *args, **kwargs):
         super().__init__(NullContext())
 
 
 class BehavioralStateMachine(FiniteStateMachine):
+    __slots__ = ()
     state: SimObjectState
 
     def __init__(self, transition_table: StateTransitionTable, context: Context, initial_state: State = Idle()):
         super().__init__(transition_table, initial_state, context)
 
+    def set_state(self, new_state: State):
+        self.context.hive.state_changing(self.context, new_state)
+        super().set_state(new_state)
+
 
 class SimObject(ABC):
+    __slots__ = ()
+
     @abstractmethod
     def __init__(self):
         super().__init__()
@@ -39,10 +50,29 @@ class SimObject(ABC):
 
 
 class HiveElement(ABC):
+    """
+    Only one base of a class may lay out slots, and `HasBehavior` does it for the members;
+    so this mixin, like `AbstractBee`, `AbstractEgg` and `HasUUID`, declares none
+    and the concrete members slot its (name-mangled) attributes themselves
+    """
+
+    __slots__ = ()
+
+    @classmethod
+    def spawn(cls, hive: Hive, *args, **kwargs):
+        """
+        Creates an element already bound to `hive`, so its constructor can use the hive services (e.g. timers)
+        """
+
+        element = cls.__new__(cls)
+        element.set_hive(hive)
+        element.__init__(*args, **kwargs)
+
+        return element
+
     @abstractmethod
     def __init__(self):
         super().__init__()
-        self.__hive: Hive = ...
         
     @property
     def hive(self) -> Hive:
@@ -53,14 +83,17 @@ class HiveElement(ABC):
 
 
 class SimHiveObject(SimObject, HiveElement):
+    __slots__ = ()
+
     @abstractmethod
     def __init__(self):
         super().__init__()
         
 
 class HasBehavior(Context):
+    __slots__ = ("__bsm",)
     state: SimObjectState
-    _behavior = StateTransitionTable()
+    _behavior = StateTransitionTable().freeze()
 
     @abstractmethod
     def __init__(self):
@@ -71,13 +104,44 @@ class HasBehavior(Context):
     def bsm(self):
         return self.__bsm
 
+    def restore_state(self, state: SimObjectState):
+        """
+        Puts an element recreated by `HasUUID.revive` in `state` without entering it
+        """
+
+        self.__bsm = BehavioralStateMachine(self._behavior, self, state)
+        self.state = state
+
 
 class HasUUID(ABC):
+    """
+    Meant for hive elements: the id is handed out by the id scheme of the hive
+    """
+
+    __slots__ = ()
+
     @abstractmethod
     def __init__(self):
         super().__init__()
-        self.__id = uuid.uuid4()
+        self.__id = self.hive.ids.next_id()
+
+    @classmethod
+    def revive(cls, hive: Hive, element_id: Hashable):
+        """
+        Recreates the element of `hive` that had `element_id` without running the constructor (see `Hive.load`):
+        nothing is drawn from the hive services, no state is entered and every other attribute is left to the caller
+        """
+
+        element = cls.__new__(cls)
+        element.set_hive(hive)
+        element.__id = element_id
+
+        return element
 
     @property
-    def uuid(self):
+    def id(self) -> Hashable:
         return self.__id
+
+    @property
+    def uuid(self) -> uuid.UUID:
+        return self.hive.ids.to_uuid(self.__id)
@@ -6,6 +6,8 @@ from lib.state_lib.transition_table import StateTransitionTable
 
 
 class AbstractEgg(ABC):
+    __slots__ = ()
+
     @abstractmethod
     def __init__(self):
         super().__init__()
@@ -25,6 +27,7 @@ class AbstractEgg(ABC):
 
 
 class BeeEgg(AbstractEgg, SimHiveObject, HasBehavior, HasUUID):
+    __slots__ = ("_AbstractEgg__hatching_time", "_HiveElement__hive", "_HasUUID__id")
     state: SimObjectState
 
     def __init__(self):
@@ -42,10 +45,11 @@ class BeeEgg(AbstractEgg, SimHiveObject, HasBehavior, HasUUID):
 
 
 class GenericBeeEgg(BeeEgg):
+    __slots__ = ()
     _behavior = StateTransitionTable({
         EggEvent.WAS_FERTILIZED: (Idle, state.Growing),
         EggEvent.GREW: (state.Growing, state.Hatching)
-    })
+    }).freeze()
     
     def __init__(self):
         super().__init__()
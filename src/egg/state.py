@@ -2,7 +2,7 @@ from __future__ import annotations
 from typing import TYPE_CHECKING
 
 from src.egg import EggEvent
-from src.common import SimObjectState
+from src.common import Idle, SimObjectState
 from lib.state_lib.state import TempState, FinalState
 
 if TYPE_CHECKING:
@@ -10,6 +10,7 @@ if TYPE_CHECKING:
 
 
 class EggState(SimObjectState):
+    __slots__ = ()
     context: BeeEgg
 
     def __init__(self, egg: BeeEgg):
@@ -21,17 +22,23 @@ class EggState(SimObjectState):
 
 
 class Growing(EggState, TempState):
+    __slots__ = ()
+
     def __init__(self, egg: BeeEgg):
         super().__init__(egg)
         self.time_left = egg.hatching_time
+        self.schedule(egg.hive.timers)
     
     def once_zero_reached(self):
         self.egg.bsm.next_state(EggEvent.GREW, self.egg)
     
-    def update(self):
-        self.tick_down()
-    
         
 class Hatching(EggState, FinalState):
+    __slots__ = ()
+
     def after_enter(self):
         self.egg.hatch()
+
+
+# states an egg may be in between two ticks, in a stable order, used wherever a state is stored as a small integer code
+EGG_STATES = (Idle, Growing)
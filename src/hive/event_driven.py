@@ -0,0 +1,429 @@
+from __future__ import annotations
+import heapq
+import itertools
+import math
+import time
+from typing import Dict, List, Tuple, TYPE_CHECKING
+
+import numpy as np
+
+from src.bee import DeathReason, DEATH_REASONS
+from src.bee.state import Growing, HarvestingHoney, Resting
+from lib.state_lib.timer import TimerQueue
+from src.hive.hive import Hive
+from src.hive.snapshot import Snapshot
+
+if TYPE_CHECKING:
+    from lib.state_lib.state import State
+    from src.bee.member import LiveBee
+    from src.common import HasBehavior
+
+# planner state saved with the hive: the tick every bee is up to date to and the deaths predicted, in prediction order
+_SYNC_RECORD = np.dtype([("bee", np.int64), ("tick", np.int64)])
+_DEATH_RECORD = np.dtype([("bee", np.int64), ("tick", np.int64), ("reason", np.uint8)])
+
+
+def _fed_ticks(weight: float, multiplier: float, take_cap: float) -> float:
+    """
+    Returns:
+        - amount of updates a bee keeps getting all the honey it wants for, provided the hive has enough;
+          afterwards it wants more than `take_cap`
+    """
+
+    desired = weight * multiplier
+    if desired <= 0:
+        return math.inf
+
+    if desired >= take_cap:
+        return 0
+
+    return math.ceil(math.log(take_cap / desired) / math.log1p(multiplier / 100))
+
+
+def _growth(weight: float, multiplier: float, ticks: int, take_cap: float) -> Tuple[float, float]:
+    """
+    Closed form of `ticks` updates of a bee, provided the hive has enough honey
+
+    The bee takes `min(weight * multiplier, take_cap)` and gains a hundredth of it,
+    so its weight grows geometrically until it reaches the take cap and linearly afterwards
+
+    Returns:
+        - weight after the updates
+        - sum of the weights the bee had at the start of every update
+    """
+
+    if ticks <= 0 or weight <= 0 or multiplier <= 0:
+        return weight, weight * max(0, ticks)
+
+    geometric = min(ticks, _fed_ticks(weight, multiplier, take_cap))
+    gain = math.expm1(geometric * math.log1p(multiplier / 100))
+
+    grown = weight * (1 + gain)
+    total = weight * gain * 100 / multiplier
+
+    linear = ticks - geometric
+    step = take_cap / 100
+
+    total += linear * grown + step * linear * (linear - 1) / 2
+    grown += step * linear
+
+    return grown, total
+
+
+def _grown(weights: np.ndarray, multipliers: np.ndarray, ticks: np.ndarray, take_cap: float) -> np.ndarray:
+    """
+    Array counterpart of the weight `_growth` returns, for positive weights and multipliers; broadcasts
+    """
+
+    rate = np.log1p(multipliers / 100)
+    desired = weights * multipliers
+    fed = np.where(desired >= take_cap, 0, np.ceil(np.log(take_cap / desired) / rate))
+
+    geometric = np.minimum(ticks, fed)
+    return weights * np.exp(geometric * rate) + take_cap / 100 * (ticks - geometric)
+
+
+class EventDrivenHive(Hive):
+    """
+    Discrete-event variant of `Hive`
+
+    While the honey in the hive is sure to outlast the demand, bees evolve independently:
+    a bee is only brought up to date, in closed form, when something happens to it
+    (a state change, its death) and the clock jumps straight to the next such event.
+    Only the members whose state acts every tick (e.g. cleaning) are updated tick by tick.
+    Once honey runs short, the hive falls back to exact tick-by-tick stepping.
+
+    The honey ledger is closed once per `advance`, so the flows are averaged over it
+    """
+
+    _timers_type = TimerQueue
+    _closed_form_states = (Resting, Growing, HarvestingHoney)
+    # ticks the honey must be sure to last for before the clock may jump
+    _min_jump = 16
+    _max_jump = 512
+    # upper bound of the honey a bee takes in a tick, once hatched from an egg or transformed from a larva
+    _newcomer_demand = 10.0
+
+    def __init__(self, *args, **kwargs):
+        self.__synced: Dict[LiveBee, int] = {}
+        # insertion ordered, so that runs stay reproducible under a fixed random seed
+        self.__active: Dict[LiveBee, None] = {}
+        # a bee's death is predicted again whenever its course may have changed;
+        # only the latest prediction of a bee stands
+        self.__deaths: List[Tuple[int, int, LiveBee, DeathReason]] = []
+        self.__predictions: Dict[LiveBee, int] = {}
+        self.__order = itertools.count()
+        self.__exact = False
+        self.__horizon = 0
+        # honey taken within a jump before the income that covers it was booked
+        self.__shortfall = 0.0
+
+        super().__init__(*args, **kwargs)
+
+        self.__synced[self.queen_bee] = self.timers.now
+
+    def state_changing(self, member: HasBehavior, new_state: State):
+        if member not in self.__synced:
+            return
+
+        # laying depends on the amount of honey, which is only exact with every bee up to date
+        if member is self.queen_bee:
+            self.__sync_all()
+        else:
+            self.__sync(member, self.timers.now)
+
+        if isinstance(new_state, self._closed_form_states):
+            self.__active.pop(member, None)
+        else:
+            self.__active[member] = None
+
+    def _bee_added(self, bee: LiveBee):
+        self.__synced[bee] = self.timers.now
+        self.__predict_death(bee)
+
+        if not isinstance(bee.state, self._closed_form_states):
+            self.__active[bee] = None
+
+    def _bee_removed(self, bee: LiveBee):
+        self.__forget(bee)
+
+    def _engine_state(self, bee_rows: Dict[LiveBee, int]) -> Snapshot:
+        deaths = sorted((order, tick, bee, reason) for tick, order, bee, reason in self.__deaths
+                        if self.__predictions.get(bee) == order)
+
+        meta = {"exact": self.__exact, "horizon": self.__horizon, "shortfall": self.__shortfall}
+        arrays = {
+            "synced": np.array([(bee_rows[bee], tick) for bee, tick in self.__synced.items()], dtype=_SYNC_RECORD),
+            "active": np.array([bee_rows[bee] for bee in self.__active], dtype=np.int64),
+            "deaths": np.array([(bee_rows[bee], tick, DEATH_REASONS.index(reason))
+                                for _, tick, bee, reason in deaths], dtype=_DEATH_RECORD),
+        }
+
+        return Snapshot(meta, arrays)
+
+    def _restore_engine(self, snapshot: Snapshot, bees: List[LiveBee]):
+        meta, arrays = snapshot
+
+        self.__exact, self.__horizon, self.__shortfall = meta["exact"], meta["horizon"], meta["shortfall"]
+        self.__synced = {bees[row]: tick for row, tick in arrays["synced"].tolist()}
+        self.__active = dict.fromkeys(bees[row] for row in arrays["active"].tolist())
+
+        self.__deaths = []
+        self.__predictions = {}
+        for row, tick, reason in arrays["deaths"].tolist():
+            order = next(self.__order)
+            self.__predictions[bees[row]] = order
+            self.__deaths.append((tick, order, bees[row], DEATH_REASONS[reason]))
+
+        heapq.heapify(self.__deaths)
+
+    def bee_died(self, bee: LiveBee, reason: DeathReason):
+        self.__forget(bee)
+        super().bee_died(bee, reason)
+
+    def __forget(self, bee: LiveBee):
+        self.__synced.pop(bee, None)
+        self.__active.pop(bee, None)
+        self.__predictions.pop(bee, None)
+
+    def __predict_death(self, bee: LiveBee):
+        """
+        `bee` must be up to date; schedules the update on which it dies, provided the hive has enough honey
+        """
+
+        now = self.__synced[bee]
+
+        tick, reason = self.__death(bee)
+        if tick == math.inf:
+            self.__predictions.pop(bee, None)
+            return
+
+        order = next(self.__order)
+        self.__predictions[bee] = order
+        heapq.heappush(self.__deaths, (now + tick + 1, order, bee, reason))
+
+    def __death(self, bee: LiveBee) -> Tuple[float, DeathReason]:
+        """
+        Returns:
+            - amount of updates `bee` outlives from its last sync, provided the hive has enough honey
+            - what it dies of
+        """
+
+        # a bee that wants more than it may take is not fed: it starves up to the cap and dies on the next update
+        fed = _fed_ticks(bee.weight, bee.honey_consumption_multiplier, self._honey_take_cap)
+        starving = max(0.0, bee.starvation_rate - fed * bee._starvation_dec_rate)
+        starves = fed + math.ceil((bee._starvation_cap - starving) / bee._starvation_inc_rate)
+
+        return min((bee.lifespan, DeathReason.NATURAL), (starves, DeathReason.STARVATION), key=lambda death: death[0])
+
+    def __next_death(self) -> float:
+        deaths = self.__deaths
+        while deaths and self.__predictions.get(deaths[0][2]) != deaths[0][1]:
+            heapq.heappop(deaths)
+
+        return deaths[0][0] if deaths else math.inf
+
+    def __sync(self, bee: LiveBee, tick: int):
+        """
+        Applies, in closed form, the updates `bee` got since it was last brought up to date
+        """
+
+        ticks = min(tick - self.__synced[bee], bee.lifespan)
+        self.__synced[bee] = tick
+
+        if ticks <= 0:
+            return
+
+        probe = self.probe
+        started = time.perf_counter() if probe is not None else 0.0
+
+        weight = bee.weight
+        multiplier = bee.honey_consumption_multiplier
+        fed = min(ticks, _fed_ticks(weight, multiplier, self._honey_take_cap))
+        grown, weights = _growth(weight, multiplier, ticks, self._honey_take_cap)
+
+        bee.weight = grown
+        bee.age += ticks
+        bee.lifespan -= ticks
+        bee.starvation_rate = max(0.0, bee.starvation_rate - fed * bee._starvation_dec_rate) \
+            + (ticks - fed) * bee._starvation_inc_rate
+
+        consumed = (grown - weight) * 100
+        harvesting = type(bee.state) is HarvestingHoney
+        income = ticks * bee.honey_income_base + weights * bee.honey_income_multiplier if harvesting else 0.0
+
+        # the horizon makes sure the honey lasts for all the bees together, but they are booked one by one:
+        # what one takes ahead of the income of another is owed, not lost at zero
+        honey = self.honey_amount - self.__shortfall - consumed + income
+        self.__shortfall = max(0.0, -honey)
+        self.honey_amount = honey
+
+        self.ledger.record_consumption(consumed, type(bee))
+        if harvesting:
+            self.ledger.record_income(income - max(0.0, honey - self._honey_amount_cap), type(bee))
+
+        # every update skipped took honey once, and put some once while harvesting
+        if probe is not None:
+            probe.count("honey_takes", ticks)
+
+            if harvesting:
+                probe.count("honey_puts", ticks)
+
+            probe.synced(type(bee), ticks, time.perf_counter() - started)
+
+    def __sync_all(self):
+        now = self.timers.now
+        for bee in tuple(self.__synced):
+            self.__sync(bee, now)
+
+    def __safe_jump(self) -> int:
+        """
+        Every bee must be up to date
+
+        The honey is followed tick by tick, taking the demand of a tick before its income comes in and losing
+        whatever income overflows the honey cap. Income is only counted from the bees harvesting, at their current
+        weight and until their harvest ends; an egg or a larva is counted at `_newcomer_demand` from the tick
+        it hatches or transforms, as eggs laid meanwhile hatch after `_max_jump`
+
+        Returns:
+            - the longest jump, up to `_max_jump`, the honey is sure to last for; 0 if shorter than `_min_jump`
+        """
+
+        take_cap = self._honey_take_cap
+        checks = np.arange(1, self._max_jump + 1)
+
+        consumers = [bee for bee in self.__synced if bee.weight > 0 and bee.honey_consumption_multiplier > 0]
+        weights = np.array([bee.weight for bee in consumers], dtype=np.float64)[:, None]
+        multipliers = np.array([bee.honey_consumption_multiplier for bee in consumers], dtype=np.float64)[:, None]
+        demand = (_grown(weights, multipliers, checks, take_cap) - weights).sum(axis=0) * 100
+
+        arrivals = [egg.state.time_left for egg in self.eggs if egg.is_fertilized]
+        arrivals += [bee.state.time_left for bee in self.__synced if type(bee.state) is Growing]
+        arrivals = np.array(arrivals, dtype=np.float64)[:, None]
+        demand += np.maximum(0, checks - arrivals).sum(axis=0) * self._newcomer_demand
+
+        harvesters = [bee for bee in self.__synced if type(bee.state) is HarvestingHoney]
+        # the update on which a harvest ends or a bee dies brings nothing in for sure
+        harvests = np.array([min(bee.state.time_left, self.__death(bee)[0]) - 1 for bee in harvesters],
+                            dtype=np.float64)[:, None]
+        rates = np.array([bee.honey_income_base + bee.weight * bee.honey_income_multiplier for bee in harvesters],
+                         dtype=np.float64)[:, None]
+        income = (np.clip(harvests, 0, checks) * rates).sum(axis=0)
+
+        honey, honey_cap = self.honey_amount, self._honey_amount_cap
+        jump = 0
+        for taken, given in zip(np.diff(demand, prepend=0).tolist(), np.diff(income, prepend=0).tolist()):
+            if taken >= honey:
+                break
+
+            honey = min(honey + given, honey_cap) - taken
+            jump += 1
+
+        return jump if jump >= self._min_jump else 0
+
+    def __plan(self):
+        """
+        Decides how the next ticks run: jumping from event to event, or exactly, tick by tick
+        """
+
+        probe = self.probe
+        clock = time.perf_counter
+        started = clock() if probe is not None else 0.0
+
+        self.__sync_all()
+
+        if probe is not None:
+            probe.phase("sync", clock() - started)
+            started = clock()
+
+        self.__shortfall = 0.0
+        was_exact = self.__exact
+
+        jump = self.__safe_jump()
+        self.__exact = jump == 0
+        self.__horizon = self.timers.now + (self._min_jump if self.__exact else jump)
+
+        # stepping exactly, bees may have been short of honey
+        if was_exact and not self.__exact:
+            for bee in self.__synced:
+                self.__predict_death(bee)
+
+        if probe is not None:
+            probe.phase("plan", clock() - started)
+
+    def _update_members(self):
+        tick = self.timers.now + 1
+
+        if self.__exact:
+            super()._update_members()
+
+            for bee in self.__synced:
+                self.__synced[bee] = tick
+
+            return
+
+        probe = self.probe
+
+        deaths = self.__deaths
+        while deaths and deaths[0][0] <= tick:
+            _, order, bee, reason = heapq.heappop(deaths)
+
+            if self.__predictions.get(bee) == order:
+                self.__sync(bee, tick - 1)
+                bee.die(reason)
+
+        for bee in tuple(self.__active):
+            if bee not in self.__synced:
+                continue
+
+            self.__sync(bee, tick - 1)
+
+            if probe is None:
+                bee.update()
+            else:
+                started = time.perf_counter()
+                bee.update()
+                probe.member(type(bee), time.perf_counter() - started)
+
+            if bee in self.__synced:
+                self.__synced[bee] = tick
+
+    def update(self):
+        self.advance(1)
+
+    def advance(self, ticks: int):
+        if ticks < 0:
+            raise ValueError(f"Required: ticks >= 0; Got: {ticks = }")
+
+        if ticks == 0:
+            return
+
+        timers = self.timers
+        target = timers.now + ticks
+        probe = self.probe
+        clock = time.perf_counter
+
+        while timers.now < target:
+            if timers.now >= self.__horizon:
+                self.__plan()
+
+            if not self.__exact and not self.__active:
+                expiry = timers.next_expiry
+                upcoming = min(math.inf if expiry is None else expiry, self.__next_death(), self.__horizon, target)
+
+                if upcoming - 1 > timers.now:
+                    started = clock() if probe is not None else 0.0
+                    timers.skip(upcoming - 1 - timers.now)
+
+                    if probe is not None:
+                        probe.phase("skip", clock() - started)
+
+            self._step()
+
+        started = clock() if probe is not None else 0.0
+        self.__sync_all()
+
+        if probe is not None:
+            probe.phase("sync", clock() - started)
+
+        self._close_tick(ticks)
@@ -1,5 +1,4 @@
 from __future__ import annotations
-import random as rng
 from typing import Type, TYPE_CHECKING
 
 from src.bee import DeathReason
@@ -19,15 +18,12 @@ class HiveElementFactory:
         if not issubclass(bee_type, LiveBee):
             raise ValueError("Unknown bee type")
 
-        bee = bee_type()
-        bee.set_hive(self.hive)
-
-        return bee
+        return bee_type.spawn(self.hive)
 
     def create_bee_from_larva(self, larva: Larva) -> LiveBee:
         possible_bee_types = (DroneBee, WorkerBee)
 
-        bee_type = rng.choice(possible_bee_types)
+        bee_type = self.hive.rng.choice(possible_bee_types)
         bee = self.create_bee(bee_type)
 
         bee.weight = bee.weight + larva.weight / 10
@@ -39,9 +35,8 @@ class HiveElementFactory:
         if not issubclass(type(was), LiveBee):
             raise ValueError("Unknown bee type")
 
-        bee = DeadBee()
+        bee = DeadBee.spawn(was.hive)
 
-        bee.set_hive(was.hive)
         bee.weight = was.weight / 2
         bee.age = was.age
         bee.reason = reason
@@ -53,7 +48,4 @@ class HiveElementFactory:
         if not issubclass(egg_type, BeeEgg):
             raise ValueError("Unknown egg type")
 
-        egg = egg_type()
-        egg.set_hive(self.hive)
-
-        return egg
+        return egg_type.spawn(self.hive)
@@ -0,0 +1,131 @@
+from __future__ import annotations
+import os
+import struct
+from collections import Counter
+from typing import BinaryIO, Iterator, NamedTuple, Tuple, TYPE_CHECKING, Union
+
+from src.bee import DeathReason, DEATH_REASONS
+from src.bee.member import BEE_TYPES
+
+if TYPE_CHECKING:
+    from src.bee.member import DeadBee, LiveBee
+
+
+class BuriedBee(NamedTuple):
+    was: type
+    reason: DeathReason
+    age: int
+    weight: float
+
+
+class Graveyard:
+    """
+    Compact archive of the dead bees cleaned out of the hive
+
+    Only aggregates are kept in memory: counts by type and death reason plus
+    age / weight histograms. Full per-bee records can optionally be appended to a binary file
+    """
+
+    _age_bin = 250
+    _weight_bin = 5.0
+
+    # was type code, death reason code, age, weight
+    _record = struct.Struct("<BBqd")
+
+    def __init__(self, path: Union[str, os.PathLike, None] = None):
+        self.__size = 0
+
+        self.__was_count = Counter()
+        self.__reason_count = Counter()
+        self.__age_histogram = Counter()
+        self.__weight_histogram = Counter()
+
+        self.__file: Union[BinaryIO, None] = None if path is None else open(path, "ab")
+
+    def __len__(self):
+        return self.__size
+
+    def bury(self, dead_bee: DeadBee):
+        self.__size += 1
+
+        self.__was_count[dead_bee.was] += 1
+        self.__reason_count[dead_bee.reason] += 1
+        self.__age_histogram[int(dead_bee.age // self._age_bin) * self._age_bin] += 1
+        self.__weight_histogram[int(dead_bee.weight // self._weight_bin) * self._weight_bin] += 1
+
+        if self.__file is not None:
+            self.__file.write(self._record.pack(BEE_TYPES.index(dead_bee.was),
+                                                DEATH_REASONS.index(dead_bee.reason),
+                                                dead_bee.age, dead_bee.weight))
+
+    def getstate(self) -> Tuple[int, Counter, Counter, Counter, Counter]:
+        """
+        Returns:
+            - amount of buried bees, counts by type and by death reason, age and weight histograms
+        """
+
+        return (self.__size, Counter(self.__was_count), Counter(self.__reason_count),
+                Counter(self.__age_histogram), Counter(self.__weight_histogram))
+
+    def setstate(self, state: Tuple[int, Counter, Counter, Counter, Counter]):
+        size, was_count, reason_count, age_histogram, weight_histogram = state
+
+        self.__size = size
+        self.__was_count = Counter(was_count)
+        self.__reason_count = Counter(reason_count)
+        self.__age_histogram = Counter(age_histogram)
+        self.__weight_histogram = Counter(weight_histogram)
+
+    @property
+    def was_count(self) -> Counter:
+        return +self.__was_count
+
+    @property
+    def reason_count(self) -> Counter:
+        return +self.__reason_count
+
+    @property
+    def age_histogram(self) -> Counter:
+        """
+        Returns:
+            - amount of buried bees by lower bound of their age bin
+        """
+
+        return +self.__age_histogram
+
+    @property
+    def weight_histogram(self) -> Counter:
+        """
+        Returns:
+            - amount of buried bees by lower bound of their weight bin
+        """
+
+        return +self.__weight_histogram
+
+    def records(self) -> Iterator[BuriedBee]:
+        """
+        Returns:
+            - every bee in the record file, read back from it (bees an earlier hive appended to it included)
+        """
+
+        if self.__file is None:
+            raise RuntimeError("Required: an open record file (see `Hive(graveyard_path=...)`); "
+                               "the aggregates cover every buried bee without one")
+
+        self.__file.flush()
+        return self.read_records(self.__file.name)
+
+    def flush(self):
+        if self.__file is not None:
+            self.__file.flush()
+
+    def close(self):
+        if self.__file is not None:
+            self.__file.close()
+            self.__file = None
+
+    @classmethod
+    def read_records(cls, path: Union[str, os.PathLike]) -> Iterator[BuriedBee]:
+        with open(path, "rb") as file:
+            for was, reason, age, weight in cls._record.iter_unpack(file.read()):
+                yield BuriedBee(BEE_TYPES[was], DEATH_REASONS[reason], age, weight)
@@ -1,34 +1,77 @@
 from __future__ import annotations
-from typing import Set, TYPE_CHECKING, Type
+import gc
+import math
+import os
+import time
+import uuid
+import warnings
+from typing import Callable, Dict, List, Tuple, TYPE_CHECKING, Type, Union
 from collections import Counter
 
+import numpy as np
+
 import src.bee.member as _bees_
 import src.egg.member as _eggs_
-from src.bee import DeathReason
+from src.bee import DeathReason, DEATH_REASONS
+from src.bee.state import BEE_STATES
 from src.egg import EggEvent
+from src.egg.state import EGG_STATES
 from src.common import SimObject
+from lib.state_lib.state import TempState
+from lib.state_lib.timer import TimerQueue, TimerWheel
 from src.hive.factory import HiveElementFactory
+from src.hive.graveyard import Graveyard
+from src.hive.ids import IdScheme, SequentialIds
+from src.hive.ledger import HoneyLedger
+from src.hive.snapshot import (BEE_RECORD, BEE_TRAITS, DEAD_BEE_RECORD, EGG_RECORD, Snapshot,
+                               decode_counts, encode_counts, read_snapshot, write_snapshot)
 from src.utils.num import clamp
+from src.utils.rng import BatchedRandom
+from src.utils.slotmap import SlotMap
 
 if TYPE_CHECKING:
+    from lib.state_lib.state import State
+    from src.common import HasBehavior
     from src.bee.member import DeadBee, Larva, LiveBee
+    from src.hive.graveyard import BuriedBee
     from src.egg.member import BeeEgg
+    from src.sim.profiler import TickProfiler
 
 
 class Hive(SimObject):
     _honey_take_cap = 100.0
     _honey_amount_cap = 500000.0
     _eggs_cap = 100
+    _timers_type = TimerWheel
 
     def __init__(self, drones_amount: int, workers_amount: int,
-                 eggs_amount: int, honey_amount: float):        
+                 eggs_amount: int, honey_amount: float,
+                 graveyard_path: Union[str, os.PathLike, None] = None, ids: Union[IdScheme, None] = None,
+                 seed: Union[int, None] = None):
         self.honey_amount = honey_amount
+        self.__rng = BatchedRandom(seed)
+        self.__ids = ids if ids is not None else SequentialIds()
+        self.__ledger = HoneyLedger()
+        self.__tick_listeners: List[Callable[[int], None]] = []
+        self.__probe: Union[TickProfiler, None] = None
+        self.__timers = self._timers_type()
         self.__factory = HiveElementFactory(self)
 
-        self.__eggs: Set[BeeEgg] = set()
-        self.__live_bees: Set[LiveBee] = set()
-        self.__dead_bees_in_hive: Set[DeadBee] = set()
-        self.__dead_bees_in_grave: Set[DeadBee] = set()
+        self.__eggs: SlotMap[BeeEgg] = SlotMap()
+        self.__live_bees: SlotMap[LiveBee] = SlotMap()
+        self.__dead_bees_in_hive: SlotMap[DeadBee] = SlotMap()
+        self.__dead_bees_in_grave = Graveyard(graveyard_path)
+        self.__unfertilized_eggs: SlotMap[BeeEgg] = SlotMap()
+
+        self.__live_bees_type_count = Counter()
+        self.__eggs_status_count = Counter()
+        self.__dead_bees_in_hive_was_count = Counter()
+        self.__dead_bees_in_hive_reason_count = Counter()
+
+        # population changes requested while a tick is running are queued here
+        # and applied, in request order, once the tick is over
+        self.__in_tick = False
+        self.__pending: List[Tuple[Callable, tuple]] = []
 
         self.__queen_bee = self.__factory.create_bee(_bees_.QueenBee)
         self.add_bees(_bees_.DroneBee, drones_amount)
@@ -45,6 +88,10 @@ class Hive(SimObject):
     def eggs(self):
         return self.__eggs    
     
+    @property
+    def unfertilized_eggs(self):
+        return self.__unfertilized_eggs
+
     @property
     def live_bees(self):
         return self.__live_bees
@@ -54,12 +101,25 @@ class Hive(SimObject):
         return self.__dead_bees_in_hive
     
     @property
-    def dead_bees_in_grave(self):
+    def dead_bees_in_grave(self) -> Graveyard:
         return self.__dead_bees_in_grave
 
     @property
-    def all_dead_bees(self):
-        return self.dead_bees_in_grave.union(self.dead_bees_in_hive)
+    def all_dead_bees(self) -> List[Union[BuriedBee, DeadBee]]:
+        """
+        Deprecated: buried bees are only kept as the aggregates of `dead_bees_in_grave`,
+        see `all_dead_bees_was_count` and `all_dead_bees_reason_count`
+
+        Returns:
+            - the buried bees read back from the record file of the graveyard, then the dead bees in the hive;
+              raises RuntimeError for a hive without a `graveyard_path`
+        """
+
+        warnings.warn("`Hive.all_dead_bees` is deprecated: use `all_dead_bees_was_count`, "
+                      "`all_dead_bees_reason_count` or the aggregates of `dead_bees_in_grave`",
+                      DeprecationWarning, stacklevel=2)
+
+        return [*self.__dead_bees_in_grave.records(), *self.__dead_bees_in_hive]
 
     @property
     def honey_amount(self):
@@ -69,7 +129,264 @@ class Hive(SimObject):
     def honey_amount(self, value):
         self.__honey_amount = clamp(value, 0.0, self._honey_amount_cap)
 
-    def take_honey(self, amount: float):
+    @property
+    def timers(self) -> Union[TimerWheel, TimerQueue]:
+        return self.__timers
+
+    @property
+    def rng(self) -> BatchedRandom:
+        return self.__rng
+
+    @property
+    def ids(self) -> IdScheme:
+        return self.__ids
+
+    @property
+    def ledger(self) -> HoneyLedger:
+        return self.__ledger
+
+    @property
+    def probe(self) -> Union[TickProfiler, None]:
+        return self.__probe
+
+    def set_probe(self, probe: Union[TickProfiler, None]):
+        """
+        `probe` is told the wall time of every phase of a tick and of every member update,
+        and what happens during the tick; None turns it off, which leaves a check of the probe
+        per phase, per honey take and put and per population change
+        """
+
+        self.__probe = probe
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def close(self):
+        """
+        Closes the record file of the graveyard, if any; bees buried afterwards only go to its aggregates
+        """
+
+        self.__dead_bees_in_grave.close()
+
+    def save(self, path: Union[str, os.PathLike]):
+        """
+        Writes the whole state of the hive to `path` in a compact binary format (see `src.hive.snapshot`):
+        every member with its state and the time left in it, the dead bees, honey, clock, ids, random stream
+        and the state of the engine. Only possible between ticks, with sequential ids
+        """
+
+        if self.__in_tick:
+            raise RuntimeError("Cannot save a hive during a tick")
+
+        if not isinstance(self.__ids, SequentialIds):
+            raise ValueError(f"Required: sequential ids; Got: {type(self.__ids) = }")
+
+        ranks = {getattr(timer.callback, "__self__", None): rank
+                 for rank, timer in enumerate(self.__timers.pending())}
+
+        def countdown(member: HasBehavior) -> Tuple[int, int]:
+            if isinstance(member.state, TempState):
+                return member.state.time_left, ranks.get(member.state, -1)
+
+            return 0, -1
+
+        live_bees = list(self.__live_bees)
+        eggs = list(self.__eggs)
+        dead_bees = list(self.__dead_bees_in_hive)
+
+        bees = np.array([(_bees_.BEE_TYPES.index(type(bee)), BEE_STATES.index(type(bee.state)), *countdown(bee),
+                          bee.id, bee.weight, bee.age, bee.lifespan, bee.starvation_rate,
+                          bee.honey_consumption_multiplier, bee.rest_time,
+                          getattr(bee, BEE_TRAITS[type(bee)]) if type(bee) in BEE_TRAITS else 0)
+                         for bee in (self.__queen_bee, *live_bees)], dtype=BEE_RECORD)
+        egg_records = np.array([(EGG_STATES.index(type(egg.state)), *countdown(egg), egg.id, egg.hatching_time)
+                                for egg in eggs], dtype=EGG_RECORD)
+        dead_bee_records = np.array([(_bees_.BEE_TYPES.index(bee.was), DEATH_REASONS.index(bee.reason),
+                                      bee.id, bee.weight, bee.age)
+                                     for bee in dead_bees], dtype=DEAD_BEE_RECORD)
+
+        live_bee_row = {bee: row for row, bee in enumerate(live_bees)}
+        egg_row = {egg: row for row, egg in enumerate(eggs)}
+        dead_bee_row = {bee: row for row, bee in enumerate(dead_bees)}
+
+        next_id, namespace = self.__ids.getstate()
+        generator_state, draws = self.__rng.getstate()
+        buried, was_count, reason_count, age_histogram, weight_histogram = self.__dead_bees_in_grave.getstate()
+
+        engine = self._engine_state({bee: row for row, bee in enumerate((self.__queen_bee, *live_bees))})
+
+        meta = {
+            "engine": type(self).__name__,
+            "engine_state": engine.meta,
+            "clock": self.__timers.now,
+            "honey": self.honey_amount,
+            "ids": [next_id, str(namespace)],
+            "rng": generator_state,
+            "ledger": list(self.__ledger.getstate()),
+            "graveyard": [buried,
+                          encode_counts(was_count, _bees_.BEE_TYPES), encode_counts(reason_count, DEATH_REASONS),
+                          list(age_histogram.items()), list(weight_histogram.items())],
+        }
+
+        def rows(items: List, row_of: dict) -> np.ndarray:
+            return np.array([row_of[item] for item in items], dtype=np.int64)
+
+        # storage orders are the orders `choice` and `sample` see the members in, which removals shuffle
+        arrays = {
+            "bees": bees,
+            "eggs": egg_records,
+            "dead_bees": dead_bee_records,
+            "live_bees_storage": rows(self.__live_bees.storage_order(), live_bee_row),
+            "eggs_storage": rows(self.__eggs.storage_order(), egg_row),
+            "unfertilized": rows(list(self.__unfertilized_eggs), egg_row),
+            "unfertilized_storage": rows(self.__unfertilized_eggs.storage_order(), egg_row),
+            "dead_bees_storage": rows(self.__dead_bees_in_hive.storage_order(), dead_bee_row),
+            "draws": np.array(draws, dtype=np.float64),
+            **engine.arrays,
+        }
+
+        self.__dead_bees_in_grave.flush()
+        write_snapshot(path, Snapshot(meta, arrays))
+
+    @classmethod
+    def load(cls, path: Union[str, os.PathLike], graveyard_path: Union[str, os.PathLike, None] = None) -> Hive:
+        """
+        Recreates a hive written by `save`, which carries on as the saved one would have.
+        Buried bees only come back as the aggregates of the graveyard; new ones go to `graveyard_path`.
+        The snapshot must come from the same engine (`cls`)
+        """
+
+        meta, arrays = read_snapshot(path)
+
+        if meta["engine"] != cls.__name__:
+            raise ValueError(f"Required: a snapshot of a {cls.__name__}; Got: {meta['engine'] = }")
+
+        # collections triggered by the bulk of new members would find nothing to free
+        collecting = gc.isenabled()
+        gc.disable()
+
+        try:
+            return cls.__restore(Snapshot(meta, arrays), graveyard_path)
+        finally:
+            if collecting:
+                gc.enable()
+
+    @classmethod
+    def __restore(cls, snapshot: Snapshot, graveyard_path: Union[str, os.PathLike, None]) -> Hive:
+        meta, arrays = snapshot
+        bees, eggs, dead_bees = arrays["bees"], arrays["eggs"], arrays["dead_bees"]
+
+        next_id, namespace = meta["ids"]
+        namespace = uuid.UUID(namespace)
+
+        # the record file is only opened once the hive is restored
+        hive = cls(0, 0, 0, meta["honey"])
+        hive.__timers = timers = cls._timers_type(now=meta["clock"])
+
+        # members are revived straight from the columns: their constructors would draw traits and enter states
+        columns = ("id", "weight", "age", "lifespan", "starvation_rate", "honey_consumption_multiplier",
+                   "rest_time", "trait")
+        restored = []
+        for code, bee_id, weight, age, lifespan, starvation_rate, multiplier, rest_time, trait in \
+                zip(bees["type"].tolist(), *(bees[column].tolist() for column in columns)):
+            bee_type = _bees_.BEE_TYPES[code]
+            bee = bee_type.revive(hive, bee_id)
+            bee.weight = weight
+            bee.age = age
+            bee.lifespan = lifespan if math.isinf(lifespan) else int(lifespan)
+            bee.starvation_rate = starvation_rate
+            bee.honey_consumption_multiplier = multiplier
+            bee.rest_time = rest_time
+
+            if bee_type in BEE_TRAITS:
+                setattr(bee, BEE_TRAITS[bee_type], trait)
+
+            restored.append(bee)
+
+        hive.__queen_bee, *live_bees = restored
+
+        hive_eggs = []
+        for egg_id, hatching_time in zip(eggs["id"].tolist(), eggs["hatching_time"].tolist()):
+            egg = _eggs_.GenericBeeEgg.revive(hive, egg_id)
+            egg.hatching_time = hatching_time
+            hive_eggs.append(egg)
+
+        hive_dead_bees = []
+        for bee_id, was, reason, weight, age in zip(*(dead_bees[column].tolist()
+                                                      for column in ("id", "was", "reason", "weight", "age"))):
+            bee = _bees_.DeadBee.revive(hive, bee_id)
+            bee.was = _bees_.BEE_TYPES[was]
+            bee.reason = DEATH_REASONS[reason]
+            bee.weight = weight
+            bee.age = age
+            hive_dead_bees.append(bee)
+
+        # countdowns are scheduled in the order they were to run out in,
+        # so that the ones running out on the same tick still fire in the same order
+        members = [*restored, *hive_eggs]
+        states = [BEE_STATES[code] for code in bees["state"].tolist()] + \
+                 [EGG_STATES[code] for code in eggs["state"].tolist()]
+        times_left = np.concatenate((bees["time_left"], eggs["time_left"])).tolist()
+        ranks = np.concatenate((bees["timer"], eggs["timer"]))
+
+        for index in np.argsort(ranks, kind="stable").tolist():
+            member, state_type = members[index], states[index]
+
+            if issubclass(state_type, TempState):
+                member.restore_state(state_type.resume(member, times_left[index], timers))
+            else:
+                member.restore_state(state_type(member))
+
+        def stored(members: List, storage: str) -> List:
+            return [members[row] for row in arrays[storage].tolist()]
+
+        hive.__live_bees = SlotMap.restore(live_bees, stored(live_bees, "live_bees_storage"))
+        hive.__eggs = SlotMap.restore(hive_eggs, stored(hive_eggs, "eggs_storage"))
+        hive.__dead_bees_in_hive = SlotMap.restore(hive_dead_bees, stored(hive_dead_bees, "dead_bees_storage"))
+        hive.__unfertilized_eggs = SlotMap.restore(stored(hive_eggs, "unfertilized"),
+                                                   stored(hive_eggs, "unfertilized_storage"))
+
+        hive.__live_bees_type_count.update(type(bee) for bee in live_bees)
+        hive.__eggs_status_count.update(egg.is_fertilized for egg in hive_eggs)
+        hive.__dead_bees_in_hive_was_count.update(bee.was for bee in hive_dead_bees)
+        hive.__dead_bees_in_hive_reason_count.update(bee.reason for bee in hive_dead_bees)
+
+        buried, was_count, reason_count, age_histogram, weight_histogram = meta["graveyard"]
+        hive.__dead_bees_in_grave = Graveyard(graveyard_path)
+        hive.__dead_bees_in_grave.setstate((buried,
+                                            decode_counts(was_count, _bees_.BEE_TYPES),
+                                            decode_counts(reason_count, DEATH_REASONS),
+                                            Counter(dict(map(tuple, age_histogram))),
+                                            Counter(dict(map(tuple, weight_histogram)))))
+
+        hive.__ids.setstate((next_id, namespace))
+        hive.__rng.setstate((meta["rng"], arrays["draws"].tolist()))
+        hive.__ledger.setstate(tuple(meta["ledger"]))
+        hive._restore_engine(Snapshot(meta["engine_state"], arrays), restored)
+
+        return hive
+
+    def _engine_state(self, bee_rows: Dict[LiveBee, int]) -> Snapshot:
+        """
+        Called by `save` for the state of the engine beyond the members and the hive;
+        `bee_rows` gives the row of every live bee, the queen included, in the saved bees.
+        The arrays are saved next to the hive's, so their names must not clash
+        """
+
+        return Snapshot({}, {})
+
+    def _restore_engine(self, snapshot: Snapshot, bees: List[LiveBee]):
+        """
+        Called by `load` once the hive is restored, with what `_engine_state` returned
+        (the arrays among the hive's) and the live bees, the queen included, in their saved rows
+        """
+
+        pass
+
+    def take_honey(self, amount: float, taker: Union[Type[LiveBee], None] = None):
         amount = min(
             amount,
             self._honey_take_cap,
@@ -77,78 +394,301 @@ class Hive(SimObject):
         )
 
         self.honey_amount -= amount
+        self.__ledger.record_consumption(amount, taker)
+
+        if self.__probe is not None:
+            self.__probe.count("honey_takes")
 
         return amount
 
-    def put_honey(self, amount: float):
+    def put_honey(self, amount: float, giver: Union[Type[LiveBee], None] = None):
+        honey_before = self.honey_amount
         self.honey_amount += amount
+        self.__ledger.record_income(self.honey_amount - honey_before, giver)
+
+        if self.__probe is not None:
+            self.__probe.count("honey_puts")
+
+    def __defer(self, command: Callable, *args):
+        if self.__in_tick:
+            self.__pending.append((command, args))
+        else:
+            command(*args)
+
+    def __apply_pending(self):
+        for command, args in self.__pending:
+            command(*args)
+
+        self.__pending.clear()
 
     def add_eggs(self, egg_type: Type[_eggs_.BeeEgg], amount: int):
-        amount = min(amount, self._eggs_cap - len(self.eggs))
-        self.eggs.update(self.__factory.create_egg(egg_type) for _ in range(amount))
+        self.__defer(self.__add_eggs, egg_type, amount)
+
+    def __add_eggs(self, egg_type: Type[_eggs_.BeeEgg], amount: int):
+        amount = max(0, min(amount, self._eggs_cap - len(self.eggs)))
+
+        for _ in range(amount):
+            egg = self.__factory.create_egg(egg_type)
+            self.eggs.add(egg)
+            self.__unfertilized_eggs.add(egg)
+
+        self.__eggs_status_count[False] += amount
+
+        if self.__probe is not None:
+            self.__probe.count("eggs_laid", amount)
 
     def add_bees(self, bee_type: Type[_bees_.LiveBee], amount: int):
-        self.live_bees.update(self.__factory.create_bee(bee_type) for _ in range(amount))
+        self.__defer(self.__add_bees, bee_type, amount)
+
+    def __add_bees(self, bee_type: Type[_bees_.LiveBee], amount: int):
+        amount = max(0, amount)
+
+        for _ in range(amount):
+            bee = self.__factory.create_bee(bee_type)
+            self.live_bees.add(bee)
+            self._bee_added(bee)
+
+        self.__live_bees_type_count[bee_type] += amount
 
     def egg_fertilized(self, egg: BeeEgg):
+        was_fertilized = egg.is_fertilized
         egg.bsm.next_state(EggEvent.WAS_FERTILIZED, egg)
 
+        if egg.is_fertilized and not was_fertilized:
+            self.__unfertilized_eggs.discard(egg)
+            self.__eggs_status_count[False] -= 1
+            self.__eggs_status_count[True] += 1
+
+            if self.__probe is not None:
+                self.__probe.count("fertilizations")
+
     def egg_hatched(self, egg: BeeEgg):
+        self.__defer(self.__egg_hatched, egg)
+
+    def __egg_hatched(self, egg: BeeEgg):
         self.eggs.remove(egg)
-        self.add_bees(_bees_.Larva, 1)
+        self.__unfertilized_eggs.discard(egg)
+        self.__eggs_status_count[True] -= 1
+        self.__add_bees(_bees_.Larva, 1)
+
+        if self.__probe is not None:
+            self.__probe.count("hatchings")
 
     def larva_transformed(self, larva: Larva):
+        self.__defer(self.__larva_transformed, larva)
+
+    def __larva_transformed(self, larva: Larva):
+        bee = self.__factory.create_bee_from_larva(larva)
+
         self.live_bees.remove(larva)
-        self.live_bees.add(self.__factory.create_bee_from_larva(larva))
+        self._bee_removed(larva)
+        self.live_bees.add(bee)
+        self._bee_added(bee)
+        self.__live_bees_type_count[type(larva)] -= 1
+        self.__live_bees_type_count[type(bee)] += 1
+
+        if self.__probe is not None:
+            self.__probe.count("transformations")
 
     def bee_died(self, bee: LiveBee, reason: DeathReason):
+        # a dead bee must not act on a countdown that runs out later in this very tick
+        if isinstance(bee.state, TempState):
+            bee.state.cancel()
+
+        self.__defer(self.__bee_died, bee, reason)
+
+    def __bee_died(self, bee: LiveBee, reason: DeathReason):
         self.live_bees.remove(bee)
+        self._bee_removed(bee)
         self.dead_bees_in_hive.add(self.__factory.create_dead_bee(bee, reason))
 
+        self.__live_bees_type_count[type(bee)] -= 1
+        self.__dead_bees_in_hive_was_count[type(bee)] += 1
+        self.__dead_bees_in_hive_reason_count[reason] += 1
+
+        if self.__probe is not None:
+            self.__probe.count("deaths")
+
     def dead_bee_cleaned(self, dead_bee: DeadBee):
         self.dead_bees_in_hive.remove(dead_bee)
-        self.dead_bees_in_grave.add(dead_bee)
-        
+        self.dead_bees_in_grave.bury(dead_bee)
+        self.__dead_bees_in_hive_was_count[dead_bee.was] -= 1
+        self.__dead_bees_in_hive_reason_count[dead_bee.reason] -= 1
+
+        if self.__probe is not None:
+            self.__probe.count("burials")
+
+    def state_changing(self, member: HasBehavior, new_state: State):
+        """
+        Called by the behavior of a hive element right before it enters `new_state`
+        """
+
+        pass
+
+    def _bee_added(self, bee: LiveBee):
+        """
+        Called once `bee` has joined the live bees
+        """
+
+        pass
+
+    def _bee_removed(self, bee: LiveBee):
+        """
+        Called once `bee` has left the live bees
+        """
+
+        pass
+
     def update(self):
+        """
+        Temporary states whose time is up change once every member has been updated.
+
+        Births, deaths, larva transformations and hatchings requested during the tick are
+        applied in the order they were requested, after every member has been updated;
+        they become visible from the next tick on
+        """
+
+        self._step()
+        self._close_tick()
+
+    def add_tick_listener(self, listener: Callable[[int], None]):
+        """
+        `listener` is called with the amount of ticks booked whenever the hive closes its honey ledger:
+        after every `update`, or once per `advance` for an engine that books several ticks at once
+        """
+
+        self.__tick_listeners.append(listener)
+
+    def remove_tick_listener(self, listener: Callable[[int], None]):
+        self.__tick_listeners.remove(listener)
+
+    def _close_tick(self, ticks: int = 1):
+        probe = self.__probe
+        started = time.perf_counter() if probe is not None else 0.0
+
+        self.__ledger.close_tick(ticks)
+
+        for listener in self.__tick_listeners:
+            listener(ticks)
+
+        if probe is not None:
+            probe.phase("ledger", time.perf_counter() - started)
+            probe.ticks_booked(ticks)
+
+    def advance(self, ticks: int):
+        """
+        Same as calling `update` `ticks` times
+        """
+
+        if ticks < 0:
+            raise ValueError(f"Required: ticks >= 0; Got: {ticks = }")
+
+        for _ in range(ticks):
+            self.update()
+
+    def _step(self):
+        """
+        Runs one tick, leaving the honey ledger open
+        """
+
+        if self.__probe is not None:
+            self.__step_probed(self.__probe)
+            return
+
+        self.__in_tick = True
+        try:
+            self._update_members()
+            self.__timers.advance()
+        finally:
+            self.__in_tick = False
+
+        self.__apply_pending()
+
+    def __step_probed(self, probe: TickProfiler):
+        clock = time.perf_counter
+
+        self.__in_tick = True
+        try:
+            started = clock()
+            self._update_members()
+            probe.phase("members", clock() - started)
+
+            started = clock()
+            self.__timers.advance()
+            probe.phase("timers", clock() - started)
+        finally:
+            self.__in_tick = False
+
+        started = clock()
+        self.__apply_pending()
+        probe.phase("pending", clock() - started)
+
+    def _update_members(self):
+        if self.__probe is not None:
+            self.__update_members_probed(self.__probe)
+            return
+
         self.queen_bee.update()
 
-        for bee in self.__live_bees.copy():
+        for bee in self.__live_bees:
             bee.update()
 
-        for egg in self.__eggs.copy():
+        for egg in self.__eggs:
             egg.update()
 
+    def __update_members_probed(self, probe: TickProfiler):
+        clock = time.perf_counter
+
+        for member in (self.queen_bee, *self.__live_bees, *self.__eggs):
+            started = clock()
+            member.update()
+            probe.member(type(member), clock() - started)
+
+    # counters below are kept up to date by the population callbacks above;
+    # reading one only copies its non-zero entries
     @property
     def live_bees_type_count(self):
-        return Counter((type(bee) for bee in self.__live_bees))
+        return +self.__live_bees_type_count
 
     @property
     def all_dead_bees_was_count(self):
-        return Counter(bee.was for bee in self.all_dead_bees)
+        return self.__dead_bees_in_grave.was_count + self.__dead_bees_in_hive_was_count
 
     @property
     def all_dead_bees_reason_count(self):
-        return Counter(bee.reason for bee in self.all_dead_bees)
+        return self.__dead_bees_in_grave.reason_count + self.__dead_bees_in_hive_reason_count
 
     @property
     def dead_bees_in_hive_was_count(self):
-        return Counter((bee.was for bee in self.dead_bees_in_hive))
+        return +self.__dead_bees_in_hive_was_count
 
     @property
     def eggs_status_count(self):
-        return Counter(egg.is_fertilized for egg in self.eggs)
+        return +self.__eggs_status_count
 
     @property
     def honey_consumption(self):
-        return sum(b.honey_consumption for b in self.live_bees)
+        """
+        Honey actually taken during the last tick
+        """
+
+        return self.__ledger.consumption
 
     @property
     def honey_income(self):
-        return sum(b.honey_income for b in filter(lambda b: isinstance(b, _bees_.WorkerBee) and b.is_harvesting, self.live_bees))
+        """
+        Honey actually put during the last tick
+        """
+
+        return self.__ledger.income
+
+    @property
+    def queen_fertility(self):
+        return self.queen_bee.fertility
 
     @property
     def drone_efficiency_factor(self):
         if len(self.eggs) == 0:
             return 1
 
-        return sum(1 for egg in self.eggs if egg.is_fertilized) / len(self.eggs)
+        return self.__eggs_status_count[True] / len(self.eggs)
@@ -0,0 +1,57 @@
+import uuid
+from abc import ABC, abstractmethod
+from typing import Hashable, Tuple
+
+
+class IdScheme(ABC):
+    """
+    Hands out the ids of the elements of one hive
+    """
+
+    @abstractmethod
+    def next_id(self) -> Hashable:
+        pass
+
+    @abstractmethod
+    def to_uuid(self, element_id: Hashable) -> uuid.UUID:
+        pass
+
+
+class SequentialIds(IdScheme):
+    """
+    Monotonic integers, starting at 1
+
+    UUIDs are only derived on demand: the same id always maps to the same UUID,
+    which is unique to this scheme
+    """
+
+    def __init__(self):
+        self.__next = 1
+        self.__namespace = uuid.uuid4()
+
+    def getstate(self) -> Tuple[int, uuid.UUID]:
+        return self.__next, self.__namespace
+
+    def setstate(self, state: Tuple[int, uuid.UUID]):
+        self.__next, self.__namespace = state
+
+    def next_id(self) -> int:
+        element_id = self.__next
+        self.__next += 1
+
+        return element_id
+
+    def to_uuid(self, element_id: int) -> uuid.UUID:
+        return uuid.uuid5(self.__namespace, str(element_id))
+
+
+class RandomUUIDs(IdScheme):
+    """
+    A random UUID per element, drawn up front
+    """
+
+    def next_id(self) -> uuid.UUID:
+        return uuid.uuid4()
+
+    def to_uuid(self, element_id: uuid.UUID) -> uuid.UUID:
+        return element_id
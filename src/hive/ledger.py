@@ -0,0 +1,95 @@
+from collections import Counter
+from typing import Hashable, Tuple, Union
+
+
+class HoneyLedger:
+    """
+    Realised honey flows of a hive
+
+    Amounts are accumulated per source (usually a bee type) during a tick;
+    `close_tick` publishes them as the flows of the last completed tick.
+    An engine that books several ticks at once closes them together, and the published
+    flows are then the per tick averages over those ticks
+    """
+
+    def __init__(self):
+        self.__income = Counter()
+        self.__consumption = Counter()
+
+        self.__last_income = Counter()
+        self.__last_consumption = Counter()
+
+        self.__last_ticks = 1
+
+        self.__total_income = 0.0
+        self.__total_consumption = 0.0
+        self.__total_ticks = 0
+
+    def getstate(self) -> Tuple[float, float]:
+        """
+        Returns:
+            - total income and total consumption; the flows of the current and last tick are not kept
+        """
+
+        return self.__total_income, self.__total_consumption
+
+    def setstate(self, state: Tuple[float, float]):
+        self.__total_income, self.__total_consumption = state
+
+        for flows in (self.__income, self.__consumption, self.__last_income, self.__last_consumption):
+            flows.clear()
+
+        self.__last_ticks = 1
+
+    def record_income(self, amount: float, source: Union[Hashable, None] = None):
+        self.__income[source] += amount
+
+    def record_consumption(self, amount: float, source: Union[Hashable, None] = None):
+        self.__consumption[source] += amount
+
+    def close_tick(self, ticks: int = 1):
+        if ticks < 1:
+            raise ValueError(f"Required: ticks >= 1; Got: {ticks = }")
+
+        self.__last_ticks = ticks
+        self.__last_income, self.__income = self.__income, self.__last_income
+        self.__last_consumption, self.__consumption = self.__consumption, self.__last_consumption
+        self.__income.clear()
+        self.__consumption.clear()
+
+        self.__total_income += sum(self.__last_income.values())
+        self.__total_consumption += sum(self.__last_consumption.values())
+        self.__total_ticks += ticks
+
+    @property
+    def income(self) -> float:
+        return sum(self.__last_income.values()) / self.__last_ticks
+
+    @property
+    def consumption(self) -> float:
+        return sum(self.__last_consumption.values()) / self.__last_ticks
+
+    @property
+    def income_by_source(self) -> Counter:
+        return Counter({source: amount / self.__last_ticks for source, amount in self.__last_income.items()})
+
+    @property
+    def consumption_by_source(self) -> Counter:
+        return Counter({source: amount / self.__last_ticks for source, amount in self.__last_consumption.items()})
+
+    @property
+    def total_income(self) -> float:
+        return self.__total_income
+
+    @property
+    def total_consumption(self) -> float:
+        return self.__total_consumption
+
+    @property
+    def total_ticks(self) -> int:
+        """
+        Returns:
+            - amount of ticks closed since the ledger was created; unlike the totals, not part of its state
+        """
+
+        return self.__total_ticks
@@ -0,0 +1,68 @@
+import json
+import os
+from collections import Counter
+from typing import Any, Dict, List, NamedTuple, Sequence, Union
+
+import numpy as np
+
+from src.bee.member import DroneBee, Larva, WorkerBee
+
+_FORMAT = "beesim-hive"
+_VERSION = 1
+
+# one row per live bee, the queen first, in the order the hive updates them;
+# `timer` is the rank of the bee's countdown among the pending timers (-1 without one),
+# `trait` the attribute only some bee types have (see `BEE_TRAITS`)
+BEE_RECORD = np.dtype([
+    ("type", np.uint8), ("state", np.uint8), ("time_left", np.int64), ("timer", np.int64),
+    ("id", np.int64), ("weight", np.float64), ("age", np.int64), ("lifespan", np.float64),
+    ("starvation_rate", np.float64), ("honey_consumption_multiplier", np.float64),
+    ("rest_time", np.int64), ("trait", np.int64),
+])
+EGG_RECORD = np.dtype([
+    ("state", np.uint8), ("time_left", np.int64), ("timer", np.int64),
+    ("id", np.int64), ("hatching_time", np.int64),
+])
+DEAD_BEE_RECORD = np.dtype([
+    ("was", np.uint8), ("reason", np.uint8), ("id", np.int64), ("weight", np.float64), ("age", np.int64),
+])
+
+BEE_TRAITS = {DroneBee: "fertility", WorkerBee: "honey_harvest_time", Larva: "growth_time"}
+
+
+class Snapshot(NamedTuple):
+    # plain values only, stored as JSON
+    meta: Dict[str, Any]
+    arrays: Dict[str, np.ndarray]
+
+
+def encode_counts(counts: Counter, codes: Sequence) -> List[int]:
+    return [counts[key] for key in codes]
+
+
+def decode_counts(counts: Sequence[int], codes: Sequence) -> Counter:
+    return +Counter(dict(zip(codes, counts)))
+
+
+def write_snapshot(path: Union[str, os.PathLike], snapshot: Snapshot):
+    """
+    Writes `snapshot` as an uncompressed NumPy archive; nothing is pickled
+    """
+
+    meta = json.dumps({"format": _FORMAT, "version": _VERSION, **snapshot.meta}).encode()
+
+    # a file object, so that NumPy does not append an extension to `path`
+    with open(path, "wb") as file:
+        np.savez(file, meta=np.frombuffer(meta, dtype=np.uint8), **snapshot.arrays)
+
+
+def read_snapshot(path: Union[str, os.PathLike]) -> Snapshot:
+    with np.load(path, allow_pickle=False) as archive:
+        meta = json.loads(archive["meta"].tobytes())
+        arrays = {name: archive[name] for name in archive.files if name != "meta"}
+
+    found = meta.pop("format", None), meta.pop("version", None)
+    if found != (_FORMAT, _VERSION):
+        raise ValueError(f"Required: a {_FORMAT} snapshot of version {_VERSION}; Got: {found = }")
+
+    return Snapshot(meta, arrays)
@@ -0,0 +1,504 @@
+from __future__ import annotations
+import math
+import os
+from collections import Counter
+from typing import Callable, Dict, List, Union
+
+import numpy as np
+
+import src.bee.member as _bees_
+from src.bee import DeathReason, DEATH_REASONS
+from src.bee.member import BEE_TYPES
+from src.common import SimObject
+from src.hive.hive import Hive
+from src.hive.ledger import HoneyLedger
+from src.hive.snapshot import Snapshot, read_snapshot, write_snapshot
+from src.utils.num import clamp, linear_remap
+
+# bee type codes, positions in `BEE_TYPES`
+QUEEN, DRONE, WORKER, LARVA = range(4)
+
+# bee state codes; instantaneous states (laying / fertilizing eggs, transforming)
+# are resolved within the tick they are entered, so they never get a code
+RESTING, HARVESTING, CLEANING, GROWING = range(4)
+
+
+class Columns:
+    """
+    Growable structure-of-arrays storage
+
+    Every column holds one attribute of all the rows; `self[name]` is a view over the rows in use
+    """
+
+    def __init__(self, dtypes: Dict[str, Union[type, str]], capacity: int = 64):
+        self.__size = 0
+        self.__data = {name: np.zeros(max(1, capacity), dtype=dtype) for name, dtype in dtypes.items()}
+
+    def __len__(self):
+        return self.__size
+
+    def __getitem__(self, name: str) -> np.ndarray:
+        return self.__data[name][:self.__size]
+
+    def append(self, amount: int, **values):
+        if amount <= 0:
+            return
+
+        start, stop = self.__size, self.__size + amount
+        self.__reserve(stop)
+
+        for name, column in self.__data.items():
+            column[start:stop] = values.get(name, 0)
+
+        self.__size = stop
+
+    def records(self) -> np.ndarray:
+        """
+        Returns:
+            - copy of the rows in use as a structured array, a field per column
+        """
+
+        records = np.empty(self.__size, dtype=[(name, column.dtype) for name, column in self.__data.items()])
+        for name, column in self.__data.items():
+            records[name] = column[:self.__size]
+
+        return records
+
+    def keep(self, mask: np.ndarray):
+        """
+        Drops every row whose `mask` value is False, preserving the order of the rest
+        """
+
+        kept = int(np.count_nonzero(mask))
+        if kept == self.__size:
+            return
+
+        for column in self.__data.values():
+            column[:kept] = column[:self.__size][mask]
+
+        self.__size = kept
+
+    def __reserve(self, size: int):
+        capacity = len(next(iter(self.__data.values())))
+        if size <= capacity:
+            return
+
+        while capacity < size:
+            capacity *= 2
+
+        for name, column in self.__data.items():
+            grown = np.zeros(capacity, dtype=column.dtype)
+            grown[:self.__size] = column[:self.__size]
+            self.__data[name] = grown
+
+
+class VectorizedHive(SimObject):
+    """
+    Hive engine that keeps the whole population as NumPy columns
+
+    Mirrors the rules of `Hive` and the bee / egg members, but advances aging, honey consumption,
+    starvation and state timers of every bee at once. Per-bee decisions that depend on the order
+    of the bees (honey shortage, eggs to fertilize, dead bees to clean) are resolved in array order
+    """
+
+    # the caps are `Hive`'s, read on every use so that overriding them on `Hive` applies to both engines
+
+    _hatching_time = 1000
+    _queen_rest_time = 1500
+
+    def __init__(self, drones_amount: int, workers_amount: int,
+                 eggs_amount: int, honey_amount: float, seed: Union[int, None] = None):
+        self.honey_amount = honey_amount
+        self.__ledger = HoneyLedger()
+        self.__tick_listeners: List[Callable[[int], None]] = []
+        self.__rng = np.random.default_rng(seed)
+
+        self.__bees = Columns({
+            "type": np.int8,
+            "state": np.int8,
+            "timer": np.int64,
+            "weight": np.float64,
+            "age": np.int64,
+            "lifespan": np.float64,
+            "starvation": np.float64,
+            "multiplier": np.float64,
+            "rest_time": np.int64,
+            # drone: fertility, worker: honey harvest time, larva: growth time
+            "trait": np.int64,
+        })
+        self.__eggs = Columns({
+            "fertilized": np.bool_,
+            "timer": np.int64,
+        })
+        self.__dead_bees_in_hive = Columns({
+            "was": np.int8,
+            "reason": np.int8,
+            "weight": np.float64,
+            "age": np.int64,
+        })
+
+        self.__dead_bees_in_grave_was_count = np.zeros(len(BEE_TYPES), dtype=np.int64)
+        self.__dead_bees_in_grave_reason_count = np.zeros(len(DEATH_REASONS), dtype=np.int64)
+
+        self.__queen_timer = self._queen_rest_time
+
+        self.add_bees(_bees_.DroneBee, drones_amount)
+        self.add_bees(_bees_.WorkerBee, workers_amount)
+        self.add_eggs(eggs_amount)
+
+    def save(self, path: Union[str, os.PathLike]):
+        """
+        Writes the whole state of the hive to `path`, in the format of `Hive.save`:
+        every column, honey, the queen's timer, the buried bees and the random stream
+        """
+
+        meta = {
+            "engine": type(self).__name__,
+            "honey": self.honey_amount,
+            "queen_timer": self.__queen_timer,
+            "rng": self.__rng.bit_generator.state,
+            "ledger": list(self.__ledger.getstate()),
+        }
+        arrays = {
+            "bees": self.__bees.records(),
+            "eggs": self.__eggs.records(),
+            "dead_bees": self.__dead_bees_in_hive.records(),
+            "grave_was_count": self.__dead_bees_in_grave_was_count,
+            "grave_reason_count": self.__dead_bees_in_grave_reason_count,
+        }
+
+        write_snapshot(path, Snapshot(meta, arrays))
+
+    @classmethod
+    def load(cls, path: Union[str, os.PathLike]) -> VectorizedHive:
+        """
+        Recreates a hive written by `save`, which carries on as the saved one would have
+        """
+
+        meta, arrays = read_snapshot(path)
+
+        if meta["engine"] != cls.__name__:
+            raise ValueError(f"Required: a snapshot of a {cls.__name__}; Got: {meta['engine'] = }")
+
+        hive = cls(0, 0, 0, meta["honey"])
+
+        for columns, name in ((hive.__bees, "bees"), (hive.__eggs, "eggs"), (hive.__dead_bees_in_hive, "dead_bees")):
+            records = arrays[name]
+            columns.append(len(records), **{field: records[field] for field in records.dtype.names})
+
+        hive.__dead_bees_in_grave_was_count = arrays["grave_was_count"]
+        hive.__dead_bees_in_grave_reason_count = arrays["grave_reason_count"]
+        hive.__queen_timer = meta["queen_timer"]
+        hive.__rng.bit_generator.state = meta["rng"]
+        hive.__ledger.setstate(tuple(meta["ledger"]))
+
+        return hive
+
+    @property
+    def honey_amount(self):
+        return self.__honey_amount
+
+    @honey_amount.setter
+    def honey_amount(self, value):
+        self.__honey_amount = clamp(value, 0.0, Hive._honey_amount_cap)
+
+    @property
+    def ledger(self) -> HoneyLedger:
+        return self.__ledger
+
+    @property
+    def bees(self) -> Columns:
+        return self.__bees
+
+    @property
+    def eggs(self) -> Columns:
+        return self.__eggs
+
+    @property
+    def dead_bees_in_hive(self) -> Columns:
+        return self.__dead_bees_in_hive
+
+    def __deviate(self, value: float, factor: float, size: int) -> np.ndarray:
+        base = value * factor
+        return value + self.__rng.uniform(-base, base, size)
+
+    def __rounded_deviate(self, value: float, factor: float, size: int) -> np.ndarray:
+        return np.rint(self.__deviate(value, factor, size)).astype(np.int64)
+
+    def add_bees(self, bee_type: type, amount: int,
+                 extra_weight: Union[np.ndarray, float] = 0.0, age: Union[np.ndarray, int] = 0):
+        """
+        Appends `amount` freshly born bees; traits are drawn the same way the bee constructors do
+        """
+
+        if amount <= 0:
+            return
+
+        if bee_type is _bees_.DroneBee:
+            rest_time = self.__rounded_deviate(400, 0.5, amount)
+            self.__bees.append(amount, type=DRONE, state=RESTING, timer=rest_time,
+                               weight=8 + extra_weight, age=age,
+                               lifespan=self.__rounded_deviate(1700, 0.2, amount),
+                               multiplier=np.clip(self.__deviate(0.15, 0.33, amount), 0.0, 1.0),
+                               rest_time=rest_time,
+                               trait=self.__rounded_deviate(1, 0.55, amount))
+
+        elif bee_type is _bees_.WorkerBee:
+            rest_time = self.__rounded_deviate(400, 0.2, amount)
+            self.__bees.append(amount, type=WORKER, state=RESTING, timer=rest_time,
+                               weight=20 + extra_weight, age=age,
+                               lifespan=self.__rounded_deviate(4000, 0.15, amount),
+                               multiplier=np.clip(self.__deviate(0.1, 0.25, amount), 0.0, 1.0),
+                               rest_time=rest_time,
+                               trait=self.__rounded_deviate(300, 0.07, amount))
+
+        elif bee_type is _bees_.Larva:
+            growth_time = self.__rounded_deviate(800, 0.2, amount)
+            self.__bees.append(amount, type=LARVA, state=GROWING, timer=growth_time,
+                               weight=2 + extra_weight, age=age,
+                               lifespan=math.inf, multiplier=0.3,
+                               trait=growth_time)
+
+        else:
+            raise ValueError("Unknown bee type")
+
+    def add_eggs(self, amount: int):
+        amount = min(amount, Hive._eggs_cap - len(self.__eggs))
+        self.__eggs.append(amount, fertilized=False, timer=self._hatching_time)
+
+    @property
+    def queen_fertility(self):
+        queen = _bees_.QueenBee
+        return max(1,
+                   queen.fertility_base - len(self.__dead_bees_in_hive)
+                   + round(linear_remap(self.honey_amount, 0, Hive._honey_amount_cap, 0, queen.fertility_max)))
+
+    def update(self):
+        self.__update_queen()
+        self.__update_bees()
+        self.__update_eggs()
+        self.__ledger.close_tick()
+
+        for listener in self.__tick_listeners:
+            listener(1)
+
+    def add_tick_listener(self, listener: Callable[[int], None]):
+        """
+        `listener` is called with the amount of ticks booked (always 1) after every `update`
+        """
+
+        self.__tick_listeners.append(listener)
+
+    def remove_tick_listener(self, listener: Callable[[int], None]):
+        self.__tick_listeners.remove(listener)
+
+    def advance(self, ticks: int):
+        """
+        Same as calling `update` `ticks` times
+        """
+
+        if ticks < 0:
+            raise ValueError(f"Required: ticks >= 0; Got: {ticks = }")
+
+        for _ in range(ticks):
+            self.update()
+
+    def __update_queen(self):
+        self.__queen_timer -= 1
+        if self.__queen_timer > 0:
+            return
+
+        self.add_eggs(self.queen_fertility)
+        self.__queen_timer = self._queen_rest_time
+
+    def __update_bees(self):
+        bees = self.__bees
+        if len(bees) == 0:
+            return
+
+        starvation_cap = _bees_.LiveBee._starvation_cap
+
+        natural = bees["lifespan"] == 0
+        starved = ~natural & (bees["starvation"] >= starvation_cap)
+        dead = natural | starved
+
+        if dead.any():
+            self.__bury(dead, np.where(natural[dead], DEATH_REASONS.index(DeathReason.NATURAL),
+                                       DEATH_REASONS.index(DeathReason.STARVATION)))
+            bees.keep(~dead)
+
+        if len(bees) == 0:
+            return
+
+        kinds, states, timer = bees["type"], bees["state"], bees["timer"]
+
+        resting = states == RESTING
+        harvesting = states == HARVESTING
+        cleaning = states == CLEANING
+        growing = states == GROWING
+
+        if harvesting.any():
+            honey_before = self.honey_amount
+            self.honey_amount += float(np.sum(self.__worker_income(bees["weight"][harvesting])))
+            self.__ledger.record_income(self.honey_amount - honey_before, _bees_.WorkerBee)
+
+        if cleaning.any():
+            self.__clean_hive(bees["weight"][cleaning])
+
+        timer -= 1
+        expired = timer <= 0
+
+        rested = expired & resting
+        drones_rested = rested & (kinds == DRONE)
+        if drones_rested.any():
+            self.__fertilize_eggs(int(np.sum(bees["trait"][drones_rested])))
+            timer[drones_rested] = bees["rest_time"][drones_rested]
+
+        workers_rested = rested & (kinds == WORKER)
+        states[workers_rested] = HARVESTING
+        timer[workers_rested] = bees["trait"][workers_rested]
+
+        harvested = expired & harvesting
+        states[harvested] = CLEANING
+        timer[harvested] = _bees_.WorkerBee.clean_attempts
+
+        cleaned = expired & cleaning
+        states[cleaned] = RESTING
+        timer[cleaned] = bees["rest_time"][cleaned]
+
+        bees["lifespan"][:] -= 1
+        bees["age"][:] += 1
+        self.__consume_honey()
+
+        grown = expired & growing
+        if grown.any():
+            self.__transform_larvae(grown)
+
+    @staticmethod
+    def __worker_income(weight: np.ndarray) -> np.ndarray:
+        return _bees_.WorkerBee.honey_income_base + weight * _bees_.WorkerBee.honey_income_multiplier
+
+    def __consume_honey(self):
+        bees = self.__bees
+        weight = bees["weight"]
+
+        desired = weight * bees["multiplier"]
+        capped = np.minimum(desired, Hive._honey_take_cap)
+        taken_before = np.cumsum(capped) - capped
+        got = np.clip(self.honey_amount - taken_before, 0.0, capped)
+
+        self.honey_amount -= float(np.sum(got))
+        weight += got / 100
+
+        taken_by_type = np.bincount(bees["type"], weights=got, minlength=len(BEE_TYPES))
+        for code in np.flatnonzero(taken_by_type):
+            self.__ledger.record_consumption(float(taken_by_type[code]), BEE_TYPES[code])
+
+        fed = got >= desired
+        starvation = bees["starvation"]
+        starvation += np.where(fed, -_bees_.LiveBee._starvation_dec_rate, _bees_.LiveBee._starvation_inc_rate)
+        np.clip(starvation, 0.0, _bees_.LiveBee._starvation_cap, out=starvation)
+
+    def __fertilize_eggs(self, amount: int):
+        unfertilized = np.flatnonzero(~self.__eggs["fertilized"])
+        amount = min(amount, len(unfertilized))
+        if amount <= 0:
+            return
+
+        chosen = self.__rng.choice(unfertilized, size=amount, replace=False)
+        self.__eggs["fertilized"][chosen] = True
+        self.__eggs["timer"][chosen] = self._hatching_time
+
+    def __clean_hive(self, cleaners_weight: np.ndarray):
+        dead = self.__dead_bees_in_hive
+        if len(dead) == 0:
+            return
+
+        picked = self.__rng.integers(0, len(dead), size=len(cleaners_weight))
+        cleaned = np.unique(picked[cleaners_weight >= dead["weight"][picked]])
+        if len(cleaned) == 0:
+            return
+
+        self.__dead_bees_in_grave_was_count += np.bincount(dead["was"][cleaned], minlength=len(BEE_TYPES))
+        self.__dead_bees_in_grave_reason_count += np.bincount(dead["reason"][cleaned], minlength=len(DEATH_REASONS))
+
+        keep = np.ones(len(dead), dtype=np.bool_)
+        keep[cleaned] = False
+        dead.keep(keep)
+
+    def __bury(self, dead: np.ndarray, reasons: np.ndarray):
+        bees = self.__bees
+        self.__dead_bees_in_hive.append(int(np.count_nonzero(dead)),
+                                        was=bees["type"][dead], reason=reasons,
+                                        weight=bees["weight"][dead] / 2, age=bees["age"][dead])
+
+    def __transform_larvae(self, grown: np.ndarray):
+        bees = self.__bees
+        weight = bees["weight"][grown] / 10
+        age = bees["age"][grown]
+        bees.keep(~grown)
+
+        become_drone = self.__rng.random(len(weight)) < 0.5
+        self.add_bees(_bees_.DroneBee, int(np.count_nonzero(become_drone)),
+                      extra_weight=weight[become_drone], age=age[become_drone])
+        self.add_bees(_bees_.WorkerBee, int(np.count_nonzero(~become_drone)),
+                      extra_weight=weight[~become_drone], age=age[~become_drone])
+
+    def __update_eggs(self):
+        eggs = self.__eggs
+        if len(eggs) == 0:
+            return
+
+        growing = eggs["fertilized"]
+        timer = eggs["timer"]
+        timer[growing] -= 1
+
+        hatched = growing & (timer <= 0)
+        amount = int(np.count_nonzero(hatched))
+        if amount == 0:
+            return
+
+        eggs.keep(~hatched)
+        self.add_bees(_bees_.Larva, amount)
+
+    @staticmethod
+    def __counter(keys: tuple, counts: np.ndarray) -> Counter:
+        return Counter({keys[code]: int(n) for code, n in enumerate(counts) if n})
+
+    @property
+    def live_bees_type_count(self):
+        return self.__counter(BEE_TYPES, np.bincount(self.__bees["type"], minlength=len(BEE_TYPES)))
+
+    @property
+    def all_dead_bees_was_count(self):
+        return self.__counter(BEE_TYPES, self.__dead_bees_in_grave_was_count
+                              + np.bincount(self.__dead_bees_in_hive["was"], minlength=len(BEE_TYPES)))
+
+    @property
+    def all_dead_bees_reason_count(self):
+        return self.__counter(DEATH_REASONS, self.__dead_bees_in_grave_reason_count
+                              + np.bincount(self.__dead_bees_in_hive["reason"], minlength=len(DEATH_REASONS)))
+
+    @property
+    def dead_bees_in_hive_was_count(self):
+        return self.__counter(BEE_TYPES, np.bincount(self.__dead_bees_in_hive["was"], minlength=len(BEE_TYPES)))
+
+    @property
+    def eggs_status_count(self):
+        fertilized = int(np.count_nonzero(self.__eggs["fertilized"]))
+        return self.__counter((False, True), np.array((len(self.__eggs) - fertilized, fertilized)))
+
+    @property
+    def honey_consumption(self):
+        return self.__ledger.consumption
+
+    @property
+    def honey_income(self):
+        return self.__ledger.income
+
+    @property
+    def drone_efficiency_factor(self):
+        if len(self.__eggs) == 0:
+            return 1
+
+        return int(np.count_nonzero(self.__eggs["fertilized"])) / len(self.__eggs)
@@ -0,0 +1,119 @@
+import argparse
+from collections import Counter
+from typing import Sequence, Union
+
+from lib.state_lib import config as state_lib_config
+from src.sim.config import ENGINES, HiveConfig
+from src.sim.headless import HeadlessRun
+from src.sim.metrics import METRICS, MetricSampler
+from src.sim.profiler import TickProfiler
+from src.sim.recorder import Recorder
+
+
+def _format_count(counter: Counter) -> str:
+    if not counter:
+        return "-"
+
+    return ", ".join(f"{getattr(key, '__name__', getattr(key, 'name', key))}: {value}"
+                     for key, value in counter.most_common())
+
+
+def parse_args(argv: Union[Sequence[str], None] = None) -> argparse.Namespace:
+    defaults = HiveConfig()
+
+    parser = argparse.ArgumentParser(prog="python -m src.run",
+                                     description="Run the hive simulation headless, as fast as the CPU allows")
+    parser.add_argument("--ticks", type=int, default=100_000, help="number of ticks to simulate")
+    parser.add_argument("--drones", type=int, default=defaults.drones, help="initial amount of drone bees")
+    parser.add_argument("--workers", type=int, default=defaults.workers, help="initial amount of worker bees")
+    parser.add_argument("--eggs", type=int, default=defaults.eggs, help="initial amount of eggs")
+    parser.add_argument("--honey", type=float, default=defaults.honey, help="initial amount of honey")
+    parser.add_argument("--engine", choices=ENGINES, default=defaults.engine,
+                        help="population engine: python objects, NumPy columns or discrete events")
+    parser.add_argument("--seed", type=int, default=defaults.seed,
+                        help="random seed")
+    parser.add_argument("--trusted", action="store_true",
+                        help="skip the state machine runtime type validation (implied by python -O)")
+    parser.add_argument("--progress", type=int, default=0, metavar="N",
+                        help="print a progress line every N ticks (0 disables it)")
+    parser.add_argument("--record", metavar="DIR",
+                        help="stream the hive metrics to a columnar store in DIR (see src.sim.recorder)")
+    parser.add_argument("--record-every", type=int, default=1, metavar="N",
+                        help="record the metrics every N ticks")
+    parser.add_argument("--profile", action="store_true",
+                        help="time every phase of the ticks and print where the time went (object and event engines)")
+
+    args = parser.parse_args(argv)
+
+    if args.ticks < 0:
+        parser.error(f"Required: --ticks >= 0; Got: {args.ticks}")
+
+    if args.progress < 0:
+        parser.error(f"Required: --progress >= 0; Got: {args.progress}")
+
+    if args.record_every < 1:
+        parser.error(f"Required: --record-every >= 1; Got: {args.record_every}")
+
+    if args.profile and args.engine == "vectorized":
+        parser.error("Required: --profile with the object or event engine")
+
+    return args
+
+
+def main(argv: Union[Sequence[str], None] = None):
+    args = parse_args(argv)
+
+    if args.trusted:
+        state_lib_config.set_trusted(True)
+
+    config = HiveConfig(args.drones, args.workers, args.eggs, args.honey, args.engine, args.seed)
+
+    run = HeadlessRun(config.build())
+    # the flows printed at the end are averaged over the whole run
+    sampler = MetricSampler(run.hive)
+    recorder = Recorder(run.hive, args.record, args.record_every) if args.record else None
+    profiler = TickProfiler(run.hive) if args.profile else None
+
+    if profiler is not None:
+        profiler.start()
+
+    while run.ticks < args.ticks:
+        # steps end on progress lines and records: an engine booking several ticks per step is only sampled after it
+        target = args.ticks
+        for every in (args.progress, args.record_every if recorder else 0):
+            if every:
+                target = min(target, (run.ticks // every + 1) * every)
+
+        run.step(target - run.ticks)
+
+        if args.progress and (run.ticks % args.progress == 0 or run.ticks == args.ticks):
+            print(f"[{run.ticks}/{args.ticks}] {run.ticks_per_second:.0f} ticks/s, "
+                  f"honey: {run.hive.honey_amount:.2f}")
+
+    if recorder is not None:
+        recorder.close()
+
+    if profiler is not None:
+        profiler.stop()
+
+    hive = run.hive
+    metric = dict(zip(METRICS, sampler.sample().tolist()))
+
+    print(f"Ticks:             {run.ticks}")
+    print(f"Elapsed:           {run.elapsed:.3f}s")
+    print(f"Ticks/s:           {run.ticks_per_second:.0f}")
+    print(f"Live bees:         {_format_count(hive.live_bees_type_count)}")
+    print(f"Eggs:              unfertilized: {hive.eggs_status_count.get(False, 0)}, "
+          f"fertilized: {hive.eggs_status_count.get(True, 0)}")
+    print(f"Dead bees:         {_format_count(hive.all_dead_bees_reason_count)}")
+    print(f"Honey:             {hive.honey_amount:.2f}")
+    print(f"Honey income:      {metric['honey_income']:.2f} per tick")
+    print(f"Honey consumption: {metric['honey_consumption']:.2f} per tick")
+
+    if profiler is not None:
+        print()
+        print(profiler.summary())
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,31 @@
+from dataclasses import dataclass
+from typing import Union
+
+from src.hive.event_driven import EventDrivenHive
+from src.hive.hive import Hive
+from src.hive.vectorized import VectorizedHive
+
+ENGINES = ("object", "vectorized", "event")
+
+
+@dataclass(frozen=True)
+class HiveConfig:
+    drones: int = 3
+    workers: int = 10
+    eggs: int = 10
+    honey: float = 50000.0
+    engine: str = "object"
+    seed: Union[int, None] = None
+
+    def __post_init__(self):
+        if self.engine not in ENGINES:
+            raise ValueError(f"Required: engine in {ENGINES}; Got: {self.engine = }")
+
+    def build(self) -> Union[Hive, VectorizedHive]:
+        if self.engine == "vectorized":
+            return VectorizedHive(self.drones, self.workers, self.eggs, self.honey, seed=self.seed)
+
+        if self.engine == "event":
+            return EventDrivenHive(self.drones, self.workers, self.eggs, self.honey, seed=self.seed)
+
+        return Hive(self.drones, self.workers, self.eggs, self.honey, seed=self.seed)
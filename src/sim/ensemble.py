@@ -0,0 +1,101 @@
+import itertools
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, replace
+from typing import Iterable, Union
+
+import numpy as np
+
+from src.sim.config import HiveConfig
+from src.sim.headless import HeadlessRun
+from src.sim.metrics import METRICS, MetricSampler
+
+
+def simulate(config: HiveConfig, seed: int, ticks: int, every: int) -> np.ndarray:
+    """
+    Runs one hive of the ensemble
+
+    Returns:
+        - its `METRICS` sampled at tick 0 and every `every` ticks up to `ticks`, shape (samples, metrics)
+    """
+
+    run = HeadlessRun(replace(config, seed=seed).build())
+
+    sampler = MetricSampler(run.hive)
+
+    samples = [sampler.sample()]
+    while run.ticks < ticks:
+        run.step(min(every, ticks - run.ticks))
+        samples.append(sampler.sample())
+
+    return np.stack(samples)
+
+
+@dataclass(frozen=True)
+class EnsembleResult:
+    ticks: np.ndarray
+    seeds: np.ndarray
+    # shape (runs, samples, metrics)
+    runs: np.ndarray
+
+    def metric(self, name: str) -> np.ndarray:
+        """
+        Returns:
+            - `name` of every run, shape (runs, samples)
+        """
+
+        if name not in METRICS:
+            raise ValueError(f"Required: name in METRICS; Got: {name = }")
+
+        return self.runs[:, :, METRICS.index(name)]
+
+    def mean(self, name: str) -> np.ndarray:
+        return self.metric(name).mean(axis=0)
+
+    def quantile(self, name: str, q: Union[float, Iterable[float]]) -> np.ndarray:
+        """
+        Returns:
+            - `q` quantile(s) of `name` across the runs, shape (samples,) or (len(q), samples)
+        """
+
+        return np.quantile(self.metric(name), q if np.isscalar(q) else tuple(q), axis=0)
+
+    def survival(self) -> np.ndarray:
+        """
+        Returns:
+            - share of the runs that still have live bees, per sample
+        """
+
+        return (self.metric("live_bees") > 0).mean(axis=0)
+
+
+def run_ensemble(config: HiveConfig, seeds: Iterable[int], ticks: int,
+                 workers: Union[int, None] = None, every: int = 100) -> EnsembleResult:
+    """
+    Runs one hive per seed, spread across `workers` processes (as many as CPUs when None, inline when 1);
+    every process only sends back the sampled metrics
+    """
+
+    seeds = np.fromiter(seeds, dtype=np.int64)
+
+    if ticks < 0:
+        raise ValueError(f"Required: ticks >= 0; Got: {ticks = }")
+
+    if every < 1:
+        raise ValueError(f"Required: every >= 1; Got: {every = }")
+
+    if workers is not None and workers < 1:
+        raise ValueError(f"Required: workers >= 1; Got: {workers = }")
+
+    if len(seeds) == 0:
+        raise ValueError("Required: at least one seed")
+
+    arguments = (itertools.repeat(config), seeds.tolist(), itertools.repeat(ticks), itertools.repeat(every))
+
+    if workers == 1:
+        runs = list(map(simulate, *arguments))
+    else:
+        with ProcessPoolExecutor(workers) as executor:
+            runs = list(executor.map(simulate, *arguments))
+
+    sampled = np.minimum(np.arange(0, ticks + every, every), ticks)
+    return EnsembleResult(np.unique(sampled), seeds, np.stack(runs))
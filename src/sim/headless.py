@@ -0,0 +1,42 @@
+import time
+from typing import Union
+
+from src.hive.hive import Hive
+from src.hive.vectorized import VectorizedHive
+
+
+class HeadlessRun:
+    """
+    Steps a hive as fast as possible, outside of any render loop
+    """
+
+    def __init__(self, hive: Union[Hive, VectorizedHive]):
+        self.__hive = hive
+        self.__ticks = 0
+        self.__elapsed = 0.0
+
+    @property
+    def hive(self) -> Union[Hive, VectorizedHive]:
+        return self.__hive
+
+    @property
+    def ticks(self) -> int:
+        return self.__ticks
+
+    @property
+    def elapsed(self) -> float:
+        return self.__elapsed
+
+    @property
+    def ticks_per_second(self) -> float:
+        return self.__ticks / self.__elapsed if self.__elapsed > 0 else 0.0
+
+    def step(self, ticks: int = 1):
+        if ticks < 0:
+            raise ValueError(f"Required: ticks >= 0; Got: {ticks = }")
+
+        started = time.perf_counter()
+        self.__hive.advance(ticks)
+        self.__elapsed += time.perf_counter() - started
+
+        self.__ticks += ticks
@@ -0,0 +1,96 @@
+from typing import Tuple, Union
+
+import numpy as np
+
+from src.bee import DeathReason
+from src.bee.member import DroneBee, Larva, WorkerBee
+from src.hive.hive import Hive
+from src.hive.vectorized import VectorizedHive
+
+# the figures of the stats panel, in the order of a sample
+METRICS = (
+    "honey",
+    # honey in and out per tick, on average over the ticks since the previous sample (see `MetricSampler`)
+    "honey_income",
+    "honey_consumption",
+    "live_bees",
+    "workers",
+    "drones",
+    "larvae",
+    "eggs_unfertilized",
+    "eggs_fertilized",
+    "dead_bees_in_hive",
+    "dead_workers",
+    "dead_drones",
+    "dead_larvae",
+    "dead_natural",
+    "dead_starvation",
+    "drone_efficiency",
+    "queen_fertility",
+)
+
+
+class MetricSampler:
+    """
+    Takes successive samples of the `METRICS` of a hive
+
+    Honey flows are averaged over the ticks closed since the previous sample (since the sampler was made,
+    for the first one; 0 over no tick), so they mean the same whether the engine books its ticks one by one
+    or several at once
+    """
+
+    def __init__(self, hive: Union[Hive, VectorizedHive]):
+        self.__hive = hive
+        self.__mark = self.__ledger_mark()
+
+    @property
+    def hive(self) -> Union[Hive, VectorizedHive]:
+        return self.__hive
+
+    def __ledger_mark(self) -> Tuple[int, float, float]:
+        ledger = self.__hive.ledger
+        return ledger.total_ticks, ledger.total_income, ledger.total_consumption
+
+    def sample(self) -> np.ndarray:
+        """
+        Returns:
+            - the current `METRICS` of the hive, as floats
+        """
+
+        (ticks, income, consumption), self.__mark = self.__mark, self.__ledger_mark()
+
+        elapsed = self.__mark[0] - ticks
+        if elapsed > 0:
+            income = (self.__mark[1] - income) / elapsed
+            consumption = (self.__mark[2] - consumption) / elapsed
+        else:
+            income = consumption = 0.0
+
+        return _sample(self.__hive, income, consumption)
+
+
+def _sample(hive: Union[Hive, VectorizedHive], honey_income: float, honey_consumption: float) -> np.ndarray:
+    live = hive.live_bees_type_count
+    eggs = hive.eggs_status_count
+    dead_was = hive.all_dead_bees_was_count
+    dead_reason = hive.all_dead_bees_reason_count
+
+    return np.array((
+        hive.honey_amount,
+        honey_income,
+        honey_consumption,
+        live.total(),
+        live[WorkerBee],
+        live[DroneBee],
+        live[Larva],
+        eggs[False],
+        eggs[True],
+        hive.dead_bees_in_hive_was_count.total(),
+        dead_was[WorkerBee],
+        dead_was[DroneBee],
+        dead_was[Larva],
+        dead_reason[DeathReason.NATURAL],
+        dead_reason[DeathReason.STARVATION],
+        hive.drone_efficiency_factor,
+        hive.queen_fertility,
+    ), dtype=np.float64)
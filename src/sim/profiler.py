@@ -0,0 +1,208 @@
+from __future__ import annotations
+from collections import Counter
+from typing import Dict, TYPE_CHECKING
+
+from lib.state_lib import fsm
+
+if TYPE_CHECKING:
+    from lib.state_lib.state import State
+    from src.hive.hive import Hive
+
+# phases of a tick, in the order they run; "members" and "timers" include the transitions they trigger
+# and, with the event engine, the bees brought up to date on the way. The event engine also brings every bee
+# up to date ("sync") and plans the next jump ("plan") ahead of some ticks, skips the clock over the ticks
+# where nothing happens ("skip") and brings every bee up to date again before closing the ledger
+PHASES = ("sync", "plan", "skip", "members", "timers", "pending", "ledger")
+
+
+def _state_name(state_type: type) -> str:
+    # bees and eggs both have a `Growing` state
+    return f"{state_type.__module__.split('.')[1]}.{state_type.__name__}"
+
+
+class TickProfiler:
+    """
+    Where the ticks of a `Hive` spend their time
+
+    Records the wall time of every phase of a tick (`PHASES`), of the updates of every member type,
+    of the closed-form syncs of every member type (event engine) and of the transitions into every state,
+    plus counts of what happens during the ticks (transitions, eggs laid, hatchings, deaths, honey takes and puts, ...).
+    Only collects while started; timing every member update roughly halves the tick rate meanwhile
+    """
+
+    def __init__(self, hive: Hive):
+        self.__hive = hive
+        self.__ticks = 0
+
+        self.__phase_seconds = Counter()
+        self.__member_seconds = Counter()
+        self.__member_updates = Counter()
+        self.__sync_seconds = Counter()
+        self.__syncs = Counter()
+        self.__synced_ticks = Counter()
+        self.__transition_seconds = Counter()
+        self.__transitions = Counter()
+        self.__counts = Counter()
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.stop()
+
+    def start(self):
+        self.__hive.set_probe(self)
+        fsm.set_transition_hook(self.__transitioned)
+
+    def stop(self):
+        if self.__hive.probe is self:
+            self.__hive.set_probe(None)
+            fsm.set_transition_hook(None)
+
+    # called by the hive
+
+    def phase(self, name: str, seconds: float):
+        self.__phase_seconds[name] += seconds
+
+    def member(self, member_type: type, seconds: float):
+        self.__member_seconds[member_type] += seconds
+        self.__member_updates[member_type] += 1
+
+    def synced(self, member_type: type, ticks: int, seconds: float):
+        self.__sync_seconds[member_type] += seconds
+        self.__syncs[member_type] += 1
+        self.__synced_ticks[member_type] += ticks
+
+    def count(self, name: str, amount: int = 1):
+        self.__counts[name] += amount
+
+    def ticks_booked(self, ticks: int):
+        self.__ticks += ticks
+
+    def __transitioned(self, machine: fsm.FiniteStateMachine, old_state: State, new_state: State, seconds: float):
+        if getattr(machine.context, "hive", None) is not self.__hive:
+            return
+
+        self.__transitions[type(new_state)] += 1
+        self.__transition_seconds[type(new_state)] += seconds
+        self.__counts["transitions"] += 1
+
+    # results
+
+    @property
+    def ticks(self) -> int:
+        return self.__ticks
+
+    @property
+    def phase_seconds(self) -> Dict[str, float]:
+        return dict(self.__phase_seconds)
+
+    @property
+    def member_seconds(self) -> Dict[type, float]:
+        """
+        Returns:
+            - seconds spent updating the members one tick at a time, by member type
+        """
+
+        return dict(self.__member_seconds)
+
+    @property
+    def member_updates(self) -> Counter:
+        return +self.__member_updates
+
+    @property
+    def sync_seconds(self) -> Dict[type, float]:
+        """
+        Returns:
+            - seconds spent bringing members up to date in closed form, by member type (event engine)
+        """
+
+        return dict(self.__sync_seconds)
+
+    @property
+    def syncs(self) -> Counter:
+        return +self.__syncs
+
+    @property
+    def synced_ticks(self) -> Counter:
+        """
+        Returns:
+            - updates applied in closed form, by member type (event engine)
+        """
+
+        return +self.__synced_ticks
+
+    @property
+    def transitions(self) -> Counter:
+        """
+        Returns:
+            - transitions by type of the state entered
+        """
+
+        return +self.__transitions
+
+    @property
+    def transition_seconds(self) -> Dict[type, float]:
+        """
+        Returns:
+            - seconds spent in transitions, by type of the state entered, nested transitions included
+        """
+
+        return dict(self.__transition_seconds)
+
+    @property
+    def counts(self) -> Counter:
+        return +self.__counts
+
+    def per_tick(self, name: str) -> float:
+        """
+        Returns:
+            - average amount of `name` (one of `counts`) per tick
+        """
+
+        return self.__counts[name] / self.__ticks if self.__ticks else 0.0
+
+    def reset(self):
+        self.__ticks = 0
+
+        for counter in (self.__phase_seconds, self.__member_seconds, self.__member_updates,
+                        self.__sync_seconds, self.__syncs, self.__synced_ticks,
+                        self.__transition_seconds, self.__transitions, self.__counts):
+            counter.clear()
+
+    def summary(self) -> str:
+        ticks = max(1, self.__ticks)
+        total = sum(self.__phase_seconds.values()) or 1.0
+
+        lines = [f"Ticks profiled:      {self.__ticks}",
+                 f"{'phase':<20}{'total s':>10}{'us/tick':>10}{'share':>8}"]
+
+        for name in PHASES:
+            if name not in self.__phase_seconds:
+                continue
+
+            seconds = self.__phase_seconds[name]
+            lines.append(f"{name:<20}{seconds:>10.3f}{seconds / ticks * 1e6:>10.1f}{seconds / total:>8.1%}")
+
+        lines.append(f"{'member type':<20}{'total s':>10}{'updates':>10}{'us each':>8}")
+        for member_type, seconds in sorted(self.__member_seconds.items(), key=lambda item: -item[1]):
+            updates = self.__member_updates[member_type]
+            lines.append(f"{member_type.__name__:<20}{seconds:>10.3f}{updates:>10}{seconds / updates * 1e6:>8.2f}")
+
+        if self.__syncs:
+            lines.append(f"{'member type synced':<20}{'total s':>10}{'syncs':>10}{'us each':>8}{'ticks each':>12}")
+            for member_type, seconds in sorted(self.__sync_seconds.items(), key=lambda item: -item[1]):
+                syncs = self.__syncs[member_type]
+                lines.append(f"{member_type.__name__:<20}{seconds:>10.3f}{syncs:>10}{seconds / syncs * 1e6:>8.2f}"
+                             f"{self.__synced_ticks[member_type] / syncs:>12.1f}")
+
+        lines.append(f"{'state entered':<20}{'total s':>10}{'count':>10}{'us each':>8}")
+        for state_type, amount in self.__transitions.most_common():
+            seconds = self.__transition_seconds[state_type]
+            lines.append(f"{_state_name(state_type):<20}{seconds:>10.3f}{amount:>10}{seconds / amount * 1e6:>8.2f}")
+
+        counts = ", ".join(f"{name}: {amount / ticks:.3f}" for name, amount in sorted(self.__counts.items()))
+        lines.append(f"per tick:            {counts or '-'}")
+
+        return "\n".join(lines)
@@ -0,0 +1,174 @@
+import json
+import os
+from typing import BinaryIO, Dict, List, Union
+
+import numpy as np
+
+from src.hive.hive import Hive
+from src.hive.vectorized import VectorizedHive
+from src.sim.metrics import METRICS, MetricSampler
+
+_META = "meta.json"
+# the tick every row was sampled on
+_TICK = "tick"
+
+
+def _column_path(path: Union[str, os.PathLike], name: str, dtype: np.dtype) -> str:
+    return os.path.join(path, f"{name}.{dtype.str.lstrip('<>=|')}")
+
+
+class Recorder:
+    """
+    Streams the `METRICS` of a hive to a columnar store: a directory holding one raw little endian file
+    per metric (and one for the ticks), plus a small JSON header
+
+    A row is recorded on attach and then every `every` ticks, as the hive books them;
+    an engine that books several ticks per `advance` is only sampled at the end of it.
+    Files grow by preallocated chunks of `chunk` rows and only the chunk being written is memory-mapped,
+    so memory stays the same however long the run.
+    Once closed (or after every chunk, while running) the columns load straight into NumPy, see `read`
+    """
+
+    _dtypes = {_TICK: np.dtype("<i8"), **{name: np.dtype("<f8") for name in METRICS}}
+
+    def __init__(self, hive: Union[Hive, VectorizedHive], path: Union[str, os.PathLike],
+                 every: int = 1, chunk: int = 4096):
+        if every < 1:
+            raise ValueError(f"Required: every >= 1; Got: {every = }")
+
+        if chunk < 1:
+            raise ValueError(f"Required: chunk >= 1; Got: {chunk = }")
+
+        os.makedirs(path, exist_ok=True)
+
+        self.__hive = hive
+        self.__sampler = MetricSampler(hive)
+        self.__path = path
+        self.__every = every
+        self.__chunk = chunk
+
+        self.__ticks = 0
+        self.__due = 0
+        self.__rows = 0
+        self.__mapped_from = 0
+
+        self.__files: List[BinaryIO] = [open(_column_path(path, name, dtype), "w+b")
+                                        for name, dtype in self._dtypes.items()]
+        self.__columns: List[np.memmap] = []
+
+        hive.add_tick_listener(self.__ticks_booked)
+        self.record()
+
+    @property
+    def rows(self) -> int:
+        return self.__rows
+
+    @property
+    def closed(self) -> bool:
+        return self.__files is None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def __ticks_booked(self, ticks: int):
+        self.__ticks += ticks
+
+        if self.__ticks >= self.__due:
+            self.record()
+
+    def record(self):
+        """
+        Appends the current metrics of the hive, at the current tick
+        """
+
+        if self.closed:
+            raise ValueError("Cannot record to a closed recorder")
+
+        if not self.__columns or self.__rows - self.__mapped_from == self.__chunk:
+            self.__map_next_chunk()
+
+        row = self.__rows - self.__mapped_from
+
+        columns = self.__columns
+        columns[0][row] = self.__ticks
+        for column, value in zip(columns[1:], self.__sampler.sample().tolist()):
+            column[row] = value
+
+        self.__rows += 1
+        self.__due = (self.__ticks // self.__every + 1) * self.__every
+
+    def __map_next_chunk(self):
+        self.__unmap()
+        self.__mapped_from = self.__rows
+
+        size = self.__rows + self.__chunk
+        for file, dtype in zip(self.__files, self._dtypes.values()):
+            file.truncate(size * dtype.itemsize)
+            self.__columns.append(np.memmap(file, dtype=dtype, mode="r+",
+                                            offset=self.__rows * dtype.itemsize, shape=(self.__chunk,)))
+
+        self.__write_meta()
+
+    def __unmap(self):
+        for column in self.__columns:
+            column.flush()
+
+        self.__columns = []
+
+    def __write_meta(self):
+        meta = {"columns": {name: dtype.str for name, dtype in self._dtypes.items()},
+                "rows": self.__rows, "every": self.__every}
+
+        with open(os.path.join(self.__path, _META), "w") as file:
+            json.dump(meta, file)
+
+    def flush(self):
+        """
+        Makes every recorded row readable
+        """
+
+        for column in self.__columns:
+            column.flush()
+
+        self.__write_meta()
+
+    def close(self):
+        if self.closed:
+            return
+
+        self.__hive.remove_tick_listener(self.__ticks_booked)
+        self.__unmap()
+
+        for file, dtype in zip(self.__files, self._dtypes.values()):
+            file.truncate(self.__rows * dtype.itemsize)
+            file.close()
+
+        self.__files = None
+        self.__write_meta()
+
+    @staticmethod
+    def read(path: Union[str, os.PathLike], mmap: bool = False) -> Dict[str, np.ndarray]:
+        """
+        Returns:
+            - every recorded column by name ("tick" and the `METRICS`), read whole or memory-mapped
+        """
+
+        with open(os.path.join(path, _META)) as file:
+            meta = json.load(file)
+
+        rows = meta["rows"]
+        columns = {}
+
+        for name, dtype in meta["columns"].items():
+            dtype = np.dtype(dtype)
+            column_path = _column_path(path, name, dtype)
+
+            if mmap and rows > 0:
+                columns[name] = np.memmap(column_path, dtype=dtype, mode="r", shape=(rows,))
+            else:
+                columns[name] = np.fromfile(column_path, dtype=dtype, count=rows)
+
+        return columns
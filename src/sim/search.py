@@ -0,0 +1,270 @@
+import contextlib
+import math
+from dataclasses import dataclass, fields, replace
+from typing import Dict, Iterable, Iterator, List, Sequence, Tuple, Union
+
+import numpy as np
+
+from src.bee.member import BEE_TYPES, LiveBee
+from src.hive.hive import Hive
+from src.sim.config import HiveConfig
+from src.sim.headless import HeadlessRun
+from src.sim.metrics import METRICS, MetricSampler
+
+Number = Union[int, float]
+# a parameter is either a `HiveConfig` field ("honey") or a class constant ("WorkerBee.honey_income_base")
+Params = Dict[str, Number]
+
+_CLASSES = {cls.__name__: cls for cls in (*BEE_TYPES, LiveBee, Hive)}
+_CONFIG_FIELDS = frozenset(field.name for field in fields(HiveConfig))
+
+# a worker lives round(deviate(4000, .15)) ticks at most
+_LONGEST_LIFE = 4600
+# a larva grows round(deviate(800, .2)) ticks at least
+_SHORTEST_GROWTH = 640
+
+
+def _split(params: Params) -> Tuple[Params, Params]:
+    config, constants = {}, {}
+
+    for name, value in params.items():
+        if name in _CONFIG_FIELDS:
+            config[name] = value
+            continue
+
+        owner, _, attribute = name.partition(".")
+        if owner not in _CLASSES or not hasattr(_CLASSES[owner], attribute):
+            raise ValueError(f"Required: a HiveConfig field or a known class constant; Got: {name = }")
+
+        constants[name] = value
+
+    return config, constants
+
+
+@contextlib.contextmanager
+def overridden(constants: Params) -> Iterator[None]:
+    """
+    Sets the class constants for the duration of the block
+    """
+
+    saved = []
+    try:
+        for name, value in constants.items():
+            owner, _, attribute = name.partition(".")
+            cls = _CLASSES[owner]
+
+            saved.append((cls, attribute, cls.__dict__.get(attribute, ...)))
+            setattr(cls, attribute, value)
+
+        yield
+
+    finally:
+        for cls, attribute, value in reversed(saved):
+            if value is ...:
+                delattr(cls, attribute)
+            else:
+                setattr(cls, attribute, value)
+
+
+def is_doomed(values: np.ndarray, ticks_left: int) -> bool:
+    """
+    `values` are `METRICS` of a hive
+
+    Returns:
+        - True when the colony is sure to have no live bee left once `ticks_left` more ticks have run
+    """
+
+    metric = dict(zip(METRICS, values))
+
+    # fertilized eggs still hatch into larvae, which count as live bees
+    if metric["live_bees"] == metric["eggs_fertilized"] == 0:
+        return True
+
+    # no bee can be born anymore, and none of the remaining ones outlives the horizon
+    if metric["drones"] == metric["larvae"] == metric["eggs_fertilized"] == 0 and ticks_left > _LONGEST_LIFE:
+        return True
+
+    # nobody brings honey in, and every bee starves before a larva could grow into a worker
+    starvation_ticks = LiveBee._starvation_cap / LiveBee._starvation_inc_rate
+    return (metric["honey"] <= 0 and metric["workers"] == metric["larvae"] == 0
+            and starvation_ticks < _SHORTEST_GROWTH)
+
+
+class Trial:
+    """
+    One seeded run of one set of params, which can be resumed, and stops on its own once doomed
+    """
+
+    def __init__(self, config: HiveConfig, params: Params, seed: int, horizon: int, check_every: int = 100):
+        if check_every < 1:
+            raise ValueError(f"Required: check_every >= 1; Got: {check_every = }")
+
+        config_params, self.__constants = _split(params)
+        self.__params = dict(params)
+        self.__horizon = horizon
+        self.__check_every = check_every
+        self.__doomed = False
+
+        with overridden(self.__constants):
+            self.__run = HeadlessRun(replace(config, seed=seed, **config_params).build())
+        self.__sampler = MetricSampler(self.__run.hive)
+
+    @property
+    def params(self) -> Params:
+        return dict(self.__params)
+
+    @property
+    def ticks(self) -> int:
+        return self.__run.ticks
+
+    @property
+    def hive(self):
+        return self.__run.hive
+
+    @property
+    def is_doomed(self) -> bool:
+        return self.__doomed
+
+    @property
+    def is_over(self) -> bool:
+        return self.__doomed or self.ticks >= self.__horizon
+
+    @property
+    def survived(self) -> bool:
+        """
+        Only final once the trial is over
+        """
+
+        return not self.__doomed and self.hive.live_bees_type_count.total() > 0
+
+    def run_until(self, ticks: int):
+        ticks = min(ticks, self.__horizon)
+
+        with overridden(self.__constants):
+            while not self.__doomed and self.ticks < ticks:
+                self.__run.step(min(self.__check_every, ticks - self.ticks))
+                self.__doomed = is_doomed(self.__sampler.sample(), self.__horizon - self.ticks)
+
+
+def survival_rate(config: HiveConfig, params: Params, seeds: Sequence[int], ticks: int,
+                  target: Union[float, None] = None, check_every: int = 100) -> float:
+    """
+    Returns:
+        - share of the seeds whose colony survives `ticks` ticks;
+          with a `target`, the seeds stop being run as soon as the share is known to be on one side of it,
+          and the share is then only an estimate from the seeds that ran
+    """
+
+    if len(seeds) == 0:
+        raise ValueError("Required: at least one seed")
+
+    survivors = 0
+    for run, seed in enumerate(seeds, 1):
+        trial = Trial(config, params, seed, ticks, check_every)
+        trial.run_until(ticks)
+        survivors += trial.survived
+
+        if target is not None and (survivors >= target * len(seeds)
+                                   or survivors + len(seeds) - run < target * len(seeds)):
+            return survivors / run
+
+    return survivors / len(seeds)
+
+
+def bisect(config: HiveConfig, name: str, low: Number, high: Number, seeds: Sequence[int], ticks: int,
+           target: float = 0.5, tolerance: Union[Number, None] = None, check_every: int = 100,
+           params: Union[Params, None] = None) -> Number:
+    """
+    Assumes survival grows with `name`; `params` are kept fixed meanwhile.
+    Integer parameters are searched over integers, floats down to `tolerance` (1% of the range by default)
+
+    Returns:
+        - smallest value of `name` in [low, high] at which at least `target` of the seeds survive;
+          `high` if none is found
+    """
+
+    if low > high:
+        raise ValueError(f"Required: low <= high; Got: {low = }, {high = }")
+
+    if not 0 < target <= 1:
+        raise ValueError(f"Required: 0 < target <= 1; Got: {target = }")
+
+    params = dict(params or {})
+    integer = isinstance(low, int) and isinstance(high, int)
+    tolerance = 1 if integer else (tolerance if tolerance is not None else (high - low) / 100)
+
+    def survives(value: Number) -> bool:
+        rate = survival_rate(config, {**params, name: value}, seeds, ticks, target, check_every)
+        return rate >= target
+
+    while high - low > tolerance:
+        middle = (low + high) // 2 if integer else (low + high) / 2
+
+        if survives(middle):
+            high = middle
+        else:
+            low = middle
+
+    return low if survives(low) else high
+
+
+@dataclass(frozen=True)
+class Ranked:
+    params: Params
+    # share of the seeds still alive at the last rung the params reached
+    alive: float
+    honey: float
+    ticks: int
+
+
+def successive_halving(config: HiveConfig, candidates: Iterable[Params], seeds: Sequence[int], ticks: int,
+                       eta: int = 2, check_every: int = 100) -> List[Ranked]:
+    """
+    Runs every candidate for a short budget, keeps the best `1 / eta` of them (by share of the seeds alive,
+    then by mean honey) and resumes those for `eta` times the budget, up to `ticks`.
+    Doomed runs stop early, leaving their budget to the others
+
+    Returns:
+        - candidates from the best to the worst; the ones dropped earlier rank lower
+    """
+
+    candidates = [dict(params) for params in candidates]
+
+    if not candidates:
+        raise ValueError("Required: at least one candidate")
+
+    if eta < 2:
+        raise ValueError(f"Required: eta >= 2; Got: {eta = }")
+
+    if len(seeds) == 0:
+        raise ValueError("Required: at least one seed")
+
+    rungs = max(1, math.ceil(math.log(len(candidates), eta)) + 1)
+    budget = max(1, ticks // eta ** (rungs - 1))
+
+    trials = [[Trial(config, params, seed, ticks, check_every) for seed in seeds] for params in candidates]
+    dropped: List[Ranked] = []
+
+    while True:
+        ranked = []
+        for runs in trials:
+            for trial in runs:
+                trial.run_until(budget)
+
+            alive = [trial for trial in runs if not trial.is_doomed]
+            ranked.append((Ranked(runs[0].params,
+                                  len(alive) / len(runs),
+                                  float(np.mean([trial.hive.honey_amount for trial in alive])) if alive else 0.0,
+                                  budget),
+                           runs))
+
+        ranked.sort(key=lambda entry: (entry[0].alive, entry[0].honey), reverse=True)
+
+        if budget >= ticks:
+            return [entry[0] for entry in ranked] + dropped
+
+        kept = max(1, len(ranked) // eta)
+        dropped = [entry[0] for entry in ranked[kept:]] + dropped
+        trials = [entry[1] for entry in ranked[:kept]]
+        # a lone candidate left goes straight to the horizon
+        budget = ticks if kept == 1 else min(ticks, budget * eta)
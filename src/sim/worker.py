@@ -0,0 +1,261 @@
+import multiprocessing
+import queue
+import time
+import traceback
+from collections import deque
+from dataclasses import dataclass
+from multiprocessing.shared_memory import SharedMemory
+from typing import Any, Dict, Tuple, Union
+
+import numpy as np
+
+from src.sim.config import HiveConfig
+from src.sim.metrics import METRICS, MetricSampler
+
+# the metrics sampled every `sample_every` ticks, for the app to chart and average over
+HISTORY = ("honey", "honey_income", "honey_consumption", "drone_efficiency")
+_HISTORY_INDEX = [METRICS.index(name) for name in HISTORY]
+
+# layout of a buffer slot, as float64s: a header, the `METRICS`, then a row of the latest samples per `HISTORY`
+_SEQUENCE, _GENERATION, _TICK, _SAMPLES, _ACTIVE, _SPEED = range(6)
+_HEADER = 6
+# `_SPEED` of a worker running as fast as it can
+_MAX_SPEED = -1.0
+
+
+@dataclass(frozen=True)
+class Snapshot:
+    # bumped by every reset
+    generation: int
+    tick: int
+    active: bool
+    # None: as fast as possible
+    speed: Union[int, None]
+    metrics: Dict[str, float]
+    # amount of samples taken since the last reset, the latest of which are in `history`, oldest first
+    samples: int
+    history: Dict[str, np.ndarray]
+
+
+def _slot_size(graph_length: int) -> int:
+    return _HEADER + len(METRICS) + len(HISTORY) * graph_length
+
+
+def _publish(slots: np.ndarray, published, header: Tuple[float, ...], metrics: np.ndarray, history: deque):
+    """
+    Writes into the slot the reader is not pointed at, then points it there;
+    the sequence number is odd while the slot is being written
+    """
+
+    slot = slots[1 - published.value]
+    slot[_SEQUENCE] += 1
+
+    slot[_GENERATION:_HEADER] = header
+    slot[_HEADER:_HEADER + len(METRICS)] = metrics
+    if history:
+        rows = slot[_HEADER + len(METRICS):].reshape(len(HISTORY), -1)
+        rows[:, -len(history):] = np.array(history).T
+
+    slot[_SEQUENCE] += 1
+    published.value = 1 - published.value
+
+
+def _work(config: HiveConfig, buffer_name: str, published, commands: multiprocessing.Queue,
+          errors: multiprocessing.Queue, graph_length: int, sample_every: int, ticks_per_second: float,
+          publish_rate: float):
+    buffer = SharedMemory(buffer_name)
+    try:
+        _serve(config, buffer, published, commands, graph_length, sample_every, ticks_per_second, publish_rate)
+    except Exception:
+        # the app only sees the exit code otherwise
+        errors.put(traceback.format_exc())
+        raise
+    finally:
+        buffer.close()
+
+
+def _serve(config: HiveConfig, buffer: SharedMemory, published, commands: multiprocessing.Queue,
+          graph_length: int, sample_every: int, ticks_per_second: float, publish_rate: float):
+    slots = np.ndarray((2, _slot_size(graph_length)), dtype=np.float64, buffer=buffer.buf)
+
+    hive = config.build()
+    # the history averages over the ticks between its samples, the published metrics over those between publishes
+    sampler, history_sampler = MetricSampler(hive), MetricSampler(hive)
+    generation, tick, active, speed = 0, 0, True, 1
+    history = deque(maxlen=graph_length)
+    samples = 0
+    ticks_due = 0.0
+    last = time.perf_counter()
+
+    def publish():
+        header = (generation, tick, samples, active, _MAX_SPEED if speed is None else speed)
+        _publish(slots, published, header, sampler.sample(), history)
+
+    while True:
+        try:
+            while True:
+                # a paused worker sleeps until told otherwise
+                command, argument = commands.get(block=not active)
+
+                if command == "stop":
+                    return
+                elif command == "pause":
+                    active = False
+                elif command == "resume":
+                    active = True
+                    last = time.perf_counter()
+                elif command == "speed":
+                    speed = argument
+                elif command == "reset":
+                    hive = config.build()
+                    sampler, history_sampler = MetricSampler(hive), MetricSampler(hive)
+                    generation += 1
+                    tick = samples = 0
+                    history.clear()
+
+                if not active:
+                    publish()
+        except queue.Empty:
+            pass
+
+        started = time.perf_counter()
+        deadline = started + 1 / publish_rate
+
+        if speed is None:
+            ticks_due = float("inf")
+        else:
+            # a backlog larger than a batch is dropped rather than carried along
+            ticks_due = min(ticks_due + (started - last) * speed * ticks_per_second,
+                            speed * ticks_per_second / publish_rate + 1)
+        last = started
+
+        while ticks_due >= 1 and time.perf_counter() < deadline:
+            hive.update()
+            ticks_due -= 1
+            tick += 1
+
+            if tick % sample_every == 0:
+                history.append(history_sampler.sample()[_HISTORY_INDEX])
+                samples += 1
+
+        if speed is None:
+            ticks_due = 0.0
+
+        publish()
+        time.sleep(max(0.0, deadline - time.perf_counter()))
+
+
+class SimulationWorker:
+    """
+    Steps a hive in a process of its own
+
+    The worker publishes the figures of the hive through a double buffer in shared memory,
+    at `publish_rate` per second at most: the latest `METRICS` plus the `HISTORY` sampled every `sample_every` ticks.
+    At speed 1 it runs `ticks_per_second`, and it is paused, sped up and reset through commands.
+    A worker that failed raises from `latest`
+    """
+
+    def __init__(self, config: HiveConfig, graph_length: int, sample_every: int = 5,
+                 ticks_per_second: float = 120, publish_rate: float = 60):
+        if graph_length < 1:
+            raise ValueError(f"Required: graph_length >= 1; Got: {graph_length = }")
+
+        if sample_every < 1:
+            raise ValueError(f"Required: sample_every >= 1; Got: {sample_every = }")
+
+        self.__graph_length = graph_length
+
+        size = 2 * _slot_size(graph_length)
+        self.__buffer = SharedMemory(create=True, size=size * np.dtype(np.float64).itemsize)
+        self.__slots = np.ndarray((2, _slot_size(graph_length)), dtype=np.float64, buffer=self.__buffer.buf)
+        self.__slots[:] = 0
+
+        # a fork of a process running pyxel is not safe: the worker starts afresh
+        context = multiprocessing.get_context("spawn")
+        self.__published = context.RawValue("b", 0)
+        self.__commands = context.Queue()
+        self.__errors = context.Queue()
+        self.__process = context.Process(target=_work, daemon=True,
+                                         args=(config, self.__buffer.name, self.__published, self.__commands,
+                                               self.__errors, graph_length, sample_every, ticks_per_second,
+                                               publish_rate))
+        self.__process.start()
+
+    def __send(self, command: str, argument: Any = None):
+        self.__commands.put((command, argument))
+
+    def pause(self):
+        self.__send("pause")
+
+    def resume(self):
+        self.__send("resume")
+
+    def set_speed(self, speed: Union[int, None]):
+        """
+        `speed` is a multiple of the base tick rate; None runs as fast as possible
+        """
+
+        if speed is not None and speed < 1:
+            raise ValueError(f"Required: speed >= 1 or None; Got: {speed = }")
+
+        self.__send("speed", speed)
+
+    def reset(self):
+        """
+        Starts over with a new hive of the same configuration
+        """
+
+        self.__send("reset")
+
+    def latest(self) -> Union[Snapshot, None]:
+        """
+        Returns:
+            - the latest published snapshot, None before the first one
+        Raises:
+            - RuntimeError, with the exit code and the traceback, once the worker died
+        """
+
+        if not self.__process.is_alive():
+            try:
+                trace = self.__errors.get(timeout=1)
+            except queue.Empty:
+                trace = ""
+
+            raise RuntimeError(f"Simulation worker stopped; exit code {self.__process.exitcode}\n{trace}")
+
+        while True:
+            slot = self.__slots[self.__published.value]
+            sequence = slot[_SEQUENCE]
+            copy = slot.copy()
+
+            # written in the meantime: read again
+            if sequence % 2 or slot[_SEQUENCE] != sequence:
+                continue
+
+            if sequence == 0:
+                return None
+
+            samples = int(copy[_SAMPLES])
+            kept = min(samples, self.__graph_length)
+            rows = copy[_HEADER + len(METRICS):].reshape(len(HISTORY), -1)[:, self.__graph_length - kept:]
+            rows.setflags(write=False)
+
+            return Snapshot(int(copy[_GENERATION]), int(copy[_TICK]), bool(copy[_ACTIVE]),
+                            None if copy[_SPEED] == _MAX_SPEED else int(copy[_SPEED]),
+                            dict(zip(METRICS, copy[_HEADER:_HEADER + len(METRICS)].tolist())),
+                            samples, dict(zip(HISTORY, rows)))
+
+    def close(self):
+        if self.__slots is None:
+            return
+
+        if self.__process.is_alive():
+            self.__send("stop")
+            self.__process.join(timeout=1)
+
+            if self.__process.is_alive():
+                self.__process.terminate()
+
+        self.__slots = None
+        self.__buffer.close()
+        self.__buffer.unlink()
@@ -1,5 +1,4 @@
 import itertools as ittls
-import random as rng
 from typing import Iterable, Collection
 
 from src.utils import Number
@@ -59,11 +58,5 @@ def pairwise(iterable: Iterable):
     return zip(iterable_0, iterable_1)
 
 
-def deviate(value: Number, factor: float) -> float:
-    base = value * factor
-    deviation = rng.uniform(-base, base)
-    return value + deviation
-
-
 def avg(collection: Collection[Number]):
     return sum(collection) / len(collection)
@@ -0,0 +1,109 @@
+from typing import Any, Dict, List, Sequence, Tuple, TypeVar, Union
+
+import numpy as np
+
+from src.utils import Number
+
+T = TypeVar("T")
+
+
+class BatchedRandom:
+    """
+    Seeded random stream that serves its draws from blocks of uniforms generated in bulk by NumPy
+
+    Offers the subset of the `random.Random` interface the hive needs, plus `deviate`.
+    The same seed always yields the same draws, whatever the block size
+    """
+
+    def __init__(self, seed: Union[int, None] = None, block_size: int = 1024):
+        if block_size < 1:
+            raise ValueError(f"Required: block_size >= 1; Got: {block_size = }")
+
+        self.__generator = np.random.default_rng(seed)
+        self.__block_size = block_size
+        self.__draws = iter(())
+
+    def __refill(self) -> float:
+        self.__draws = iter(self.__generator.random(self.__block_size).tolist())
+        return next(self.__draws)
+
+    def getstate(self) -> Tuple[Dict[str, Any], List[float]]:
+        """
+        Returns:
+            - state of the generator and the draws of the current block not served yet
+        """
+
+        remaining = list(self.__draws)
+        self.__draws = iter(remaining)
+
+        return self.__generator.bit_generator.state, remaining
+
+    def setstate(self, state: Tuple[Dict[str, Any], List[float]]):
+        generator_state, remaining = state
+
+        self.__generator.bit_generator.state = generator_state
+        self.__draws = iter(list(remaining))
+
+    def random(self) -> float:
+        """
+        Returns:
+            - float in [0, 1)
+        """
+
+        for draw in self.__draws:
+            return draw
+
+        return self.__refill()
+
+    def uniform(self, a: Number, b: Number) -> float:
+        return a + (b - a) * self.random()
+
+    def deviate(self, value: Number, factor: float) -> float:
+        """
+        Returns:
+            - `value` moved by up to `factor` of itself, either way, uniformly
+        """
+
+        return value + value * factor * (2 * self.random() - 1)
+
+    def randrange(self, stop: int) -> int:
+        if stop < 1:
+            raise ValueError(f"Required: stop >= 1; Got: {stop = }")
+
+        return int(self.random() * stop)
+
+    def choice(self, seq: Sequence[T]) -> T:
+        if len(seq) == 0:
+            raise IndexError("Cannot choose from an empty sequence")
+
+        return seq[self.randrange(len(seq))]
+
+    def sample(self, population: Sequence[T], k: int) -> List[T]:
+        """
+        Returns:
+            - `k` distinct elements of `population`, in selection order
+        """
+
+        n = len(population)
+        if not 0 <= k <= n:
+            raise ValueError(f"Required: 0 <= k <= len(population); Got: {k = }, {n = }")
+
+        # few picks: rejection against the picked ones, many: a partial shuffle
+        if k * 4 <= n:
+            picked = set()
+            result = []
+
+            while len(result) < k:
+                index = self.randrange(n)
+                if index not in picked:
+                    picked.add(index)
+                    result.append(population[index])
+
+            return result
+
+        pool = list(population)
+        for i in range(k):
+            j = i + self.randrange(n - i)
+            pool[i], pool[j] = pool[j], pool[i]
+
+        return pool[:k]
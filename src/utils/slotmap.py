@@ -0,0 +1,162 @@
+import random
+from typing import Dict, Generic, Iterable, Iterator, List, NamedTuple, Sequence, TypeVar, Union
+
+T = TypeVar("T")
+
+
+class Handle(NamedTuple):
+    index: int
+    generation: int
+
+
+class SlotMap(Generic[T]):
+    """
+    Generational slot map of unique items
+
+    Items are stored densely and removed by swapping the last item into the freed position;
+    every item gets a handle that stays valid until the item is removed, and turns stale
+    (instead of pointing at another item) once its slot is reused
+
+    Returns:
+        - O(1) `add`, `remove`, `get`, `choice`
+        - O(k) `sample` of k distinct items
+        - iteration in insertion order
+    """
+
+    def __init__(self, items: Iterable[T] = ()):
+        self.__items: List[T] = []
+        self.__dense_slots: List[int] = []
+
+        self.__slot_positions: List[int] = []
+        self.__slot_generations: List[int] = []
+        self.__free_slots: List[int] = []
+
+        self.__handles: Dict[T, Handle] = {}
+
+        self.update(items)
+
+    def __len__(self):
+        return len(self.__items)
+
+    def __contains__(self, item: T):
+        return item in self.__handles
+
+    def __iter__(self) -> Iterator[T]:
+        return iter(self.__handles)
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__qualname__}({list(self.__handles)})"
+
+    def add(self, item: T) -> Handle:
+        handle = self.__handles.get(item)
+        if handle is not None:
+            return handle
+
+        if self.__free_slots:
+            slot = self.__free_slots.pop()
+        else:
+            slot = len(self.__slot_positions)
+            self.__slot_positions.append(0)
+            self.__slot_generations.append(0)
+
+        self.__slot_positions[slot] = len(self.__items)
+        self.__items.append(item)
+        self.__dense_slots.append(slot)
+
+        handle = Handle(slot, self.__slot_generations[slot])
+        self.__handles[item] = handle
+
+        return handle
+
+    def update(self, items: Iterable[T]):
+        for item in items:
+            self.add(item)
+
+    def remove(self, item: T):
+        slot = self.__handles.pop(item).index
+
+        position = self.__slot_positions[slot]
+        last_item = self.__items.pop()
+        last_slot = self.__dense_slots.pop()
+
+        if position < len(self.__items):
+            self.__items[position] = last_item
+            self.__dense_slots[position] = last_slot
+            self.__slot_positions[last_slot] = position
+
+        self.__slot_generations[slot] += 1
+        self.__free_slots.append(slot)
+
+    def discard(self, item: T):
+        if item in self.__handles:
+            self.remove(item)
+
+    def clear(self):
+        for item in list(self.__handles):
+            self.remove(item)
+
+    def handle_of(self, item: T) -> Handle:
+        return self.__handles[item]
+
+    def get(self, handle: Handle) -> Union[T, None]:
+        """
+        Returns:
+            - item referenced by `handle`
+            - None if the item has been removed
+        """
+
+        slot, generation = handle
+
+        if not 0 <= slot < len(self.__slot_generations) or self.__slot_generations[slot] != generation:
+            return None
+
+        return self.__items[self.__slot_positions[slot]]
+
+    def storage_order(self) -> List[T]:
+        """
+        Returns:
+            - items in the order `choice` and `sample` index them, which removals shuffle
+        """
+
+        return list(self.__items)
+
+    @classmethod
+    def restore(cls, items: Sequence[T], stored: Sequence[T]) -> "SlotMap[T]":
+        """
+        Returns:
+            - slot map iterating `items` in order and storing them in the order of `stored`, a permutation of them
+              (e.g. as `storage_order` gave them out); built in one go, the items are not added one by one
+        """
+
+        slot_map = cls()
+        handles = {item: Handle(slot, 0) for slot, item in enumerate(items)}
+
+        if len(handles) != len(items) or len(stored) != len(items) or any(item not in handles for item in stored) \
+                or len(set(stored)) != len(stored):
+            raise ValueError("Required: unique items and a permutation of them")
+
+        dense_slots = [handles[item].index for item in stored]
+        positions = [0] * len(dense_slots)
+        for position, slot in enumerate(dense_slots):
+            positions[slot] = position
+
+        slot_map.__handles = handles
+        slot_map.__items = list(stored)
+        slot_map.__dense_slots = dense_slots
+        slot_map.__slot_positions = positions
+        slot_map.__slot_generations = [0] * len(dense_slots)
+
+        return slot_map
+
+    def choice(self, rng=random) -> T:
+        """
+        `rng` is anything with the `random.Random` interface, the `random` module by default
+        """
+
+        if len(self.__items) == 0:
+            raise IndexError("Cannot choose from an empty slot map")
+
+        return self.__items[rng.randrange(len(self.__items))]
+
+    def sample(self, k: int, rng=random) -> List[T]:
+        return [self.__items[i] for i in rng.sample(range(len(self.__items)), k)]
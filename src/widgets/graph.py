@@ -1,17 +1,32 @@
 from collections import deque
+from typing import Deque, Iterable, Tuple, Union
+
+import numpy as np
 import pyxel
 
 from src.utils import Number
 from src.utils.vec import Vec2, Vec3
-from src.utils.num import linspace, linear_remap, clamp, pairwise
 
 
 class Graph:
+    """
+    Line graph of the latest `length` values (`width` by default), the oldest on the left
+
+    Values live in ring buffers, along with their heights in the graph: adding values only remaps the new ones,
+    and the whole graph is only remapped when its y domain or height change.
+    With `autoscale`, the y domain follows the minimum and maximum of the values shown.
+
+    The graph is drawn into an offscreen image, only when values were added: the image scrolls
+    and only the new columns are drawn. Beyond a value per pixel, every column shows the minimum and maximum
+    of its values, `length` being rounded up to a whole amount of values per column
+    """
+
     def __init__(self, pos_x: Number, pos_y: Number,
                  width: Number, height: Number,
                  min_y: Number, max_y: Number,
                  step: int = 1,
-                 graph_color: int = 3, border_color: int = 7, grid_color: int = 1):
+                 graph_color: int = 3, border_color: int = 7, grid_color: int = 1,
+                 autoscale: bool = False, length: Union[int, None] = None):
 
         if step < 1:
             raise ValueError(f"Required: step >= 1; Got: {step = }")
@@ -19,17 +34,36 @@ class Graph:
         if min_y >= max_y:
             raise ValueError(f"Required: min_y < max_y; Got: {min_y = }, {max_y = }")
 
+        if length is not None and length < 1:
+            raise ValueError(f"Required: length >= 1 or None; Got: {length = }")
+
         self.__pos = Vec2(pos_x, pos_y)
         self.__size = Vec2(max(2, width), max(2, height))
 
         self.__y_domain = Vec2(min_y, max_y)
         self.__step = step
+        self.__length = length
 
-        self.__graph_data = deque(maxlen=self.size.x)
-        self.__real_data = deque(maxlen=self.size.x)
+        # once full, the oldest value is at `__head`; `__total` counts the values added since the last clear
+        self.__per_column = self.__values_per_column()
+        self.__real_data = np.zeros(self.__per_column * self.size.x)
+        self.__graph_data = np.zeros(self.__per_column * self.size.x)
+        self.__head = 0
+        self.__count = 0
+        self.__total = 0
+
+        # running minimum and maximum of the values shown, as monotonic queues of (index, value)
+        self.__autoscale = autoscale
+        self.__added = 0
+        self.__minima: Deque[Tuple[int, float]] = deque()
+        self.__maxima: Deque[Tuple[int, float]] = deque()
 
         self.__color = Vec3(graph_color, border_color, grid_color)
 
+        # any color but the graph's
+        self.__transparent = 1 if graph_color == 0 else 0
+        self.__new_canvas()
+
     @property
     def pos(self):
         return self.__pos
@@ -45,24 +79,57 @@ class Graph:
         return self.__size
 
     def resize_width(self, width: Number):
+        values = self.__ordered(self.__real_data)
         self.__size = Vec2(max(2, width), self.size.y)
-        self.__real_data = deque(self.__real_data, maxlen=self.size.x)
-        self.__graph_data = deque(self.__graph_data, maxlen=self.size.x)
+        self.__per_column = self.__values_per_column()
+
+        self.__real_data = np.zeros(self.__per_column * self.size.x)
+        self.__graph_data = np.zeros(self.__per_column * self.size.x)
+        self.__head = self.__count = self.__total = 0
+        self.__reset_extrema()
+        self.__append(values)
+        self.__new_canvas()
 
     def resize_height(self, height: Number):
-        self.__size = Vec2(self.size.x, max(2, height))
-        self.__recalc_graph()
+        height = max(2, height)
+
+        if height != self.size.y:
+            self.__size = Vec2(self.size.x, height)
+            self.__recalc_graph()
+            self.__new_canvas()
 
     @property
     def y_domain(self):
         return self.__y_domain
 
     def set_y_domain(self, min_y: Number, max_y: Number):
+        """
+        Also turns autoscaling off
+        """
+
         if min_y >= max_y:
             raise ValueError(f"Required: min_y < max_y; Got: {min_y = }, {max_y = }")
 
-        self.__y_domain = Vec2(min_y, max_y)
-        self.__recalc_graph()
+        self.__autoscale = False
+
+        if Vec2(min_y, max_y) != self.y_domain:
+            self.__y_domain = Vec2(min_y, max_y)
+            self.__recalc_graph()
+
+    @property
+    def autoscale(self):
+        return self.__autoscale
+
+    def set_autoscale(self, autoscale: bool):
+        if autoscale == self.__autoscale:
+            return
+
+        self.__autoscale = autoscale
+
+        if autoscale:
+            self.__reset_extrema()
+            self.__track(self.__ordered(self.__real_data))
+            self.__follow_extrema()
 
     @property
     def step(self):
@@ -87,37 +154,226 @@ class Graph:
                        self.pos.x + self.size.x - 1, pyxel.floor(self.pos.y + self.size.y / 2),
                        self.__color.z)
 
-        if len(self.__graph_data) == 0:
-            return
+        if self.__redraw or self.__drawn_total != self.__total:
+            self.__render()
 
-        for p1, p2 in pairwise(enumerate(self.__graph_data)):
-            pyxel.line(self.pos.x + p1[0], self.pos.y - p1[1] + self.size.y,
-                       self.pos.x + p2[0], self.pos.y - p2[1] + self.size.y,
-                       self.__color.x)
+        pyxel.blt(self.pos.x, self.pos.y, self.__image, 0, 0, self.size.x, self.size.y, self.__transparent)
 
     def add_value(self, value: Number):
-        if any((
-                len(self.__real_data) == 0,
-                self.__step == 1
-        )):
-            self.__real_data.append(value)
-        else:
-            self.__real_data.extend(linspace(self.__real_data[-1], value, self.__step))
+        self.add_values((value,))
 
-        self.__recalc_graph()
+    def add_values(self, values: Iterable[Number]):
+        """
+        Same as `add_value` for every value in turn, remapping only the points added
+        """
+
+        values = np.fromiter(values, dtype=np.float64)
+
+        if len(values) == 0:
+            return
+
+        # every value but the very first one is joined to the previous one by `step` points, both included
+        if self.__step > 1:
+            if self.__count == 0:
+                points, starts, stops = [values[:1]], values[:-1], values[1:]
+            else:
+                last = self.__real_data[(self.__head - 1) % len(self.__real_data)]
+                points, starts, stops = [], np.concatenate(((last,), values[:-1])), values
+
+            fractions = np.arange(self.__step) / (self.__step - 1)
+            points.append((starts[:, None] + (stops - starts)[:, None] * fractions).ravel())
+            values = np.concatenate(points)
+
+        self.__append(values)
 
     def clear(self):
-        self.__real_data.clear()
-        self.__graph_data.clear()
+        self.__head = self.__count = self.__total = 0
+        self.__reset_extrema()
+        self.__redraw = True
+
+    def __append(self, values: np.ndarray):
+        capacity = len(self.__real_data)
+
+        # only the latest `capacity` values can be shown
+        self.__total += len(values)
+        self.__added += max(0, len(values) - capacity)
+        values = values[-capacity:]
+
+        positions = (self.__head + np.arange(len(values))) % capacity
+        self.__real_data[positions] = values
+        self.__head = (self.__head + len(values)) % capacity
+        self.__count = min(capacity, self.__count + len(values))
+
+        if self.__autoscale:
+            self.__track(values)
+
+            if self.__follow_extrema():
+                return
+
+        self.__graph_data[positions] = self.__remap(values)
+
+    def __ordered(self, data: np.ndarray) -> np.ndarray:
+        """
+        Returns:
+            - the buffered entries of `data`, oldest first
+        """
+
+        if self.__count < len(data):
+            return data[:self.__count]
+
+        return np.concatenate((data[self.__head:], data[:self.__head]))
+
+    def __latest(self, data: np.ndarray, amount: int) -> np.ndarray:
+        """
+        Returns:
+            - the latest `amount` buffered entries of `data`, oldest first
+        """
+
+        return data[(self.__head - amount + np.arange(amount)) % len(data)]
 
-    def __remap(self, value: Number):
-        return linear_remap(
-            clamp(value, self.y_domain.x, self.y_domain.y),
-            self.y_domain.x, self.y_domain.y, 1, self.size.y
-        )
+    def __reset_extrema(self):
+        self.__added = 0
+        self.__minima.clear()
+        self.__maxima.clear()
+
+    def __track(self, values: np.ndarray):
+        """
+        Pushes `values` to the monotonic queues, then drops the entries that scrolled out of the graph
+        """
+
+        minima, maxima = self.__minima, self.__maxima
+
+        for value in values.tolist():
+            while minima and minima[-1][1] >= value:
+                minima.pop()
+
+            while maxima and maxima[-1][1] <= value:
+                maxima.pop()
+
+            minima.append((self.__added, value))
+            maxima.append((self.__added, value))
+            self.__added += 1
+
+        oldest = self.__added - len(self.__real_data)
+
+        while minima and minima[0][0] < oldest:
+            minima.popleft()
+
+        while maxima and maxima[0][0] < oldest:
+            maxima.popleft()
+
+    def __follow_extrema(self) -> bool:
+        """
+        Fits the y domain to the values shown, remapping the graph if it changed
+
+        Returns:
+            - whether the graph was remapped
+        """
+
+        if not self.__minima:
+            return False
+
+        min_y, max_y = self.__minima[0][1], self.__maxima[0][1]
+
+        # a flat line goes through the middle
+        if min_y == max_y:
+            min_y, max_y = min_y - 1, max_y + 1
+
+        if Vec2(min_y, max_y) == self.y_domain:
+            return False
+
+        self.__y_domain = Vec2(min_y, max_y)
+        self.__recalc_graph()
+
+        return True
+
+    def __remap(self, values: np.ndarray) -> np.ndarray:
+        min_y, max_y = self.y_domain.as_tuple
+        return 1 + (np.clip(values, min_y, max_y) - min_y) * ((self.size.y - 1) / (max_y - min_y))
 
     def __recalc_graph(self):
-        self.__graph_data = deque(
-            [self.__remap(v) for v in self.__real_data],
-            maxlen=self.size.x
-        )
+        self.__graph_data = self.__remap(self.__real_data)
+        self.__redraw = True
+
+    def __values_per_column(self) -> int:
+        return 1 if self.__length is None else -(-self.__length // self.size.x)
+
+    def __new_canvas(self):
+        # two images, as pyxel cannot blit an image onto itself: scrolling copies one into the other
+        self.__image = pyxel.Image(self.size.x, self.size.y)
+        self.__back = pyxel.Image(self.size.x, self.size.y)
+
+        self.__redraw = True
+        self.__drawn_total = 0
+        self.__drawn_first = 0
+
+    def __render(self):
+        """
+        Brings the offscreen image up to date: scrolls it by the columns that went out of the graph,
+        then draws the columns that got new values
+        """
+
+        per_column, width, height = self.__per_column, self.size.x, self.size.y
+
+        # column `x` of the image shows the values of column `first + x` since the last clear
+        first = max(0, (self.__total - 1) // per_column - width + 1)
+        shift = first - self.__drawn_first
+
+        if self.__redraw or shift >= width:
+            self.__image.cls(self.__transparent)
+            dirty = first
+        else:
+            if shift > 0:
+                self.__back.cls(self.__transparent)
+                self.__back.blt(0, 0, self.__image, shift, 0, width - shift, height)
+                self.__image, self.__back = self.__back, self.__image
+
+            # the column the first new value went to
+            dirty = max(first, self.__drawn_total // per_column)
+            self.__image.rect(dirty - first, 0, width - dirty + first, height, self.__transparent)
+
+            # the leftmost column kept the end of the line from the column that scrolled out
+            if shift > 0 and dirty > first:
+                self.__image.rect(0, 0, 1, height, self.__transparent)
+                self.__draw_columns(first, first, min(first + 2, dirty))
+
+        columns = -(-self.__total // per_column)
+        if columns > dirty:
+            self.__draw_columns(first, dirty, columns)
+
+        self.__redraw = False
+        self.__drawn_total = self.__total
+        self.__drawn_first = first
+
+    def __draw_columns(self, first: int, begin: int, end: int):
+        """
+        Draws the columns from `begin` to `end`, each joined to the previous one;
+        a column of several values also gets a line from their minimum to their maximum
+        """
+
+        per_column, color = self.__per_column, self.__color.x
+
+        # the last value of the column before, if shown, to join the first column drawn to it
+        start = begin * per_column
+        stop = min(self.__total, end * per_column)
+        joined = start > first * per_column
+
+        ys = self.size.y - self.__latest(self.__graph_data, self.__total - start + joined)[:stop - start + joined]
+        previous, ys = (float(ys[0]) if joined else None), ys[joined:]
+
+        starts = np.arange(0, len(ys), per_column)
+        firsts = ys[starts].tolist()
+        lasts = ys[np.minimum(starts + per_column, len(ys)) - 1].tolist()
+
+        if per_column > 1:
+            lows = np.minimum.reduceat(ys, starts).tolist()
+            highs = np.maximum.reduceat(ys, starts).tolist()
+
+        for column, x in enumerate(range(begin - first, end - first)):
+            if previous is not None:
+                self.__image.line(x - 1, previous, x, firsts[column], color)
+
+            if per_column > 1:
+                self.__image.line(x, lows[column], x, highs[column], color)
+
+            previous = lasts[column]
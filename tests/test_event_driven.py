@@ -0,0 +1,72 @@
+import math
+import statistics
+
+import pytest
+
+from src.bee.member import DroneBee, WorkerBee
+from src.hive.event_driven import EventDrivenHive
+from src.hive.hive import Hive
+from src.sim.config import HiveConfig
+from src.sim.profiler import TickProfiler
+
+
+def _bees(hive: Hive):
+    return [(type(bee), type(bee.state), bee.age, bee.lifespan) for bee in hive.live_bees]
+
+
+@pytest.mark.parametrize("honey", [0.0, 300.0, 50000.0])
+def test_lone_bee_matches_the_tick_engine(honey):
+    # without drones no egg is fertilized, so the worker stays alone with the queen until it dies
+    hive = Hive(0, 1, 0, honey, seed=2)
+    events = EventDrivenHive(0, 1, 0, honey, seed=2)
+
+    for _ in range(120):
+        hive.advance(100)
+        events.advance(100)
+
+        assert events.timers.now == hive.timers.now
+        assert _bees(events) == _bees(hive)
+        assert len(events.eggs) == len(hive.eggs)
+        assert events.all_dead_bees_reason_count == hive.all_dead_bees_reason_count
+
+        # closed-form growth rounds differently from repeated multiplication
+        assert events.honey_amount == pytest.approx(hive.honey_amount, rel=1e-12)
+        for event_bee, bee in zip(events.live_bees, hive.live_bees):
+            assert event_bee.weight == pytest.approx(bee.weight, rel=1e-12)
+            assert event_bee.starvation_rate == pytest.approx(bee.starvation_rate, abs=1e-12)
+
+    assert hive.all_dead_bees_reason_count.total() == 1
+
+
+def test_seeded_runs_match_the_tick_engine_statistically():
+    seeds = range(8)
+
+    def outcomes(engine: str):
+        rows = []
+        for seed in seeds:
+            hive = HiveConfig(3, 10, 10, 50000.0, engine=engine, seed=seed).build()
+            hive.advance(8000)
+            rows.append((hive.honey_amount, len(hive.live_bees), hive.all_dead_bees_reason_count.total(),
+                         len(hive.eggs)))
+
+        return list(zip(*rows))
+
+    for name, ticked, evented in zip(("honey", "live bees", "dead bees", "eggs"),
+                                      outcomes("object"), outcomes("event")):
+        standard_error = math.sqrt((statistics.variance(ticked) + statistics.variance(evented)) / len(seeds))
+
+        assert abs(statistics.mean(ticked) - statistics.mean(evented)) <= 3 * standard_error, name
+
+
+def test_profiler_sees_the_event_engine():
+    hive = EventDrivenHive(20, 100, 10, 50000.0, seed=3)
+
+    with TickProfiler(hive) as profiler:
+        hive.advance(3000)
+
+    assert profiler.ticks == 3000
+    assert {"sync", "plan", "skip", "members", "timers"} <= profiler.phase_seconds.keys()
+    assert {DroneBee, WorkerBee} <= profiler.syncs.keys()
+    assert profiler.synced_ticks[WorkerBee] > profiler.syncs[WorkerBee]
+    # cleaning acts every tick, so cleaners are updated one tick at a time
+    assert profiler.member_updates[WorkerBee] > 0
@@ -0,0 +1,29 @@
+import pytest
+
+from src.hive.hive import Hive
+
+
+def test_all_dead_bees_reads_the_buried_ones_back(tmp_path):
+    # 2000 ticks without honey: the drones starve and the workers clean some of them out
+    with Hive(10, 5, 0, 0.0, graveyard_path=tmp_path / "graveyard.bin", seed=1) as hive:
+        hive.advance(2000)
+        assert len(hive.dead_bees_in_grave) > 0
+
+        with pytest.warns(DeprecationWarning):
+            dead_bees = hive.all_dead_bees
+
+        assert len(dead_bees) == len(hive.dead_bees_in_grave) + len(hive.dead_bees_in_hive)
+        assert sum(hive.all_dead_bees_was_count.values()) == len(dead_bees)
+
+        was_count = {}
+        for bee in dead_bees:
+            was_count[bee.was] = was_count.get(bee.was, 0) + 1
+
+        assert was_count == hive.all_dead_bees_was_count
+
+
+def test_all_dead_bees_needs_a_record_file():
+    hive = Hive(1, 1, 0, 0.0, seed=1)
+
+    with pytest.warns(DeprecationWarning), pytest.raises(RuntimeError):
+        hive.all_dead_bees
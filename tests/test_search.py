@@ -0,0 +1,26 @@
+import numpy as np
+
+from src.sim.metrics import METRICS
+from src.sim.search import is_doomed
+
+
+def _metrics(**values) -> np.ndarray:
+    return np.array([float(values.get(name, 0)) for name in METRICS])
+
+
+def test_empty_hive_is_doomed():
+    assert is_doomed(_metrics(honey=50000.0), ticks_left=10_000)
+
+
+def test_fertilized_eggs_with_honey_left_are_not_doomed():
+    assert not is_doomed(_metrics(honey=50000.0, eggs_fertilized=5), ticks_left=10_000)
+
+
+def test_fertilized_eggs_without_honey_are_doomed():
+    # the larvae they hatch into starve before growing into workers
+    assert is_doomed(_metrics(honey=0.0, eggs_fertilized=5), ticks_left=10_000)
+
+
+def test_workers_without_drones_outlived_by_the_horizon_are_doomed():
+    assert is_doomed(_metrics(honey=50000.0, live_bees=10, workers=10), ticks_left=10_000)
+    assert not is_doomed(_metrics(honey=50000.0, live_bees=10, workers=10), ticks_left=1_000)
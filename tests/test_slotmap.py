@@ -0,0 +1,100 @@
+import random
+
+import pytest
+
+from src.utils.slotmap import Handle, SlotMap
+
+
+def test_removed_slot_is_reused_with_a_new_generation():
+    slots = SlotMap(["a", "b", "c"])
+    old = slots.handle_of("b")
+
+    slots.remove("b")
+    new = slots.add("d")
+
+    assert new.index == old.index
+    assert new.generation == old.generation + 1
+    assert slots.get(new) == "d"
+
+
+def test_stale_handle_is_rejected():
+    slots = SlotMap(["a", "b"])
+    handle = slots.handle_of("a")
+
+    slots.remove("a")
+    assert slots.get(handle) is None
+
+    slots.add("c")
+    assert slots.get(handle) is None
+    assert slots.get(Handle(handle.index + 10, 0)) is None
+    assert slots.get(Handle(-1, 0)) is None
+
+
+def test_handles_survive_removals_that_move_items():
+    slots = SlotMap(range(10))
+    handles = {item: slots.handle_of(item) for item in range(10)}
+
+    for item in (0, 5, 9, 3):
+        slots.remove(item)
+        del handles[item]
+
+    assert all(slots.get(handle) == item for item, handle in handles.items())
+
+
+def test_adding_a_stored_item_keeps_its_handle():
+    slots = SlotMap(["a"])
+    handle = slots.handle_of("a")
+
+    assert slots.add("a") == handle
+    assert len(slots) == 1
+
+
+def test_matches_a_set_under_random_operations():
+    rng = random.Random(7)
+    slots = SlotMap()
+    expected = set()
+    handles = {}
+
+    for _ in range(2000):
+        item = rng.randrange(50)
+
+        if item in expected:
+            stale = handles.pop(item)
+            slots.remove(item)
+            expected.remove(item)
+            assert slots.get(stale) is None
+        else:
+            handles[item] = slots.add(item)
+            expected.add(item)
+
+        assert len(slots) == len(expected)
+
+    assert set(slots) == expected
+    assert set(slots.storage_order()) == expected
+    assert all(slots.get(handle) == item for item, handle in handles.items())
+    assert slots.choice(rng) in expected
+
+
+def test_restore_keeps_both_orders_and_stays_usable():
+    slots = SlotMap.restore(["a", "b", "c"], ["c", "a", "b"])
+
+    assert slots.storage_order() == ["c", "a", "b"]
+    assert list(slots) == ["a", "b", "c"]
+
+    slots.remove("c")
+    handle = slots.add("d")
+    assert slots.storage_order() == ["b", "a", "d"]
+    assert list(slots) == ["a", "b", "d"]
+    assert slots.get(handle) == "d"
+    assert slots.get(slots.handle_of("a")) == "a"
+
+
+def test_restore_requires_a_permutation():
+    with pytest.raises(ValueError):
+        SlotMap.restore(["a", "b", "c"], ["a", "b"])
+
+    with pytest.raises(ValueError):
+        SlotMap.restore(["a", "b", "c"], ["a", "a", "b"])
+
+    with pytest.raises(ValueError):
+        SlotMap.restore(["a", "a"], ["a", "a"])
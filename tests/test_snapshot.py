@@ -0,0 +1,83 @@
+import numpy as np
+import pytest
+
+from src.hive.event_driven import EventDrivenHive
+from src.hive.hive import Hive
+from src.hive.ids import RandomUUIDs
+from src.hive.vectorized import VectorizedHive
+from src.hive.snapshot import read_snapshot
+
+
+def _assert_same_snapshot(first, second):
+    first_meta, first_arrays = read_snapshot(first)
+    second_meta, second_arrays = read_snapshot(second)
+
+    assert first_meta == second_meta
+    assert first_arrays.keys() == second_arrays.keys()
+
+    for name in first_arrays:
+        assert np.array_equal(first_arrays[name], second_arrays[name]), name
+
+
+@pytest.mark.parametrize("hive_type", [Hive, EventDrivenHive])
+def test_loaded_hive_carries_on_bit_for_bit(tmp_path, hive_type):
+    hive = hive_type(3, 10, 10, 50000.0, seed=4)
+    # long enough for eggs to hatch, larvae to transform and bees to die and be buried
+    hive.advance(6000)
+    hive.save(tmp_path / "saved.snap")
+
+    loaded = hive_type.load(tmp_path / "saved.snap")
+    # in steps, so that the event engine plans, jumps and steps exactly on both sides
+    for ticks in (1, 700, 3299):
+        hive.advance(ticks)
+        loaded.advance(ticks)
+
+    assert loaded.timers.now == hive.timers.now
+    assert loaded.honey_amount == hive.honey_amount
+    assert loaded.all_dead_bees_reason_count == hive.all_dead_bees_reason_count
+
+    hive.save(tmp_path / "continued.snap")
+    loaded.save(tmp_path / "loaded.snap")
+    _assert_same_snapshot(tmp_path / "continued.snap", tmp_path / "loaded.snap")
+
+
+def test_loaded_vectorized_hive_carries_on_bit_for_bit(tmp_path):
+    hive = VectorizedHive(3, 10, 10, 50000.0, seed=4)
+    hive.advance(6000)
+    hive.save(tmp_path / "saved.snap")
+
+    loaded = VectorizedHive.load(tmp_path / "saved.snap")
+    hive.advance(4000)
+    loaded.advance(4000)
+
+    assert loaded.honey_amount == hive.honey_amount
+    assert loaded.all_dead_bees_reason_count == hive.all_dead_bees_reason_count
+
+    hive.save(tmp_path / "continued.snap")
+    loaded.save(tmp_path / "loaded.snap")
+    _assert_same_snapshot(tmp_path / "continued.snap", tmp_path / "loaded.snap")
+
+
+@pytest.mark.parametrize("hive_type", [Hive, EventDrivenHive, VectorizedHive])
+def test_save_of_a_loaded_hive_is_identical(tmp_path, hive_type):
+    hive = hive_type(3, 10, 10, 50000.0, seed=9)
+    hive.advance(5000)
+    hive.save(tmp_path / "first.snap")
+
+    hive_type.load(tmp_path / "first.snap").save(tmp_path / "second.snap")
+
+    _assert_same_snapshot(tmp_path / "first.snap", tmp_path / "second.snap")
+
+
+def test_load_refuses_a_snapshot_of_another_engine(tmp_path):
+    Hive(1, 1, 0, 100.0, seed=1).save(tmp_path / "hive.snap")
+
+    with pytest.raises(ValueError):
+        EventDrivenHive.load(tmp_path / "hive.snap")
+
+
+def test_save_requires_sequential_ids(tmp_path):
+    hive = Hive(1, 1, 0, 100.0, ids=RandomUUIDs(), seed=1)
+
+    with pytest.raises(ValueError):
+        hive.save(tmp_path / "hive.snap")
@@ -0,0 +1,140 @@
+import heapq
+import random
+from collections import defaultdict
+
+import pytest
+
+from lib.state_lib.timer import TimerQueue, TimerWheel
+
+
+def _drive(timers, rng: random.Random, ticks: int, max_delay: int):
+    """
+    Schedules, cancels and reschedules timers at random while advancing `timers`, next to a naive heap
+
+    Returns:
+        - (tick, id) of every firing of `timers`
+        - (tick, id) of every firing the naive heap expects, in scheduling order within a tick
+    """
+
+    fired = []
+    naive = []
+    live = {}
+    cancelled = set()
+    order = 0
+
+    def schedule(delay: int):
+        nonlocal order
+        order += 1
+        timer_id = order
+
+        def callback():
+            fired.append((timers.now, timer_id))
+
+            # a firing timer may schedule another, as a state entering the next one does
+            if rng.random() < 0.3:
+                schedule(rng.randint(1, max_delay))
+
+        live[timer_id] = timers.schedule(delay, callback)
+        heapq.heappush(naive, (timers.now + delay, timer_id))
+
+    for _ in range(20):
+        schedule(rng.randint(1, max_delay))
+
+    for _ in range(ticks):
+        if rng.random() < 0.5:
+            schedule(rng.randint(1, max_delay))
+
+        if live and rng.random() < 0.2:
+            timer_id = rng.choice(sorted(live))
+            timer = live.pop(timer_id)
+
+            if timer.active:
+                cancelled.add(timer_id)
+            timer.cancel()
+
+        timers.advance()
+
+    expected = []
+    while naive and naive[0][0] <= timers.now:
+        tick, timer_id = heapq.heappop(naive)
+        if timer_id not in cancelled:
+            expected.append((tick, timer_id))
+
+    return fired, expected
+
+
+@pytest.mark.parametrize("now", [0, 5, 63])
+def test_wheel_fires_like_a_heap_across_cascades_and_overflow(now):
+    rng = random.Random(now)
+    # 4 buckets of 3 levels hold 64 ticks: longer delays overflow, and every level cascades often
+    wheel = TimerWheel(slot_bits=2, levels=3, now=now)
+
+    fired, expected = _drive(wheel, rng, ticks=2000, max_delay=200)
+
+    by_tick = defaultdict(set)
+    for tick, timer_id in expected:
+        by_tick[tick].add(timer_id)
+
+    fired_by_tick = defaultdict(set)
+    for tick, timer_id in fired:
+        fired_by_tick[tick].add(timer_id)
+
+    assert fired_by_tick == by_tick
+    assert len(fired) == len(set(fired))
+
+
+def test_queue_fires_like_a_heap_in_scheduling_order():
+    rng = random.Random(1)
+    queue = TimerQueue(now=10)
+
+    fired, expected = _drive(queue, rng, ticks=2000, max_delay=200)
+
+    assert fired == expected
+
+
+def test_cancelled_timer_never_fires():
+    for timers in (TimerWheel(slot_bits=2, levels=2), TimerQueue()):
+        fired = []
+        timer = timers.schedule(40, lambda: fired.append("cancelled"))
+        timers.schedule(40, lambda: fired.append("kept"))
+        timer.cancel()
+
+        for _ in range(50):
+            timers.advance()
+
+        assert fired == ["kept"]
+
+
+def test_pending_lists_active_timers_in_firing_order():
+    rng = random.Random(3)
+
+    for timers in (TimerWheel(slot_bits=2, levels=2, now=7), TimerQueue(now=7)):
+        scheduled = [timers.schedule(rng.randint(1, 100), lambda: None) for _ in range(50)]
+        for timer in scheduled[::5]:
+            timer.cancel()
+
+        for _ in range(3):
+            timers.advance()
+
+        pending = timers.pending()
+
+        assert [timer.expires for timer in pending] == sorted(timer.expires for timer in pending)
+        assert set(pending) == {timer for timer in scheduled if timer.active}
+
+
+def test_queue_skip_refuses_to_jump_over_an_expiry():
+    queue = TimerQueue()
+    queue.schedule(10, lambda: None)
+
+    queue.skip(9)
+    assert queue.now == 9
+    assert queue.next_expiry == 10
+
+    with pytest.raises(ValueError):
+        queue.skip(1)
+
+
+def test_schedule_rejects_a_delay_below_one():
+    for timers in (TimerWheel(), TimerQueue()):
+        with pytest.raises(ValueError):
+            timers.schedule(0, lambda: None)
@@ -0,0 +1,108 @@
+import time
+
+import pytest
+
+from src.sim.config import HiveConfig
+from src.sim.worker import HISTORY, SimulationWorker
+
+_SAMPLE_EVERY = 5
+_GRAPH_LENGTH = 40
+
+
+class _FailingConfig(HiveConfig):
+    """
+    Builds hives that raise on their 50th tick
+    """
+
+    def build(self):
+        hive = super().build()
+        booked = []
+
+        def fail(ticks: int):
+            booked.append(ticks)
+            if len(booked) == 50:
+                raise ArithmeticError("hive failed on purpose")
+
+        hive.add_tick_listener(fail)
+        return hive
+
+
+def _wait_for(worker: SimulationWorker, condition, timeout: float = 30.0):
+    """
+    Returns:
+        - the first snapshot `condition` holds for
+    """
+
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        snapshot = worker.latest()
+        if snapshot is not None and condition(snapshot):
+            return snapshot
+
+        time.sleep(0.01)
+
+    raise TimeoutError("The worker never published the snapshot waited for")
+
+
+def _assert_consistent(snapshot):
+    assert snapshot.samples == snapshot.tick // _SAMPLE_EVERY
+    assert all(len(snapshot.history[name]) == min(snapshot.samples, _GRAPH_LENGTH) for name in HISTORY)
+
+
+@pytest.fixture
+def worker():
+    worker = SimulationWorker(HiveConfig(seed=1), _GRAPH_LENGTH, _SAMPLE_EVERY, ticks_per_second=1000)
+    yield worker
+    worker.close()
+
+
+def test_pause_resume_and_speed(worker):
+    _wait_for(worker, lambda snapshot: snapshot.tick >= 50)
+
+    worker.pause()
+    paused = _wait_for(worker, lambda snapshot: not snapshot.active)
+    time.sleep(0.2)
+    assert worker.latest().tick == paused.tick
+    _assert_consistent(paused)
+
+    worker.set_speed(None)
+    worker.resume()
+    running = _wait_for(worker, lambda snapshot: snapshot.active and snapshot.tick >= paused.tick + 500)
+    assert running.speed is None
+    _assert_consistent(running)
+
+    with pytest.raises(ValueError):
+        worker.set_speed(0)
+
+
+def test_reset_starts_a_new_generation(worker):
+    first = _wait_for(worker, lambda snapshot: snapshot.samples > _GRAPH_LENGTH)
+    assert first.generation == 0
+    _assert_consistent(first)
+
+    worker.pause()
+    worker.reset()
+    reset = _wait_for(worker, lambda snapshot: snapshot.generation == 1)
+    assert reset.tick < first.tick
+    _assert_consistent(reset)
+
+    worker.resume()
+    resumed = _wait_for(worker, lambda snapshot: snapshot.tick >= 50)
+    assert resumed.generation == 1
+    _assert_consistent(resumed)
+
+
+def test_failure_surfaces_from_latest():
+    worker = SimulationWorker(_FailingConfig(seed=1), _GRAPH_LENGTH, _SAMPLE_EVERY, ticks_per_second=1000)
+
+    try:
+        with pytest.raises(RuntimeError) as error:
+            _wait_for(worker, lambda snapshot: False)
+
+        assert "exit code 1" in str(error.value)
+        assert "hive failed on purpose" in str(error.value)
+    finally:
+        worker.close()
+
+    # closing twice is harmless
+    worker.close()